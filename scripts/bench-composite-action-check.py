@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Benchmark the composite-action/workflow interpolation checker on a synthetic tree.
+
+Builds --actions composite actions and --workflows workflows (a few in ten
+with a violation), then times:
+
+- a cold serial scan (one process, no cache),
+- a cold parallel scan (process pool, no cache),
+- a warm scan (every result served from the hash-keyed cache),
+- a warm scan after editing --edits files (only those are rescanned).
+
+Usage:
+    python3 scripts/bench-composite-action-check.py [--actions 3000] [--workflows 1000] [--runs 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import os
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SPEC = importlib.util.spec_from_file_location(
+    "check_interpolation", ROOT / "scripts" / "check-composite-action-input-interpolation.py"
+)
+checker = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = checker
+SPEC.loader.exec_module(checker)
+
+ACTION = """name: Action {i}
+description: Synthetic composite action {i}
+inputs:
+  value:
+    description: Value
+    required: true
+runs:
+  using: composite
+  steps:
+{steps}
+"""
+ACTION_STEP = """    - name: Step {j}
+      shell: bash
+      env:
+        VALUE: ${{{{ inputs.value }}}}
+      run: |
+        set -euo pipefail
+        echo "step {j}: $VALUE"
+        for f in $(ls); do
+          echo "$f"
+        done
+"""
+WORKFLOW = """name: Workflow {i}
+on:
+  pull_request:
+jobs:
+{jobs}
+"""
+WORKFLOW_JOB = """  job-{j}:
+    runs-on: ubuntu-latest
+    steps:
+      - uses: actions/checkout@v4
+      - run: echo "job {j}"
+      - name: Build
+        run: |
+          pnpm install --frozen-lockfile
+          pnpm build
+          echo "base ${{{{ github.event.pull_request.base.sha }}}}"
+"""
+
+
+def build_tree(root: pathlib.Path, actions: int, workflows: int) -> None:
+    for i in range(actions):
+        action_dir = root / ".github" / "actions" / f"vendor-{i // 100:03d}" / f"action-{i:05d}"
+        action_dir.mkdir(parents=True)
+        steps = "".join(ACTION_STEP.format(j=j) for j in range(8))
+        if i % 10 == 0:
+            steps += '    - shell: bash\n      run: echo "${{ inputs.value }}"\n'
+        (action_dir / "action.yml").write_text(ACTION.format(i=i, steps=steps))
+    workflow_dir = root / ".github" / "workflows"
+    workflow_dir.mkdir(parents=True)
+    for i in range(workflows):
+        jobs = "".join(WORKFLOW_JOB.format(j=j) for j in range(6))
+        if i % 10 == 0:
+            jobs += "  bad:\n    runs-on: ubuntu-latest\n    steps:\n"
+            jobs += '      - run: echo "${{ github.event.pull_request.title }}"\n'
+        (workflow_dir / f"workflow-{i:05d}.yml").write_text(WORKFLOW.format(i=i, jobs=jobs))
+
+
+def timed(fn, runs: int) -> tuple[float, object]:
+    samples = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actions", type=int, default=3000)
+    parser.add_argument("--workflows", type=int, default=1000)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-composite-action-check-") as tmp:
+        tmp_path = pathlib.Path(tmp)
+        print(f"Building {args.actions} actions and {args.workflows} workflows...")
+        build_tree(tmp_path, args.actions, args.workflows)
+        with contextlib.chdir(tmp_path):
+            files = checker.find_files()
+            serial_s, (violations, entries) = timed(
+                lambda: checker.scan_files(files, jobs=1), args.runs
+            )
+            parallel_s, (parallel_violations, _) = timed(
+                lambda: checker.scan_files(files, jobs=args.jobs), args.runs
+            )
+            if parallel_violations != violations:
+                print("parallel scan disagrees with serial scan", file=sys.stderr)
+                return 1
+            warm_s, _ = timed(lambda: checker.scan_files(files, entries, jobs=args.jobs), args.runs)
+            for path in files[: args.edits]:
+                with path.open("a") as handle:
+                    handle.write("# edited\n")
+            edited_s, _ = timed(
+                lambda: checker.scan_files(files, entries, jobs=args.jobs), args.runs
+            )
+
+    print(f"files: {len(files)}, violations: {len(violations)}, jobs: {args.jobs}")
+    print(f"cold serial scan:    {serial_s * 1000:9.1f} ms")
+    print(f"cold parallel scan:  {parallel_s * 1000:9.1f} ms  ({serial_s / parallel_s:.1f}x)")
+    print(f"warm cached scan:    {warm_s * 1000:9.1f} ms  ({serial_s / warm_s:.1f}x)")
+    print(f"{args.edits} files edited:     {edited_s * 1000:9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
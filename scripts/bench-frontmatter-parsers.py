@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark the SKILL.md frontmatter parsers used by quick_validate.
+
+Reads the frontmatter of every SKILL.md under --root (default: skills/) and,
+for each available parser (libyaml CSafeLoader, pure-Python SafeLoader and
+quick_validate's fallback parser), checks it against SafeLoader's output and
+reports the median time to parse the whole set.
+
+Usage:
+    python3 scripts/bench-frontmatter-parsers.py [--root skills] [--runs 50]
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import statistics
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "skills" / "skill-creator" / "scripts"))
+
+import quick_validate  # noqa: E402
+
+
+def available_parsers() -> dict:
+    parsers = {}
+    yaml = quick_validate.yaml
+    if yaml is not None:
+        if hasattr(yaml, "CSafeLoader"):
+            parsers["yaml-c"] = lambda text: yaml.load(text, Loader=yaml.CSafeLoader)
+        parsers["yaml-python"] = lambda text: yaml.load(text, Loader=yaml.SafeLoader)
+    parsers["fallback"] = quick_validate._parse_simple_frontmatter
+    return parsers
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--root", default=str(ROOT / "skills"))
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    documents = []
+    for skill_dir in quick_validate.discover_skills(args.root):
+        text = quick_validate.read_frontmatter(skill_dir / "SKILL.md")
+        if text is not None:
+            documents.append((skill_dir.name, text))
+    if not documents:
+        print(f"No SKILL.md frontmatter found under {args.root}", file=sys.stderr)
+        return 1
+
+    parsers = available_parsers()
+    reference = parsers.get("yaml-python")
+    expected = [reference(text) for _, text in documents] if reference else None
+    total_bytes = sum(len(text.encode("utf-8")) for _, text in documents)
+    print(f"{len(documents)} frontmatter blocks, {total_bytes / 1024:.1f} KiB, {args.runs} runs\n")
+    print(f"{'parser':<12} {'median ms':>10} {'us/doc':>8} {'vs slowest':>10}  parity")
+
+    rows = []
+    for name, parse in parsers.items():
+        results = [parse(text) for _, text in documents]
+        if expected is None:
+            parity = "n/a (PyYAML missing)"
+        else:
+            mismatches = [doc for (doc, _), got, want in zip(documents, results, expected) if got != want]
+            parity = "identical" if not mismatches else f"{len(mismatches)} differ: {', '.join(mismatches[:5])}"
+        samples = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            for _, text in documents:
+                parse(text)
+            samples.append(time.perf_counter() - started)
+        rows.append((name, statistics.median(samples), parity))
+
+    slowest = max(seconds for _, seconds, _ in rows)
+    for name, seconds, parity in rows:
+        print(
+            f"{name:<12} {seconds * 1000:10.2f} {seconds / len(documents) * 1e6:8.1f} "
+            f"{slowest / seconds:9.1f}x  {parity}"
+        )
+    chosen = quick_validate.YAML_LOADER.__name__ if quick_validate.YAML_LOADER else "fallback"
+    print(f"\nquick_validate uses: {chosen}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
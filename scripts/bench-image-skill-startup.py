@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Measure startup cost of the image skill scripts with `python -X importtime`.
+
+Each script is launched on its cheapest real path (no API key in the
+environment, so it exits right after argument parsing). The benchmark reports
+median wall time, total import time and the slowest top-level imports, and
+fails when a script exceeds its startup budget.
+
+Usage:
+    python3 scripts/bench-image-skill-startup.py [--runs 15] [--budget-ms 120] [--top 8]
+    python3 scripts/bench-image-skill-startup.py --with-deps   # also time SDK/PIL imports
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SCRIPTS = {
+    "openai-image-gen/gen.py": (
+        ROOT / "skills/openai-image-gen/scripts/gen.py",
+        ["--count", "1"],
+    ),
+    "nano-banana-pro/generate_image.py": (
+        ROOT / "skills/nano-banana-pro/scripts/generate_image.py",
+        ["--prompt", "bench", "--filename", os.devnull],
+    ),
+}
+# Heavy imports generate_image.py defers until after the API key check.
+DEFERRED_DEPS = ["google.genai", "PIL.Image"]
+SCRUBBED_ENV = ("OPENAI_API_KEY", "GEMINI_API_KEY")
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int]]:
+    """Return (module, cumulative_us) for top-level imports in -X importtime output."""
+    imports: list[tuple[str, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        cumulative, name = parts[1].strip(), parts[2]
+        if not cumulative.isdigit():
+            continue  # header row
+        # Nested imports are indented under their parent; keep top-level only.
+        if not name.startswith("  "):
+            imports.append((name.strip(), int(cumulative)))
+    return imports
+
+
+def run_once(argv: list[str], env: dict[str, str]) -> tuple[float, list[tuple[str, int]]]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return elapsed_ms, parse_importtime(proc.stderr)
+
+
+def bench(label: str, argv: list[str], runs: int, top: int) -> float:
+    env = {k: v for k, v in os.environ.items() if k not in SCRUBBED_ENV}
+    walls: list[float] = []
+    import_totals: list[int] = []
+    slowest: dict[str, int] = {}
+    for _ in range(runs):
+        wall_ms, imports = run_once(argv, env)
+        walls.append(wall_ms)
+        import_totals.append(sum(us for _, us in imports))
+        for name, us in imports:
+            slowest[name] = max(slowest.get(name, 0), us)
+
+    wall = statistics.median(walls)
+    print(f"{label}")
+    print(f"  {'wall (median of ' + str(runs) + '):':24}{wall:8.1f} ms")
+    print(f"  {'imports (median):':24}{statistics.median(import_totals) / 1000:8.1f} ms")
+    for name, us in sorted(slowest.items(), key=lambda item: item[1], reverse=True)[:top]:
+        print(f"    {us / 1000:7.2f} ms  {name}")
+    return wall
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=15, help="Launches per script (default: 15).")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=120.0,
+        help="Fail when a script's median wall time exceeds this (default: 120).",
+    )
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list.")
+    parser.add_argument(
+        "--with-deps",
+        action="store_true",
+        help="Also time the deferred google-genai/PIL imports (needs them installed).",
+    )
+    args = parser.parse_args()
+
+    over_budget: list[str] = []
+    baseline = bench("python -c pass (interpreter floor)", ["-c", "pass"], args.runs, 0)
+    for label, (script, script_args) in SCRIPTS.items():
+        wall = bench(label, [str(script), *script_args], args.runs, args.top)
+        print(f"  {'over interpreter floor:':24}{wall - baseline:8.1f} ms")
+        if wall > args.budget_ms:
+            over_budget.append(f"{label}: {wall:.1f} ms > {args.budget_ms:.1f} ms")
+
+    if args.with_deps:
+        code = "; ".join(f"import {mod}" for mod in DEFERRED_DEPS)
+        bench(f"deferred deps ({', '.join(DEFERRED_DEPS)})", ["-c", code], args.runs, args.top)
+
+    if over_budget:
+        print("\nStartup budget exceeded:")
+        for line in over_budget:
+            print(f"- {line}")
+        return 1
+    print(f"\nAll scripts within the {args.budget_ms:.0f} ms startup budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark skill packaging on a skill that sits next to a large node_modules.
+
+Builds a synthetic skill (a handful of shipped files plus a node_modules tree
+of --node-files files and a .git directory), then times:
+
+- the legacy `rglob("*")` + post-filter collection package_skill used to do,
+- the pruned `iter_skill_files` walk,
+- a full `package_skill` run.
+
+Usage:
+    python3 scripts/bench-package-skill.py [--node-files 50000] [--runs 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "skills" / "skill-creator" / "scripts"))
+
+import package_skill  # noqa: E402
+
+FILES_PER_PACKAGE = 100
+
+
+def build_skill(root: pathlib.Path, node_files: int) -> pathlib.Path:
+    skill = root / "bench-skill"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "references").mkdir()
+    (skill / "SKILL.md").write_text(
+        "---\nname: bench-skill\ndescription: Packaging benchmark skill.\n---\n\n# Bench\n"
+    )
+    for i in range(20):
+        (skill / "scripts" / f"tool_{i}.py").write_text(f"print({i})\n" * 50)
+        (skill / "references" / f"ref_{i}.md").write_text(f"# Ref {i}\n" + "lorem ipsum\n" * 200)
+    for i in range(0, node_files, FILES_PER_PACKAGE):
+        package = skill / "node_modules" / f"pkg-{i // FILES_PER_PACKAGE:05d}" / "lib"
+        package.mkdir(parents=True)
+        for j in range(min(FILES_PER_PACKAGE, node_files - i)):
+            (package / f"m{j}.js").write_text("module.exports = 1;\n")
+    (skill / ".git" / "objects").mkdir(parents=True)
+    for i in range(500):
+        (skill / ".git" / "objects" / f"obj{i}").write_bytes(b"\0" * 64)
+    return skill
+
+
+def legacy_collect(skill_path: pathlib.Path) -> list[pathlib.Path]:
+    """The pre-pruning collection: walk everything, filter afterwards."""
+    files = []
+    for file_path in skill_path.rglob("*"):
+        if file_path.is_symlink():
+            continue
+        rel_parts = file_path.relative_to(skill_path).parts
+        if any(part in package_skill.EXCLUDED_DIRS for part in rel_parts):
+            continue
+        if file_path.is_file():
+            file_path.resolve()
+            files.append(file_path)
+    return files
+
+
+def timed(fn, runs: int) -> tuple[float, object]:
+    samples = []
+    result = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--node-files", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-package-skill-") as tmp:
+        tmp_path = pathlib.Path(tmp)
+        print(f"Building synthetic skill with {args.node_files} node_modules files...")
+        skill = build_skill(tmp_path, args.node_files)
+        out_dir = tmp_path / "dist"
+
+        legacy_s, legacy_files = timed(lambda: legacy_collect(skill), args.runs)
+        pruned_s, pruned_files = timed(lambda: list(package_skill.iter_skill_files(skill)), args.runs)
+
+        def package():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return package_skill.package_skill(skill, out_dir)
+
+        package_s, archive = timed(package, args.runs)
+        if archive is None:
+            print("package_skill failed", file=sys.stderr)
+            return 1
+
+        print(f"shipped files: {len(pruned_files)} (legacy walk: {len(legacy_files)})")
+        print(f"legacy rglob walk:   {legacy_s * 1000:9.1f} ms")
+        print(f"pruned scandir walk: {pruned_s * 1000:9.1f} ms  ({legacy_s / pruned_s:.0f}x faster)")
+        print(f"full package_skill:  {package_s * 1000:9.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
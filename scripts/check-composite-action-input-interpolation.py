@@ -1,48 +1,120 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import concurrent.futures
+import dataclasses
+import hashlib
+import json
+import os
 import pathlib
 import re
+import subprocess
 import sys
+from collections.abc import Iterator
 
-
-INPUT_INTERPOLATION_RE = re.compile(r"\$\{\{\s*inputs\.")
-RUN_LINE_RE = re.compile(r"^(\s*)run:\s*(.*)$")
+RUN_LINE_RE = re.compile(r"^(\s*)(-\s+)?run:\s*(.*)$")
 USING_COMPOSITE_RE = re.compile(r"^\s*using:\s*composite\s*$", re.MULTILINE)
+JOBS_RE = re.compile(r"^jobs:\s*$", re.MULTILINE)
+
+COMPOSITE = "composite"
+WORKFLOW = "workflow"
+
+ACTION_GLOB = ".github/actions/**/action.y*ml"
+WORKFLOW_GLOBS = (".github/workflows/*.yml", ".github/workflows/*.yaml")
+
+# Bump when the tokenizer changes in a way that invalidates cached results.
+SCANNER_VERSION = 1
+# Below this many uncached files a process pool costs more than it saves.
+MIN_PARALLEL_FILES = 64
+MAX_CACHE_ENTRIES = 20_000
+
+
+@dataclasses.dataclass(frozen=True)
+class Rule:
+    name: str
+    title: str
+    hint: str
+    pattern: re.Pattern[str]
+    kinds: frozenset[str]
+
+
+@dataclasses.dataclass(frozen=True)
+class Violation:
+    path: pathlib.Path
+    line_no: int
+    rule: str
+    text: str
+
+
+RULES: list[Rule] = []
+
+
+def register_rule(name: str, title: str, hint: str, pattern: str, kinds: tuple[str, ...]) -> Rule:
+    rule = Rule(name, title, hint, re.compile(pattern), frozenset(kinds))
+    RULES.append(rule)
+    return rule
+
+
+register_rule(
+    "inputs-interpolation",
+    "Disallowed direct inputs interpolation in composite run blocks",
+    "Use env: and reference shell variables instead.",
+    r"\$\{\{\s*inputs\.",
+    (COMPOSITE,),
+)
+register_rule(
+    "workflow-inputs-interpolation",
+    "Disallowed direct inputs interpolation in workflow run blocks",
+    "Use env: and reference shell variables instead.",
+    r"\$\{\{[^}]*\b(?:github\.event\.)?inputs\.",
+    (WORKFLOW,),
+)
+register_rule(
+    "untrusted-event-interpolation",
+    "Disallowed interpolation of attacker-controlled event fields in run blocks",
+    "Pass the value through env: and quote the shell variable.",
+    r"\$\{\{[^}]*\bgithub\.(?:head_ref\b|event\.(?:"
+    r"(?:issue|pull_request|discussion)\.(?:title|body)"
+    r"|(?:comment|review|review_comment)\.body"
+    r"|pull_request\.head\.(?:ref|label|repo\.default_branch)"
+    r"|(?:head_commit|commits\S*)\.(?:message|author\.(?:email|name))"
+    r"|pages\S*\.page_name))",
+    (COMPOSITE, WORKFLOW),
+)
 
 
 def indentation(line: str) -> int:
     return len(line) - len(line.lstrip(" "))
 
 
-def scan_file(path: pathlib.Path) -> list[tuple[int, str]]:
-    text = path.read_text(encoding="utf-8")
-    if not USING_COMPOSITE_RE.search(text):
-        return []
+def file_kind(path: pathlib.Path, text: str) -> str | None:
+    if USING_COMPOSITE_RE.search(text):
+        return COMPOSITE
+    if "workflows" in path.parts or JOBS_RE.search(text):
+        return WORKFLOW
+    return None
 
-    lines = text.splitlines()
-    violations: list[tuple[int, str]] = []
+
+def iter_run_lines(lines: list[str]) -> Iterator[tuple[int, str]]:
+    """Yield (line_no, line) for every line of every run: value, inline or block."""
     line_count = len(lines)
     index = 0
 
     while index < line_count:
         line = lines[index]
         match = RUN_LINE_RE.match(line)
+        index += 1
         if not match:
-            index += 1
             continue
 
-        run_indent = len(match.group(1))
-        run_value = match.group(2).strip()
-        line_no = index + 1
-
+        # Column of the run: key itself, also for list items (`- run: ...`).
+        run_indent = len(match.group(1)) + len(match.group(2) or "")
+        run_value = match.group(3).strip()
         if run_value and run_value[0] not in ("|", ">"):
-            if INPUT_INTERPOLATION_RE.search(run_value):
-                violations.append((line_no, line.strip()))
-            index += 1
-            continue
+            yield index, line
 
-        index += 1
+        # Block scalar contents, or continuation lines of a multi-line plain scalar.
         while index < line_count:
             script_line = lines[index]
             if script_line.strip() == "":
@@ -50,31 +122,205 @@ def scan_file(path: pathlib.Path) -> list[tuple[int, str]]:
                 continue
             if indentation(script_line) <= run_indent:
                 break
-            if INPUT_INTERPOLATION_RE.search(script_line):
-                violations.append((index + 1, script_line.strip()))
             index += 1
+            yield index, script_line
+
 
+def scan_text(path: pathlib.Path, text: str, rules: list[Rule] = RULES) -> list[Violation]:
+    kind = file_kind(path, text)
+    active = [rule for rule in rules if kind in rule.kinds]
+    if not active:
+        return []
+
+    violations: list[Violation] = []
+    for line_no, line in iter_run_lines(text.splitlines()):
+        for rule in active:
+            if rule.pattern.search(line):
+                violations.append(Violation(path, line_no, rule.name, line.strip()))
     return violations
 
 
-def main() -> int:
-    root = pathlib.Path(".github/actions")
-    files = sorted(root.rglob("action.y*ml"))
-    all_violations: list[tuple[pathlib.Path, int, str]] = []
+def scan_file(path: pathlib.Path, rules: list[Rule] = RULES) -> list[Violation]:
+    return scan_text(path, path.read_text(encoding="utf-8"), rules)
+
+
+def find_files(root: pathlib.Path = pathlib.Path(".")) -> list[pathlib.Path]:
+    files = set(root.glob(ACTION_GLOB))
+    for pattern in WORKFLOW_GLOBS:
+        files.update(root.glob(pattern))
+    return sorted(files)
+
+
+def is_checked_path(path: pathlib.Path) -> bool:
+    parts = path.parts
+    if len(parts) < 3 or parts[0] != ".github" or path.suffix not in (".yml", ".yaml"):
+        return False
+    if parts[1] == "actions":
+        return path.stem == "action"
+    return parts[1] == "workflows" and len(parts) == 3
+
+
+def changed_files(ref: str) -> list[pathlib.Path]:
+    """Checked files that differ from ref (committed, staged or unstaged) and still exist."""
+    output = subprocess.run(
+        ["git", "diff", "--name-only", "--diff-filter=ACMR", ref, "--"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    files = {pathlib.Path(name) for name in output.splitlines()}
+    return sorted(path for path in files if is_checked_path(path) and path.is_file())
+
+
+def rules_fingerprint(rules: list[Rule] = RULES) -> str:
+    spec = [SCANNER_VERSION] + [
+        [rule.name, rule.pattern.pattern, sorted(rule.kinds)] for rule in rules
+    ]
+    return hashlib.sha256(json.dumps(spec).encode("utf-8")).hexdigest()
+
+
+def default_cache_path() -> pathlib.Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache"
+    return pathlib.Path(cache_home) / "openclaw" / "actions-interpolation-check.json"
+
+
+def load_cache(cache_path: pathlib.Path, fingerprint: str) -> dict:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("rules") != fingerprint:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_cache(cache_path: pathlib.Path, fingerprint: str, entries: dict) -> None:
+    # Keep the most recently used entries (dict order is insertion order).
+    entries = dict(list(entries.items())[-MAX_CACHE_ENTRIES:])
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(
+            json.dumps({"rules": fingerprint, "entries": entries}), encoding="utf-8"
+        )
+        os.replace(tmp_path, cache_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _scan_entry(path: str, text: str) -> list[list]:
+    # Cache entries hold findings only; the path is filled in when they are used.
+    return [
+        [violation.line_no, violation.rule, violation.text]
+        for violation in scan_text(pathlib.Path(path), text)
+    ]
+
+
+def scan_files(
+    files: list[pathlib.Path], cache: dict | None = None, jobs: int | None = None
+) -> tuple[list[Violation], dict]:
+    """
+    Scan files, reusing cache entries keyed by (kind, content hash). Uncached
+    files fan out over a process pool when there are enough of them. Returns
+    the violations and the cache entries for the files scanned.
+    """
+    cache = cache or {}
+    entries: dict = {}
+    keys: list[str] = []
+    misses: list[tuple[pathlib.Path, str, str]] = []
+    for path in files:
+        text = path.read_text(encoding="utf-8")
+        # The file kind depends on the path as well as the content.
+        key = hashlib.sha256(f"{file_kind(path, text)}\0{text}".encode("utf-8")).hexdigest()
+        keys.append(key)
+        if key in entries:
+            continue
+        entries[key] = cache.get(key)
+        if entries[key] is None:
+            misses.append((path, key, text))
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(misses) >= MIN_PARALLEL_FILES:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(
+                _scan_entry,
+                [str(path) for path, _, _ in misses],
+                [text for _, _, text in misses],
+                chunksize=max(1, len(misses) // (jobs * 4)),
+            )
+            for (_, key, _), found in zip(misses, results):
+                entries[key] = found
+    else:
+        for path, key, text in misses:
+            entries[key] = _scan_entry(str(path), text)
+
+    violations: list[Violation] = []
+    for path, key in zip(files, keys):
+        violations.extend(Violation(path, *found) for found in entries[key])
+    return violations, entries
+
+
+def report(violations: list[Violation]) -> int:
+    if not violations:
+        print("No disallowed interpolation found in composite action or workflow run blocks.")
+        return 0
+
+    for rule in RULES:
+        matched = [violation for violation in violations if violation.rule == rule.name]
+        if not matched:
+            continue
+        print(f"{rule.title}:")
+        for violation in matched:
+            print(f"- {violation.path}:{violation.line_no}: {violation.text}")
+        print(rule.hint)
+    return 1
+
 
-    for file_path in files:
-        for line_no, line in scan_file(file_path):
-            all_violations.append((file_path, line_no, line))
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check composite actions and workflows for unsafe interpolation in run blocks."
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=pathlib.Path,
+        help="Files to check (default: every action/workflow)",
+    )
+    parser.add_argument(
+        "--changed-since", metavar="REF", help="Only check files that differ from this git ref"
+    )
+    parser.add_argument("--jobs", type=int, help="Worker processes for large scans (default: CPUs)")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore and do not update the cache"
+    )
+    parser.add_argument(
+        "--cache", type=pathlib.Path, help=f"Result cache file (default: {default_cache_path()})"
+    )
+    args = parser.parse_args(argv)
 
-    if all_violations:
-        print("Disallowed direct inputs interpolation in composite run blocks:")
-        for file_path, line_no, line in all_violations:
-            print(f"- {file_path}:{line_no}: {line}")
-        print("Use env: and reference shell variables instead.")
-        return 1
+    if args.changed_since:
+        try:
+            files = changed_files(args.changed_since)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"Could not list files changed since {args.changed_since}: {e}", file=sys.stderr)
+            return 2
+    elif args.paths:
+        files = sorted({path for path in args.paths if is_checked_path(path)})
+    else:
+        files = find_files()
 
-    print("No direct inputs interpolation found in composite run blocks.")
-    return 0
+    fingerprint = rules_fingerprint()
+    cache_path = args.cache or default_cache_path()
+    cache = {} if args.no_cache else load_cache(cache_path, fingerprint)
+    violations, entries = scan_files(files, cache, jobs=args.jobs)
+    if not args.no_cache and entries.keys() - cache.keys():
+        try:
+            stale = {key: value for key, value in cache.items() if key not in entries}
+            save_cache(cache_path, fingerprint, {**stale, **entries})
+        except OSError:
+            pass
+    return report(violations)
 
 
 if __name__ == "__main__":
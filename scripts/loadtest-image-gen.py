@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Load-test the image skill scripts against the local mock provider server.
+
+Starts skills/_shared/mock_image_server.py in-process, then for every
+concurrency level launches the target script as separate processes (the way
+the agent invokes it) and reports throughput, latency percentiles and peak
+RSS. The `gen-batch` target instead runs one gen.py process with
+`--count N --concurrency C` to measure the in-process scheduler.
+
+Usage:
+    python3 scripts/loadtest-image-gen.py --target gen --jobs 40 --concurrency 1,4,16 \\
+        --latency lognormal:400,0.5 --rate-limit-rate 0.05 --payload-bytes 1500000
+    python3 scripts/loadtest-image-gen.py --target nano --python .venv/bin/python
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SHARED_DIR = ROOT / "skills" / "_shared"
+GEN_SCRIPT = ROOT / "skills" / "openai-image-gen" / "scripts" / "gen.py"
+NANO_SCRIPT = ROOT / "skills" / "nano-banana-pro" / "scripts" / "generate_image.py"
+
+sys.path.insert(0, str(SHARED_DIR))
+import imagegen_core  # noqa: E402
+import mock_image_server  # noqa: E402
+
+
+def run_process(argv: list[str], env: dict[str, str]) -> tuple[int, float, int]:
+    """Run argv; return (exit_code, wall_s, peak_rss_bytes) for that process alone."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(argv, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - started
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return proc.returncode, wall, rss
+
+
+def job_argv(target: str, python: str, index: int, out_dir: pathlib.Path, args) -> list[str]:
+    prompt = f"load test image {index}"
+    if target == "gen":
+        return [
+            python, str(GEN_SCRIPT), "--prompt", prompt, "--count", "1",
+            "--retries", str(args.retries), "--out-dir", str(out_dir / f"job-{index:05d}"),
+        ]
+    return [
+        python, str(NANO_SCRIPT), "--prompt", prompt, "--retries", str(args.retries),
+        "--filename", str(out_dir / f"job-{index:05d}.png"),
+    ]
+
+
+def run_level(target: str, concurrency: int, args, env: dict[str, str]) -> dict:
+    with tempfile.TemporaryDirectory(prefix="image-loadtest-") as tmp:
+        out_dir = pathlib.Path(tmp)
+        latencies: list[float] = []
+        failed = 0
+        peak_rss = 0
+        lock = threading.Lock()
+
+        if target == "gen-batch":
+            argv = [
+                args.python, str(GEN_SCRIPT), "--prompt", "load test", "--count", str(args.jobs),
+                "--concurrency", str(concurrency), "--retries", str(args.retries),
+                "--out-dir", str(out_dir),
+            ]
+            code, wall, peak_rss = run_process(argv, env)
+            return {
+                "target": target,
+                "concurrency": concurrency,
+                "jobs": args.jobs,
+                "failedProcesses": int(code != 0),
+                "wallS": wall,
+                "jobsPerS": args.jobs / wall if wall else None,
+                "latencyMs": None,
+                "peakRssMb": peak_rss / 2**20,
+            }
+
+        def one(index: int) -> None:
+            nonlocal failed, peak_rss
+            code, latency_s, rss = run_process(
+                job_argv(target, args.python, index, out_dir, args), env
+            )
+            with lock:
+                latencies.append(latency_s)
+                failed += int(code != 0)
+                peak_rss = max(peak_rss, rss)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(1, args.jobs + 1)))
+        wall = time.perf_counter() - started
+
+        return {
+            "target": target,
+            "concurrency": concurrency,
+            "jobs": args.jobs,
+            "failedProcesses": failed,
+            "wallS": wall,
+            "jobsPerS": args.jobs / wall if wall else None,
+            "latencyMs": {
+                "p50": imagegen_core.percentile(latencies, 50) * 1000,
+                "p95": imagegen_core.percentile(latencies, 95) * 1000,
+                "p99": imagegen_core.percentile(latencies, 99) * 1000,
+            },
+            "peakRssMb": peak_rss / 2**20,
+        }
+
+
+def print_table(rows: list[dict]) -> None:
+    print(
+        f"{'target':<10} {'conc':>4} {'jobs':>5} {'fail':>4} {'wall s':>8} {'jobs/s':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak MB':>8}"
+    )
+    for row in rows:
+        lat = row["latencyMs"] or {}
+
+        def ms(key: str) -> str:
+            return f"{lat[key]:8.0f}" if key in lat else f"{'-':>8}"
+
+        print(
+            f"{row['target']:<10} {row['concurrency']:>4} {row['jobs']:>5} {row['failedProcesses']:>4} "
+            f"{row['wallS']:8.2f} {row['jobsPerS']:7.2f} {ms('p50')} {ms('p95')} {ms('p99')} "
+            f"{row['peakRssMb']:8.1f}"
+        )
+
+
+def main() -> int:
+    parser = mock_image_server.build_parser()
+    parser.description = __doc__.splitlines()[0]
+    parser.set_defaults(port=0)
+    parser.add_argument("--target", choices=["gen", "gen-batch", "nano"], default="gen")
+    parser.add_argument("--jobs", type=int, default=20, help="Images per concurrency level.")
+    parser.add_argument("--concurrency", default="1,4,8", help="Comma-separated levels.")
+    parser.add_argument("--retries", type=int, default=2, help="--retries passed to the script.")
+    parser.add_argument(
+        "--python",
+        default=sys.executable,
+        help="Interpreter for the target (nano needs google-genai and pillow).",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    server = mock_image_server.start_server(
+        mock_image_server.config_from_args(args), host=args.host, port=args.port
+    )
+    env = {
+        **os.environ,
+        "OPENAI_BASE_URL": f"{server.base_url}/v1",
+        "OPENAI_API_KEY": "mock",
+        "GEMINI_BASE_URL": server.base_url,
+        "GEMINI_API_KEY": "mock",
+    }
+    try:
+        rows = [run_level(args.target, level, args, env) for level in levels]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if args.json:
+        print(json.dumps({"results": rows, "server": server.stats}, indent=2))
+    else:
+        print_table(rows)
+        print(f"\nmock server: {json.dumps(server.stats)}")
+    return 1 if any(row["failedProcesses"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Copy skills/_shared/imagegen_core.py into every image skill that ships it.
+
+Each image skill carries its own byte-identical copy so it still works when
+installed on its own. Edit the shared module, then run this script; --check
+only reports copies that differ (for CI and pre-commit).
+
+Usage:
+    python3 scripts/sync-imagegen-core.py           # rewrite drifted copies
+    python3 scripts/sync-imagegen-core.py --check   # exit 1 if any copy differs
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SOURCE = ROOT / "skills" / "_shared" / "imagegen_core.py"
+SKILLS = ("openai-image-gen", "nano-banana-pro")
+
+
+def vendored_paths() -> list[pathlib.Path]:
+    return [ROOT / "skills" / skill / "scripts" / SOURCE.name for skill in SKILLS]
+
+
+def drifted(source: bytes) -> list[pathlib.Path]:
+    return [
+        path for path in vendored_paths() if not path.is_file() or path.read_bytes() != source
+    ]
+
+
+def write_copy(path: pathlib.Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--check", action="store_true", help="Only report copies that differ; do not write"
+    )
+    args = parser.parse_args(argv)
+
+    source = SOURCE.read_bytes()
+    stale = drifted(source)
+    if not stale:
+        print(f"All {len(SKILLS)} copies of {SOURCE.name} are in sync.")
+        return 0
+    for path in stale:
+        rel_path = path.relative_to(ROOT)
+        if args.check:
+            print(f"{rel_path} differs from {SOURCE.relative_to(ROOT)}", file=sys.stderr)
+        else:
+            write_copy(path, source)
+            print(f"Updated {rel_path}")
+    if args.check:
+        print("Run: python3 scripts/sync-imagegen-core.py", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
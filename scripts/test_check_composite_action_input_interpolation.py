@@ -0,0 +1,324 @@
+import concurrent.futures
+import dataclasses
+import importlib.util
+import pathlib
+import re
+import subprocess
+import sys
+
+import pytest
+
+SPEC = importlib.util.spec_from_file_location(
+    "check_interpolation",
+    pathlib.Path(__file__).with_name("check-composite-action-input-interpolation.py"),
+)
+assert SPEC and SPEC.loader
+checker = importlib.util.module_from_spec(SPEC)
+sys.modules[SPEC.name] = checker
+SPEC.loader.exec_module(checker)
+
+ACTION_PATH = pathlib.Path(".github/actions/setup/action.yml")
+WORKFLOW_PATH = pathlib.Path(".github/workflows/ci.yml")
+
+ACTION_HEADER = """\
+name: Setup
+runs:
+  using: composite
+  steps:
+"""
+WORKFLOW_HEADER = """\
+on: push
+jobs:
+  build:
+    runs-on: ubuntu-latest
+    steps:
+"""
+
+
+def findings(path, text):
+    return [(v.line_no, v.rule) for v in checker.scan_text(path, text)]
+
+
+@pytest.mark.parametrize(
+    ("path", "header", "expression", "rule"),
+    [
+        (ACTION_PATH, ACTION_HEADER, "${{ inputs.ref }}", "inputs-interpolation"),
+        (WORKFLOW_PATH, WORKFLOW_HEADER, "${{ inputs.tag }}", "workflow-inputs-interpolation"),
+        (
+            WORKFLOW_PATH,
+            WORKFLOW_HEADER,
+            "${{ github.event.inputs.tag }}",
+            "workflow-inputs-interpolation",
+        ),
+        (
+            ACTION_PATH,
+            ACTION_HEADER,
+            "${{ github.event.pull_request.title }}",
+            "untrusted-event-interpolation",
+        ),
+        (WORKFLOW_PATH, WORKFLOW_HEADER, "${{ github.head_ref }}", "untrusted-event-interpolation"),
+        (
+            WORKFLOW_PATH,
+            WORKFLOW_HEADER,
+            "${{ github.event.comment.body }}",
+            "untrusted-event-interpolation",
+        ),
+    ],
+)
+def test_rule_flags_interpolation_in_run(path, header, expression, rule):
+    text = header + f"    - run: echo {expression}\n"
+
+    assert findings(path, text) == [(len(header.splitlines()) + 1, rule)]
+
+
+@pytest.mark.parametrize(
+    ("path", "header", "expression"),
+    [
+        # Passing the value through env: is the recommended fix.
+        (ACTION_PATH, ACTION_HEADER, '"$REF"'),
+        (WORKFLOW_PATH, WORKFLOW_HEADER, "${{ steps.meta.outputs.tag }}"),
+        (ACTION_PATH, ACTION_HEADER, "${{ github.event.pull_request.number }}"),
+        (WORKFLOW_PATH, WORKFLOW_HEADER, "${{ github.event.pull_request.head.sha }}"),
+        # Composite actions have no workflow-level github.event.inputs.
+        (ACTION_PATH, ACTION_HEADER, "${{ github.event.inputs.tag }}"),
+    ],
+)
+def test_rule_ignores_safe_expressions(path, header, expression):
+    text = header + f"    - run: echo {expression}\n"
+
+    assert findings(path, text) == []
+
+
+def test_interpolation_outside_run_is_allowed():
+    text = ACTION_HEADER + """\
+    - uses: actions/checkout@v4
+      with:
+        ref: ${{ inputs.ref }}
+    - env:
+        TITLE: ${{ github.event.pull_request.title }}
+      run: echo "$TITLE"
+"""
+
+    assert findings(ACTION_PATH, text) == []
+
+
+def test_inline_list_item_run_is_checked():
+    text = ACTION_HEADER + """\
+    - name: Inline
+      run: echo ${{ inputs.a }}
+    - run: echo ${{ inputs.b }}
+    -   run: echo ${{ inputs.c }}
+"""
+
+    assert findings(ACTION_PATH, text) == [
+        (6, "inputs-interpolation"),
+        (7, "inputs-interpolation"),
+        (8, "inputs-interpolation"),
+    ]
+
+
+def test_block_scalar_ends_at_the_run_key_indentation():
+    text = ACTION_HEADER + """\
+    - run: |
+        echo start
+
+        echo ${{ inputs.ref }}
+      shell: bash
+      env:
+        REF: ${{ inputs.ref }}
+    - name: Next
+      run: >-
+        echo ${{ inputs.other }}
+      with:
+        value: ${{ inputs.other }}
+"""
+
+    assert findings(ACTION_PATH, text) == [(8, "inputs-interpolation"), (14, "inputs-interpolation")]
+
+
+def test_block_scalar_lines_are_checked_at_any_deeper_indentation():
+    text = WORKFLOW_HEADER + """\
+      - name: Nested
+        run: |
+          if true; then
+              echo ${{ github.head_ref }}
+          fi
+        shell: bash
+"""
+
+    assert findings(WORKFLOW_PATH, text) == [(9, "untrusted-event-interpolation")]
+
+
+def test_plain_scalar_continuation_lines_are_checked():
+    text = ACTION_HEADER + """\
+    - run: echo first
+        ${{ inputs.ref }}
+      shell: bash
+"""
+
+    assert findings(ACTION_PATH, text) == [(6, "inputs-interpolation")]
+
+
+def test_file_kind_selects_the_rule_set():
+    text = "run: echo ${{ inputs.ref }}\n"
+
+    assert checker.file_kind(ACTION_PATH, ACTION_HEADER) == checker.COMPOSITE
+    assert checker.file_kind(WORKFLOW_PATH, text) == checker.WORKFLOW
+    # Neither a composite action nor a workflow: nothing to check.
+    assert findings(pathlib.Path(".github/actions/js/action.yml"), text) == []
+
+
+def write_tree(root, actions=3, workflows=2):
+    """Distinct composite actions and workflows under root; every odd one has a violation."""
+    for i in range(actions):
+        expression = "${{ inputs.ref }}" if i % 2 else '"$REF"'
+        path = root / ".github" / "actions" / f"a{i}" / "action.yml"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = ACTION_HEADER + f"    - run: echo {expression}\n# a{i}\n"
+        path.write_text(text, encoding="utf-8")
+    for i in range(workflows):
+        expression = "${{ github.head_ref }}" if i % 2 else "${{ github.sha }}"
+        path = root / ".github" / "workflows" / f"w{i}.yml"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = WORKFLOW_HEADER + f"      - run: echo {expression}\n# w{i}\n"
+        path.write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def scanned(monkeypatch):
+    """Record the path of every file the checker actually scans (rather than reads from cache)."""
+    paths = []
+    scan_entry = checker._scan_entry
+
+    def recording_scan_entry(path, text):
+        paths.append(path)
+        return scan_entry(path, text)
+
+    monkeypatch.setattr(checker, "_scan_entry", recording_scan_entry)
+    return paths
+
+
+def test_cache_hit_skips_rescanning(tmp_path, monkeypatch, capsys, scanned):
+    monkeypatch.chdir(tmp_path)
+    write_tree(tmp_path)
+    cache = tmp_path / "cache.json"
+
+    assert checker.main(["--cache", str(cache)]) == 1
+    first = capsys.readouterr().out
+    assert len(scanned) == 5
+
+    scanned.clear()
+    assert checker.main(["--cache", str(cache)]) == 1
+    assert scanned == []
+    assert capsys.readouterr().out == first
+
+
+def test_editing_a_file_invalidates_only_its_entry(tmp_path, monkeypatch, capsys, scanned):
+    monkeypatch.chdir(tmp_path)
+    write_tree(tmp_path)
+    cache = tmp_path / "cache.json"
+    checker.main(["--cache", str(cache)])
+    scanned.clear()
+    capsys.readouterr()
+
+    edited = pathlib.Path(".github/workflows/w0.yml")
+    edited.write_text(WORKFLOW_HEADER + "      - run: echo ${{ inputs.tag }}\n", encoding="utf-8")
+
+    assert checker.main(["--cache", str(cache)]) == 1
+    assert scanned == [str(edited)]
+    assert f"- {edited}:6: - run: echo ${{{{ inputs.tag }}}}" in capsys.readouterr().out
+
+
+def test_rules_change_invalidates_the_cache(tmp_path, monkeypatch, scanned):
+    monkeypatch.chdir(tmp_path)
+    write_tree(tmp_path)
+    cache = tmp_path / "cache.json"
+    checker.main(["--cache", str(cache)])
+    scanned.clear()
+
+    monkeypatch.setattr(checker, "SCANNER_VERSION", checker.SCANNER_VERSION + 1)
+    checker.main(["--cache", str(cache)])
+    assert len(scanned) == 5
+
+    # Any change to the rule set changes the fingerprint the cache is stored under.
+    fingerprint = checker.rules_fingerprint()
+    assert checker.load_cache(cache, fingerprint)
+    rule = checker.RULES[-1]
+    edited_rule = dataclasses.replace(rule, pattern=re.compile(rule.pattern.pattern + "x"))
+    for rules in (checker.RULES[:-1], checker.RULES[:-1] + [edited_rule]):
+        assert checker.load_cache(cache, checker.rules_fingerprint(rules)) == {}
+
+
+def git(root, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=root,
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_changed_since_checks_only_changed_matching_files(tmp_path, monkeypatch, capsys, scanned):
+    monkeypatch.chdir(tmp_path)
+    write_tree(tmp_path)
+    (tmp_path / "README.md").write_text("run: echo ${{ inputs.ref }}\n", encoding="utf-8")
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-qm", "base")
+
+    # Modified (committed and unstaged), added, deleted and unchecked files.
+    pathlib.Path(".github/actions/a1/action.yml").write_text(
+        ACTION_HEADER + "    - run: echo ${{ inputs.changed }}\n", encoding="utf-8"
+    )
+    git(tmp_path, "commit", "-qam", "change a1")
+    pathlib.Path(".github/workflows/w0.yml").write_text(
+        WORKFLOW_HEADER + "      - run: echo ${{ github.head_ref }}\n", encoding="utf-8"
+    )
+    pathlib.Path(".github/workflows/w1.yml").unlink()
+    new_action = pathlib.Path(".github/actions/new/action.yaml")
+    new_action.parent.mkdir()
+    new_action.write_text(ACTION_HEADER + "    - run: echo ok\n", encoding="utf-8")
+    git(tmp_path, "add", str(new_action))
+    pathlib.Path(".github/actions/a1/notes.yml").write_text("x: ${{ inputs.ref }}\n")
+    pathlib.Path("README.md").write_text("changed\n", encoding="utf-8")
+
+    assert checker.changed_files("HEAD~1") == [
+        pathlib.Path(".github/actions/a1/action.yml"),
+        pathlib.Path(".github/actions/new/action.yaml"),
+        pathlib.Path(".github/workflows/w0.yml"),
+    ]
+    assert checker.main(["--changed-since", "HEAD~1", "--no-cache"]) == 1
+    assert sorted(scanned) == [str(path) for path in checker.changed_files("HEAD~1")]
+    out = capsys.readouterr().out
+    assert "a1/action.yml:5" in out and "w0.yml:6" in out
+    assert "a3" not in out
+
+
+def test_changed_since_reports_a_bad_ref(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    git(tmp_path, "init", "-q")
+
+    assert checker.main(["--changed-since", "no-such-ref"]) == 2
+    assert "Could not list files changed since no-such-ref" in capsys.readouterr().err
+
+
+def test_parallel_scan_matches_serial_scan(tmp_path, monkeypatch):
+    write_tree(tmp_path, actions=12, workflows=8)
+    files = checker.find_files(tmp_path)
+    monkeypatch.setattr(checker, "MIN_PARALLEL_FILES", 4)
+    pools = []
+
+    class RecordingPool(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(kwargs.get("max_workers"))
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(checker.concurrent.futures, "ProcessPoolExecutor", RecordingPool)
+
+    serial = checker.scan_files(files, jobs=1)
+    assert pools == []
+    parallel = checker.scan_files(files, jobs=2)
+    assert pools == [2]
+
+    assert parallel == serial
+    assert len(serial[0]) == 10
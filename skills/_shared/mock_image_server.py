@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Deterministic local stand-in for the OpenAI Images and Gemini image endpoints.
+
+Serves:
+    POST /v1/images/generations                      (OpenAI Images, b64_json)
+    POST /v1beta/models/<model>:generateContent      (Gemini)
+    POST /v1beta/models/<model>:streamGenerateContent (Gemini, SSE with ?alt=sse)
+    GET  /stats                                      (request/outcome counters)
+
+Latency, injected errors/429s and payload size are configurable; every
+request's outcome is drawn from a RNG seeded with (seed, arrival index), so a
+run is reproducible.
+
+Usage:
+    python3 mock_image_server.py --port 8787 --latency lognormal:800,0.5 \\
+        --rate-limit-rate 0.05 --error-rate 0.01 --payload-bytes 1500000
+
+    OPENAI_BASE_URL=http://127.0.0.1:8787/v1 OPENAI_API_KEY=mock python3 gen.py ...
+    GEMINI_BASE_URL=http://127.0.0.1:8787 GEMINI_API_KEY=mock uv run generate_image.py ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import math
+import random
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PNG_WIDTH = 256
+
+
+def parse_latency(spec: str):
+    """Parse a latency spec into a sampler `rng -> seconds`.
+
+    Specs (milliseconds): `fixed:MS`, `uniform:LO,HI`, `normal:MEAN,SD`,
+    `lognormal:MEDIAN,SIGMA`, `exp:MEAN`.
+    """
+    kind, _, raw_args = spec.partition(":")
+    try:
+        values = [float(part) for part in raw_args.split(",")] if raw_args else []
+    except ValueError as exc:
+        raise ValueError(f"Invalid latency spec '{spec}'") from exc
+    expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exp": 1}
+    if kind not in expected or len(values) != expected[kind]:
+        raise ValueError(
+            f"Invalid latency spec '{spec}'. Use fixed:MS, uniform:LO,HI, normal:MEAN,SD, "
+            "lognormal:MEDIAN,SIGMA or exp:MEAN (milliseconds)."
+        )
+    if kind == "fixed":
+        return lambda _rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1])) / 1000
+    if kind == "lognormal":
+        mu = math.log(max(values[0], 1e-3))
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    return lambda rng: rng.expovariate(1 / max(values[0], 1e-3)) / 1000
+
+
+def make_png(size_bytes: int, seed: int = 0) -> bytes:
+    """Build a valid RGB PNG of roughly size_bytes (noise, stored uncompressed)."""
+    row_bytes = 1 + PNG_WIDTH * 3
+    height = max(1, math.ceil(max(0, size_bytes - 100) / row_bytes))
+    rng = random.Random(seed)
+    raw = b"".join(b"\x00" + rng.randbytes(PNG_WIDTH * 3) for _ in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", PNG_WIDTH, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(raw, 0))
+        + chunk(b"IEND", b"")
+    )
+
+
+class MockConfig:
+    def __init__(
+        self,
+        *,
+        seed: int = 0,
+        latency: str = "fixed:0",
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after_s: float = 1.0,
+        payload_bytes: int = 64 * 1024,
+        images_per_response: int = 1,
+        text: str = "Here is your image.",
+    ):
+        self.seed = seed
+        self.latency = latency
+        self.sample_latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after_s = retry_after_s
+        self.payload_bytes = payload_bytes
+        self.images_per_response = max(1, images_per_response)
+        self.text = text
+
+
+class MockImageServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: MockConfig):
+        super().__init__(address, MockImageHandler)
+        self.config = config
+        self._lock = threading.Lock()
+        self._arrivals = 0
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0}
+        self._b64_payload = base64.b64encode(make_png(config.payload_bytes, config.seed)).decode()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def next_outcome(self) -> tuple[str, float]:
+        """Return (outcome, latency_s) for the next arrival: ok, rate_limited or error."""
+        with self._lock:
+            self._arrivals += 1
+            arrival = self._arrivals
+            self.stats["requests"] += 1
+        rng = random.Random(f"{self.config.seed}:{arrival}")
+        latency = self.config.sample_latency(rng)
+        roll = rng.random()
+        if roll < self.config.rate_limit_rate:
+            outcome = "rate_limited"
+        elif roll < self.config.rate_limit_rate + self.config.error_rate:
+            outcome = "errors"
+        else:
+            outcome = "ok"
+        with self._lock:
+            self.stats[outcome] += 1
+        return outcome, latency
+
+
+class MockImageHandler(BaseHTTPRequestHandler):
+    server: MockImageServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *_args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/stats":
+            with self.server._lock:
+                stats = dict(self.server.stats)
+            self._send_json(200, stats)
+            return
+        self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/images/generations"):
+            handler = self._openai_images
+        elif path.endswith(":generateContent"):
+            handler = self._gemini
+        elif path.endswith(":streamGenerateContent"):
+            handler = self._gemini_stream
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        outcome, latency = self.server.next_outcome()
+        time.sleep(latency)
+        config = self.server.config
+        if outcome == "rate_limited":
+            self._send_json(
+                429,
+                {"error": {"code": 429, "message": "Rate limit exceeded (mock)", "status": "RESOURCE_EXHAUSTED"}},
+                {"Retry-After": f"{config.retry_after_s:g}"},
+            )
+            return
+        if outcome == "errors":
+            self._send_json(
+                500,
+                {"error": {"code": 500, "message": "Internal error (mock)", "status": "INTERNAL"}},
+            )
+            return
+        handler()
+
+    def _openai_images(self):
+        data = [{"b64_json": self.server._b64_payload} for _ in range(self.server.config.images_per_response)]
+        self._send_json(200, {"created": int(time.time()), "data": data})
+
+    def _gemini_parts(self) -> list[dict]:
+        parts: list[dict] = [{"text": self.server.config.text}]
+        for _ in range(self.server.config.images_per_response):
+            parts.append({"inlineData": {"mimeType": "image/png", "data": self.server._b64_payload}})
+        return parts
+
+    @staticmethod
+    def _candidate(parts: list[dict], finish: bool) -> dict:
+        candidate: dict = {"content": {"role": "model", "parts": parts}, "index": 0}
+        if finish:
+            candidate["finishReason"] = "STOP"
+        return {"candidates": [candidate]}
+
+    def _gemini(self):
+        self._send_json(200, self._candidate(self._gemini_parts(), finish=True))
+
+    def _gemini_stream(self):
+        parts = self._gemini_parts()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for index, part in enumerate(parts):
+            chunk = self._candidate([part], finish=index == len(parts) - 1)
+            self.wfile.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode("utf-8"))
+            self.wfile.flush()
+        self.close_connection = True
+
+
+def start_server(config: MockConfig, host: str = "127.0.0.1", port: int = 0) -> MockImageServer:
+    """Start the mock server on a background thread; call .shutdown() when done."""
+    server = MockImageServer((host, port), config)
+    thread = threading.Thread(
+        target=server.serve_forever,
+        kwargs={"poll_interval": 0.05},
+        name="mock-image-server",
+        daemon=True,
+    )
+    thread.start()
+    return server
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Mock OpenAI Images / Gemini image endpoints.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for latency and faults.")
+    parser.add_argument(
+        "--latency",
+        default="fixed:0",
+        help="fixed:MS, uniform:LO,HI, normal:MEAN,SD, lognormal:MEDIAN,SIGMA or exp:MEAN.",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 500 replies.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of 429 replies.")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429.")
+    parser.add_argument("--payload-bytes", type=int, default=64 * 1024, help="Approx. PNG size.")
+    parser.add_argument("--images", type=int, default=1, help="Images per response.")
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        seed=args.seed,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_s=args.retry_after,
+        payload_bytes=args.payload_bytes,
+        images_per_response=args.images,
+    )
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    try:
+        config = config_from_args(args)
+    except ValueError as exc:
+        print(str(exc), file=sys.stderr)
+        return 2
+    server = MockImageServer((args.host, args.port), config)
+    print(f"Mock image server on {server.base_url}")
+    print(f"  OPENAI_BASE_URL={server.base_url}/v1")
+    print(f"  GEMINI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
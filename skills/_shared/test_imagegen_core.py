@@ -0,0 +1,281 @@
+"""Tests for the shared image-generation core."""
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import imagegen_core
+import pytest
+from imagegen_core import (
+    BackendResponse,
+    GeneratedImage,
+    ImageGenError,
+    ImageJob,
+    RateLimiter,
+    RetryPolicy,
+    Scheduler,
+)
+
+
+class ScriptedBackend:
+    """Mock backend returning queued outcomes per prompt (exceptions are raised)."""
+
+    name = "scripted"
+
+    def __init__(self, outcomes=None, delay_s=0.0):
+        self.outcomes = outcomes or {}
+        self.delay_s = delay_s
+        self.calls: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def generate(self, job):
+        with self._lock:
+            self.calls.append(job.prompt)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay_s)
+            queue = self.outcomes.get(job.prompt)
+            outcome = queue.pop(0) if queue else None
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome or BackendResponse(
+                images=[GeneratedImage(data=f"image:{job.prompt}".encode())]
+            )
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_jobs(tmp_path, count):
+    return [
+        ImageJob(prompt=f"p{i}", model="m", output_path=tmp_path / f"{i}.png", index=i)
+        for i in range(1, count + 1)
+    ]
+
+
+def test_scheduler_returns_results_in_job_order_and_respects_concurrency(tmp_path):
+    backend = ScriptedBackend(delay_s=0.02)
+    scheduler = Scheduler(backend, concurrency=3)
+
+    results = scheduler.run(make_jobs(tmp_path, 8))
+
+    assert [result.job.index for result in results] == list(range(1, 9))
+    assert all(result.ok for result in results)
+    assert 1 < backend.max_active <= 3
+    assert (tmp_path / "5.png").read_bytes() == b"image:p5"
+    assert scheduler.metrics.summary()["ok"] == 8
+
+
+def test_scheduler_retries_retryable_errors_then_succeeds(tmp_path):
+    backend = ScriptedBackend(
+        {"p1": [ImageGenError("slow down", status=429, retryable=True, retry_after=0)]}
+    )
+    sleeps = []
+    scheduler = Scheduler(backend, retry=RetryPolicy(max_attempts=3), sleep=sleeps.append)
+
+    (result,) = scheduler.run(make_jobs(tmp_path, 1))
+
+    assert result.ok
+    assert result.attempts == 2
+    assert sleeps == [0]
+    assert scheduler.metrics.summary()["retries"] == 1
+
+
+def test_scheduler_does_not_retry_permanent_errors(tmp_path):
+    backend = ScriptedBackend({"p1": [ImageGenError("bad request", status=400)]})
+    scheduler = Scheduler(backend, retry=RetryPolicy(max_attempts=5), sleep=lambda _s: None)
+
+    (result,) = scheduler.run(make_jobs(tmp_path, 1))
+
+    assert not result.ok
+    assert result.attempts == 1
+    assert "bad request" in result.error
+
+
+def test_scheduler_gives_up_after_max_attempts(tmp_path):
+    error = ImageGenError("busy", status=503, retryable=True)
+    backend = ScriptedBackend({"p1": [error, error, error]})
+    scheduler = Scheduler(backend, retry=RetryPolicy(max_attempts=2), sleep=lambda _s: None)
+
+    (result,) = scheduler.run(make_jobs(tmp_path, 1))
+
+    assert not result.ok
+    assert result.attempts == 2
+
+
+def test_writer_numbers_additional_images_and_decodes_base64(tmp_path):
+    job = ImageJob(prompt="p", model="m", output_path=tmp_path / "out.png")
+    response = BackendResponse(
+        images=[
+            GeneratedImage(data=base64.b64encode(b"first").decode()),
+            GeneratedImage(data=b"second"),
+        ]
+    )
+
+    paths, written = imagegen_core.OutputWriter().write(job, response)
+
+    assert paths == [tmp_path / "out.png", tmp_path / "out-2.png"]
+    assert (tmp_path / "out.png").read_bytes() == b"first"
+    assert (tmp_path / "out-2.png").read_bytes() == b"second"
+    assert written == len(b"first") + len(b"second")
+
+
+def test_iter_b64_decode_matches_one_shot_decode_across_chunks():
+    payload = bytes(range(256)) * 50
+    encoded = base64.b64encode(payload).decode()
+
+    assert b"".join(imagegen_core.iter_b64_decode(encoded, chunk_chars=8)) == payload
+    wrapped = "\n".join(encoded[i : i + 76] for i in range(0, len(encoded), 76))
+    assert b"".join(imagegen_core.iter_b64_decode(wrapped, chunk_chars=8)) == payload
+
+
+def test_write_atomic_leaves_no_temp_file_on_failure(tmp_path):
+    target = tmp_path / "out.png"
+    target.write_bytes(b"old")
+
+    def chunks():
+        yield b"partial"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        imagegen_core.write_atomic(target, chunks())
+
+    assert target.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.png"]
+
+
+def test_rate_limiter_spaces_acquisitions_after_burst():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2.0, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+
+    assert sleeps == [0.5, 0.5]
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 11)]
+
+    assert imagegen_core.percentile(values, 50) == 5.0
+    assert imagegen_core.percentile(values, 95) == 10.0
+    assert imagegen_core.percentile([], 50) is None
+
+
+def test_resolve_api_key_prefers_explicit_then_env(monkeypatch):
+    monkeypatch.setenv("SOME_KEY", "  from-env ")
+
+    assert imagegen_core.resolve_api_key("explicit", "SOME_KEY") == "explicit"
+    assert imagegen_core.resolve_api_key(None, "SOME_KEY") == "from-env"
+    monkeypatch.setenv("SOME_KEY", "   ")
+    assert imagegen_core.resolve_api_key("", "SOME_KEY") is None
+
+
+def test_gemini_backend_maps_parts_and_status_codes():
+    class APIError(Exception):
+        def __init__(self, code):
+            super().__init__(f"error {code}")
+            self.code = code
+
+    parts = [
+        SimpleNamespace(text="hello", inline_data=None),
+        SimpleNamespace(text=None, inline_data=SimpleNamespace(data=b"img", mime_type="image/png")),
+    ]
+    calls = []
+
+    class Models:
+        def generate_content(self, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise APIError(429)
+            return SimpleNamespace(parts=parts)
+
+    backend = imagegen_core.GeminiBackend(SimpleNamespace(models=Models()))
+    backend._request = lambda job: {"model": job.model}
+    job = ImageJob(prompt="p", model="gemini", output_path=Path("out.png"))
+
+    with pytest.raises(ImageGenError) as excinfo:
+        backend.generate(job)
+    assert excinfo.value.retryable and excinfo.value.status == 429
+
+    response = backend.generate(job)
+    assert response.texts == ["hello"]
+    assert response.images[0].data == b"img"
+
+
+class _OpenAIHandler(BaseHTTPRequestHandler):
+    requests: list[dict] = []
+    fail_first = 0
+
+    def log_message(self, *_args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append({"path": self.path, "auth": self.headers["Authorization"], **body})
+        if type(self).fail_first > 0:
+            type(self).fail_first -= 1
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            self.wfile.write(b'{"error": "rate limited"}')
+            return
+        payload = json.dumps({"data": [{"b64_json": base64.b64encode(b"png!").decode()}]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(payload.encode())
+
+
+@pytest.fixture
+def openai_server():
+    _OpenAIHandler.requests = []
+    _OpenAIHandler.fail_first = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OpenAIHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_openai_backend_against_local_endpoint_with_retry(openai_server, tmp_path):
+    _OpenAIHandler.fail_first = 1
+    backend = imagegen_core.OpenAIImagesBackend("sk-test", base_url=openai_server, timeout=5)
+    scheduler = Scheduler(backend, retry=RetryPolicy(max_attempts=2), sleep=lambda _s: None)
+    job = ImageJob(
+        prompt="lobster", model="gpt-image-1", output_path=tmp_path / "a.png", params={"size": "1024x1024"}
+    )
+
+    (result,) = scheduler.run([job])
+
+    assert result.ok, result.error
+    assert result.attempts == 2
+    assert (tmp_path / "a.png").read_bytes() == b"png!"
+    last = _OpenAIHandler.requests[-1]
+    assert last["path"] == "/v1/images/generations"
+    assert last["auth"] == "Bearer sk-test"
+    assert last["size"] == "1024x1024" and last["n"] == 1
+
+
+@pytest.mark.parametrize("skill", ["openai-image-gen", "nano-banana-pro"])
+def test_vendored_copies_match(skill):
+    source = Path(__file__).resolve().parent / "imagegen_core.py"
+    vendored = Path(__file__).resolve().parents[1] / skill / "scripts" / "imagegen_core.py"
+    assert vendored.read_bytes() == source.read_bytes(), (
+        f"{vendored} has drifted; run python3 scripts/sync-imagegen-core.py"
+    )
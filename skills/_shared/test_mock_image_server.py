@@ -0,0 +1,116 @@
+"""Tests for the deterministic mock image provider server."""
+
+import base64
+import json
+import struct
+import urllib.error
+import urllib.request
+import zlib
+
+import mock_image_server
+import pytest
+
+
+def post(url, payload=None):
+    req = urllib.request.Request(
+        url,
+        method="POST",
+        headers={"Content-Type": "application/json"},
+        data=json.dumps(payload or {}).encode(),
+    )
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return resp.status, resp.read()
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(**kwargs):
+        server = mock_image_server.start_server(mock_image_server.MockConfig(**kwargs))
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_make_png_is_valid_and_close_to_requested_size():
+    png = mock_image_server.make_png(50_000, seed=3)
+
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    assert abs(len(png) - 50_000) < 1_000
+    width, height = struct.unpack(">II", png[16:24])
+    idat_len = struct.unpack(">I", png[33:37])[0]
+    raw = zlib.decompress(png[41 : 41 + idat_len])
+    assert len(raw) == height * (1 + width * 3)
+    assert png == mock_image_server.make_png(50_000, seed=3)
+
+
+@pytest.mark.parametrize(
+    "spec", ["fixed:5", "uniform:1,2", "normal:5,1", "lognormal:5,0.5", "exp:5"]
+)
+def test_parse_latency_specs_return_non_negative_seconds(spec):
+    import random
+
+    sampler = mock_image_server.parse_latency(spec)
+    assert all(sampler(random.Random(i)) >= 0 for i in range(20))
+
+
+@pytest.mark.parametrize("spec", ["", "fixed", "uniform:1", "gamma:1,2", "fixed:abc"])
+def test_parse_latency_rejects_invalid_specs(spec):
+    with pytest.raises(ValueError):
+        mock_image_server.parse_latency(spec)
+
+
+def test_openai_endpoint_returns_b64_png(serve):
+    server = serve(payload_bytes=4_000)
+
+    status, body = post(f"{server.base_url}/v1/images/generations", {"prompt": "x"})
+
+    assert status == 200
+    image = base64.b64decode(json.loads(body)["data"][0]["b64_json"])
+    assert image.startswith(b"\x89PNG")
+
+
+def test_gemini_endpoint_returns_text_and_inline_images(serve):
+    server = serve(images_per_response=2, text="hi")
+
+    _, body = post(f"{server.base_url}/v1beta/models/gemini-3-pro-image-preview:generateContent")
+
+    parts = json.loads(body)["candidates"][0]["content"]["parts"]
+    assert parts[0] == {"text": "hi"}
+    assert [part["inlineData"]["mimeType"] for part in parts[1:]] == ["image/png", "image/png"]
+
+
+def test_gemini_stream_endpoint_sends_one_sse_event_per_part(serve):
+    server = serve(images_per_response=2)
+
+    _, body = post(f"{server.base_url}/v1beta/models/m:streamGenerateContent?alt=sse")
+
+    events = [line for line in body.decode().split("\r\n\r\n") if line.startswith("data: ")]
+    assert len(events) == 3
+    last = json.loads(events[-1][len("data: ") :])
+    assert last["candidates"][0]["finishReason"] == "STOP"
+
+
+def test_rate_limit_injection_sets_retry_after(serve):
+    server = serve(rate_limit_rate=1.0, retry_after_s=0.25)
+
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        post(f"{server.base_url}/v1/images/generations")
+
+    assert excinfo.value.code == 429
+    assert excinfo.value.headers["Retry-After"] == "0.25"
+    assert server.stats["rate_limited"] == 1
+
+
+def test_outcomes_are_deterministic_per_seed(serve):
+    def outcomes(seed):
+        server = serve(seed=seed, error_rate=0.3, rate_limit_rate=0.3)
+        return [server.next_outcome() for _ in range(30)]
+
+    assert outcomes(7) == outcomes(7)
+    assert outcomes(7) != outcomes(8)
@@ -3,18 +3,39 @@
 Summarize CodexBar local cost usage by model.
 
 Defaults to current model (most recent daily entry), or list all models.
+
+Importable: build a `UsageReport` from a payload or an iterable of daily rows
+and query it directly. `--serve` keeps one process resident and answers
+JSON-RPC 2.0 requests (one JSON object per line) on stdin/stdout.
+
+`--input` also takes a directory or glob of exports from many machines; they
+are parsed in worker processes, deduplicated and merged (`--mode fleet` adds
+per-host and per-model breakdowns).
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
+import glob
 import json
 import os
 import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+CODEXBAR_TIMEOUT_S = 30.0
+# Raw `codexbar cost` output is reused for this long, so bursts share one run.
+CODEXBAR_CACHE_TTL_S = 60.0
 
 
 def positive_int(value: str) -> int:
@@ -31,24 +52,275 @@ def eprint(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
-def run_codexbar_cost(provider: str) -> List[Dict[str, Any]]:
+def default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "openclaw", "model-usage")
+
+
+def parse_codexbar_output(output: str) -> List[Dict[str, Any]]:
+    try:
+        payload = json.loads(output)
+    except json.JSONDecodeError as exc:
+        raise RuntimeError(f"Failed to parse codexbar JSON output: {exc}")
+    if not isinstance(payload, list):
+        raise RuntimeError("Expected codexbar cost JSON array.")
+    return payload
+
+
+def _timed_out(timeout: Optional[float]) -> RuntimeError:
+    return RuntimeError(f"codexbar cost timed out after {timeout:g}s.")
+
+
+def _invoke_codexbar(
+    provider: str, timeout: Optional[float], deadline: Optional[float] = None
+) -> str:
+    """Run codexbar; deadline (time.monotonic()) bounds it when earlier than timeout."""
     cmd = ["codexbar", "cost", "--format", "json", "--provider", provider]
+    limit = timeout if deadline is None else deadline - time.monotonic()
+    if limit is not None and limit <= 0:
+        raise _timed_out(timeout)
     try:
-        output = subprocess.check_output(cmd, text=True)
+        return subprocess.check_output(cmd, text=True, timeout=limit)
     except FileNotFoundError:
         raise RuntimeError("codexbar not found on PATH. Install CodexBar CLI first.")
+    except subprocess.TimeoutExpired:
+        raise _timed_out(timeout)
     except subprocess.CalledProcessError as exc:
         raise RuntimeError(f"codexbar cost failed (exit {exc.returncode}).")
+
+
+def _read_fresh(path: str, ttl: float) -> Optional[List[Dict[str, Any]]]:
     try:
-        payload = json.loads(output)
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(f"Failed to parse codexbar JSON output: {exc}")
-    if not isinstance(payload, list):
-        raise RuntimeError("Expected codexbar cost JSON array.")
+        if time.time() - os.stat(path).st_mtime >= ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as handle:
+            return parse_codexbar_output(handle.read())
+    except (OSError, RuntimeError):
+        return None
+
+
+def _write_atomic(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(text)
+        os.replace(tmp_path, path)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+
+
+LOCK_POLL_S = 0.05
+
+
+@contextlib.contextmanager
+def _exclusive(lock_path: str, deadline: Optional[float] = None) -> Iterator[None]:
+    """
+    Hold an advisory lock so concurrent callers wait for one codexbar run.
+    Waiting gives up at deadline (time.monotonic()) with TimeoutError, so a
+    hung run cannot stack its timeout onto every caller queued behind it.
+    """
+    try:
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        handle = open(lock_path, "a")
+    except OSError:
+        yield
+        return
+    with handle:
+        while fcntl is not None:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"Timed out waiting for {lock_path}") from None
+                time.sleep(LOCK_POLL_S if remaining is None else min(LOCK_POLL_S, remaining))
+        yield
+
+
+def run_codexbar_cost(
+    provider: str,
+    timeout: Optional[float] = CODEXBAR_TIMEOUT_S,
+    cache_ttl: float = CODEXBAR_CACHE_TTL_S,
+    cache_dir: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run `codexbar cost` for provider, giving up after timeout seconds. Its raw
+    JSON is cached per provider in the user cache dir for cache_ttl seconds
+    (0 disables the cache). The timeout covers waiting for a concurrent
+    caller's run as well as this caller's own run.
+    """
+    if cache_ttl <= 0:
+        return parse_codexbar_output(_invoke_codexbar(provider, timeout))
+    cache_path = os.path.join(cache_dir or default_cache_dir(), f"codexbar-cost-{provider}.json")
+    payload = _read_fresh(cache_path, cache_ttl)
+    if payload is not None:
+        return payload
+    deadline = None if timeout is None else time.monotonic() + timeout
+    try:
+        with _exclusive(f"{cache_path}.lock", deadline):
+            # Another caller may have refreshed the cache while this one waited.
+            payload = _read_fresh(cache_path, cache_ttl)
+            if payload is not None:
+                return payload
+            output = _invoke_codexbar(provider, timeout, deadline)
+            payload = parse_codexbar_output(output)
+            with contextlib.suppress(OSError):
+                _write_atomic(cache_path, output)
+    except TimeoutError:
+        raise _timed_out(timeout) from None
     return payload
 
 
-def load_payload(input_path: Optional[str], provider: str) -> Dict[str, Any]:
+# (host, provider, date, model) -> cost for that day.
+UsageRows = Dict[Tuple[str, str, str, str], float]
+
+# Below this many export files, worker processes cost more than they save.
+MIN_PARALLEL_EXPORTS = 16
+
+
+def is_multi_input(input_path: Optional[str]) -> bool:
+    return bool(input_path) and (
+        os.path.isdir(input_path) or any(char in input_path for char in "*?[")
+    )
+
+
+def expand_inputs(input_path: str) -> List[str]:
+    """The .json export files named by a directory (searched recursively) or a glob."""
+    if os.path.isdir(input_path):
+        pattern = os.path.join(glob.escape(input_path), "**", "*.json")
+    else:
+        pattern = input_path
+    return sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+def export_host(path: str, payload: Dict[str, Any]) -> str:
+    """
+    The machine an export came from: the payload's `host` field if present,
+    otherwise the file name up to the first dot (`ci-3.2026-10-18.json` -> `ci-3`).
+    """
+    host = payload.get("host")
+    if isinstance(host, str) and host:
+        return host
+    return os.path.basename(path).split(".", 1)[0]
+
+
+def parse_export(path: str) -> UsageRows:
+    """Map step: one export (a codexbar cost array or one provider object) to its rows."""
+    with open(path, "r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    rows: UsageRows = {}
+    for payload in data if isinstance(data, list) else [data]:
+        if not isinstance(payload, dict) or not isinstance(payload.get("provider"), str):
+            continue
+        host = export_host(path, payload)
+        for entry in parse_daily_entries(payload):
+            day = entry.get("date")
+            if not isinstance(day, str):
+                continue
+            for model, cost in aggregate_costs([entry]).items():
+                _keep_largest(rows, (host, payload["provider"], day, model), cost)
+    return rows
+
+
+def _keep_largest(rows: UsageRows, key: Tuple[str, str, str, str], cost: float) -> None:
+    if key not in rows or cost > rows[key]:
+        rows[key] = cost
+
+
+def merge_usage(parts: Iterable[UsageRows]) -> UsageRows:
+    """
+    Combine step. Rows with the same (host, provider, date, model) are the same
+    day seen by overlapping exports; the largest cost (the later export of a
+    day still in progress) wins, so merging is order-independent.
+    """
+    merged: UsageRows = {}
+    for part in parts:
+        for key, cost in part.items():
+            _keep_largest(merged, key, cost)
+    return merged
+
+
+def _parse_exports(paths: List[str]) -> Tuple[UsageRows, List[str]]:
+    rows: List[UsageRows] = []
+    errors: List[str] = []
+    for path in paths:
+        try:
+            rows.append(parse_export(path))
+        except (OSError, ValueError) as exc:
+            errors.append(f"{path}: {exc}")
+    return merge_usage(rows), errors
+
+
+def load_usage_rows(
+    paths: List[str], workers: Optional[int] = None
+) -> Tuple[UsageRows, List[str]]:
+    """
+    Parse and merge many exports, fanning chunks of files out to worker
+    processes that each pre-merge their chunk. Returns (rows, errors); files
+    that cannot be read or parsed are reported, not fatal.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(paths) or 1))
+    if workers == 1 or len(paths) < MIN_PARALLEL_EXPORTS:
+        return _parse_exports(paths)
+    chunk_size = -(-len(paths) // (workers * 4))
+    chunks = [paths[i : i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_parse_exports, chunks))
+    errors = [error for _, chunk_errors in results for error in chunk_errors]
+    return merge_usage(rows for rows, _ in results), errors
+
+
+def rows_to_payload(rows: UsageRows, provider: str) -> Dict[str, Any]:
+    """A single-provider codexbar-style payload summing the merged rows across hosts."""
+    by_date: Dict[str, Dict[str, float]] = {}
+    for (_host, row_provider, day, model), cost in rows.items():
+        if row_provider == provider:
+            models = by_date.setdefault(day, {})
+            models[model] = models.get(model, 0.0) + cost
+    return {
+        "provider": provider,
+        "daily": [
+            {
+                "date": day,
+                "totalCost": sum(models.values()),
+                "modelBreakdowns": [
+                    {"modelName": model, "cost": cost} for model, cost in sorted(models.items())
+                ],
+            }
+            for day, models in sorted(by_date.items())
+        ],
+    }
+
+
+def filter_rows_by_days(rows: UsageRows, days: Optional[int]) -> UsageRows:
+    if not days:
+        return rows
+    cutoff = date.today() - timedelta(days=days - 1)
+    return {
+        key: cost
+        for key, cost in rows.items()
+        if (parsed := parse_date(key[2])) is not None and parsed >= cutoff
+    }
+
+
+def load_payload(
+    input_path: Optional[str],
+    provider: str,
+    timeout: Optional[float] = CODEXBAR_TIMEOUT_S,
+    cache_ttl: float = CODEXBAR_CACHE_TTL_S,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    if is_multi_input(input_path):
+        paths = expand_inputs(input_path)
+        if not paths:
+            raise RuntimeError(f"No .json exports found for {input_path}.")
+        rows, errors = load_usage_rows(paths, workers=workers)
+        for error in errors:
+            eprint(f"Skipping unreadable export {error}")
+        return rows_to_payload(rows, provider)
     if input_path:
         if input_path == "-":
             raw = sys.stdin.read()
@@ -57,8 +329,11 @@ def load_payload(input_path: Optional[str], provider: str) -> Dict[str, Any]:
                 raw = handle.read()
         data = json.loads(raw)
     else:
-        data = run_codexbar_cost(provider)
+        data = run_codexbar_cost(provider, timeout=timeout, cache_ttl=cache_ttl)
+    return select_provider(data, provider)
 
+
+def select_provider(data: Any, provider: str) -> Dict[str, Any]:
     if isinstance(data, dict):
         return data
 
@@ -134,7 +409,7 @@ def pick_current_model(entries: List[Dict[str, Any]]) -> Tuple[Optional[str], Op
         return None, None
     sorted_entries = sorted(
         entries,
-        key=lambda entry: entry.get("date") or "",
+        key=lambda entry: str(entry.get("date") or ""),
     )
     for entry in reversed(sorted_entries):
         breakdowns = entry.get("modelBreakdowns")
@@ -169,7 +444,7 @@ def latest_day_cost(entries: List[Dict[str, Any]], model: str) -> Tuple[Optional
         return None, None
     sorted_entries = sorted(
         entries,
-        key=lambda entry: entry.get("date") or "",
+        key=lambda entry: str(entry.get("date") or ""),
     )
     for entry in reversed(sorted_entries):
         breakdowns = entry.get("modelBreakdowns")
@@ -243,74 +518,404 @@ def build_json_all(provider: str, totals: Dict[str, float]) -> Dict[str, Any]:
     }
 
 
+def _ranked(totals: Dict[str, float]) -> List[Tuple[str, float]]:
+    return sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+
+
+def build_json_fleet(rows: UsageRows, provider: str) -> Dict[str, Any]:
+    """Fleet totals plus per-host and per-model breakdowns of merged rows."""
+    by_host: Dict[str, Dict[str, float]] = {}
+    by_model: Dict[str, Dict[str, float]] = {}
+    for (host, row_provider, _day, model), cost in rows.items():
+        if row_provider != provider:
+            continue
+        host_models = by_host.setdefault(host, {})
+        host_models[model] = host_models.get(model, 0.0) + cost
+        model_hosts = by_model.setdefault(model, {})
+        model_hosts[host] = model_hosts.get(host, 0.0) + cost
+    host_totals = {host: sum(models.values()) for host, models in by_host.items()}
+    model_totals = {model: sum(hosts.values()) for model, hosts in by_model.items()}
+    return {
+        "provider": provider,
+        "mode": "fleet",
+        "hostCount": len(by_host),
+        "totalCostUSD": sum(host_totals.values()),
+        "models": [
+            {"model": model, "totalCostUSD": cost, "hostCount": len(by_model[model])}
+            for model, cost in _ranked(model_totals)
+        ],
+        "hosts": [
+            {
+                "host": host,
+                "totalCostUSD": cost,
+                "models": [
+                    {"model": model, "totalCostUSD": model_cost}
+                    for model, model_cost in _ranked(by_host[host])
+                ],
+            }
+            for host, cost in _ranked(host_totals)
+        ],
+    }
+
+
+def render_text_fleet(report: Dict[str, Any]) -> str:
+    lines = [
+        f"Provider: {report['provider']}",
+        f"Fleet: {report['hostCount']} hosts, {usd(report['totalCostUSD'])}",
+        "Models:",
+    ]
+    for item in report["models"]:
+        lines.append(f"- {item['model']}: {usd(item['totalCostUSD'])} ({item['hostCount']} hosts)")
+    lines.append("Hosts:")
+    for item in report["hosts"]:
+        top_model = item["models"][0]["model"] if item["models"] else "—"
+        lines.append(f"- {item['host']}: {usd(item['totalCostUSD'])} (top: {top_model})")
+    return "\n".join(lines)
+
+
+class UsageReport:
+    """
+    Per-model cost queries over one provider's daily rows. Rows are parsed
+    once, sorted by date; queries are cheap and can be repeated.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]], provider: str = "codex"):
+        self.provider = provider
+        self.entries: List[Dict[str, Any]] = sorted(
+            (row for row in rows if isinstance(row, dict)),
+            key=lambda entry: str(entry.get("date") or ""),
+        )
+        self._totals: Optional[Dict[str, float]] = None
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any], provider: Optional[str] = None) -> "UsageReport":
+        """Build from one provider's codexbar cost object (as returned by load_payload)."""
+        provider = provider or payload.get("provider") or "codex"
+        return cls(parse_daily_entries(payload), provider=provider)
+
+    def window(self, days: Optional[int]) -> "UsageReport":
+        """A report limited to the last `days` days (all rows if days is falsy)."""
+        if not days:
+            return self
+        return UsageReport(filter_by_days(self.entries, days), provider=self.provider)
+
+    def totals(self) -> Dict[str, float]:
+        if self._totals is None:
+            self._totals = aggregate_costs(self.entries)
+        return self._totals
+
+    def total_cost(self, model: Optional[str] = None) -> Optional[float]:
+        """Total for one model, or for all models; None if the model has no rows."""
+        totals = self.totals()
+        if model is None:
+            return sum(totals.values())
+        return totals.get(model)
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """The n most expensive models, most expensive first."""
+        return sorted(self.totals().items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def current_model(self) -> Tuple[Optional[str], Optional[str]]:
+        return pick_current_model(self.entries)
+
+    def latest_day_cost(self, model: str) -> Tuple[Optional[str], Optional[float]]:
+        return latest_day_cost(self.entries, model)
+
+    def windows(self, spans: Iterable[int]) -> List[Dict[str, Any]]:
+        """Total cost over each of the last N-day spans."""
+        return [
+            {"days": days, "totalCostUSD": self.window(days).total_cost()} for days in spans
+        ]
+
+    def current(self, model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The `--mode current` JSON summary, or None if no model can be determined."""
+        latest_date = None
+        if not model:
+            model, latest_date = self.current_model()
+        if not model:
+            return None
+        latest_cost_date, latest_cost = self.latest_day_cost(model)
+        return build_json_current(
+            provider=self.provider,
+            model=model,
+            latest_date=latest_date,
+            total_cost=self.total_cost(model),
+            latest_cost=latest_cost,
+            latest_cost_date=latest_cost_date,
+            entry_count=len(self.entries),
+        )
+
+    def all(self) -> Dict[str, Any]:
+        """The `--mode all` JSON summary."""
+        return build_json_all(provider=self.provider, totals=self.totals())
+
+
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+JSONRPC_INTERNAL_ERROR = -32603
+JSONRPC_USAGE_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class UsageServer:
+    """
+    JSON-RPC 2.0 methods over UsageReport. Every method takes optional
+    `provider`, `days` and either `payload` (inline codexbar JSON) or `input`
+    (a file, re-read only when it changes, or a directory/glob of exports to
+    merge); without either, codexbar is run. Methods: current, all, totals,
+    top, windows, shutdown.
+    """
+
+    def __init__(
+        self,
+        provider: str = "codex",
+        timeout: Optional[float] = CODEXBAR_TIMEOUT_S,
+        cache_ttl: float = CODEXBAR_CACHE_TTL_S,
+    ):
+        self.provider = provider
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self.closed = False
+        self._files: Dict[Tuple[str, str], Tuple[Tuple[int, int], UsageReport]] = {}
+
+    def _report(self, params: Dict[str, Any]) -> UsageReport:
+        provider = params.get("provider", self.provider)
+        if provider not in ("codex", "claude"):
+            raise RpcError(JSONRPC_INVALID_PARAMS, f"Unknown provider: {provider!r}")
+        if "payload" in params:
+            report = UsageReport.from_payload(select_provider(params["payload"], provider), provider)
+        elif params.get("input") and is_multi_input(str(params["input"])):
+            report = UsageReport.from_payload(load_payload(str(params["input"]), provider), provider)
+        elif params.get("input"):
+            path = str(params["input"])
+            stat = os.stat(path)
+            version = (stat.st_mtime_ns, stat.st_size)
+            cached = self._files.get((path, provider))
+            if cached is None or cached[0] != version:
+                report = UsageReport.from_payload(load_payload(path, provider), provider)
+                self._files[(path, provider)] = (version, report)
+            report = self._files[(path, provider)][1]
+        else:
+            payload = load_payload(None, provider, timeout=self.timeout, cache_ttl=self.cache_ttl)
+            report = UsageReport.from_payload(payload, provider)
+        days = params.get("days")
+        if days is not None and (not isinstance(days, int) or days < 1):
+            raise RpcError(JSONRPC_INVALID_PARAMS, "days must be an integer >= 1")
+        return report.window(days)
+
+    def call(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == "shutdown":
+            self.closed = True
+            return None
+        if method not in ("current", "all", "totals", "top", "windows"):
+            raise RpcError(JSONRPC_METHOD_NOT_FOUND, f"Method not found: {method}")
+        report = self._report(params)
+        if method == "current":
+            result = report.current(params.get("model"))
+            if result is None:
+                raise RpcError(JSONRPC_USAGE_ERROR, "No model data found in codexbar cost payload.")
+            return result
+        if method == "all":
+            return report.all()
+        if method == "totals":
+            return {
+                "provider": report.provider,
+                "totalCostUSD": report.total_cost(),
+                "dailyRowCount": len(report.entries),
+            }
+        if method == "top":
+            n = params.get("n", 5)
+            if not isinstance(n, int) or n < 1:
+                raise RpcError(JSONRPC_INVALID_PARAMS, "n must be an integer >= 1")
+            return {
+                "provider": report.provider,
+                "models": [{"model": model, "totalCostUSD": cost} for model, cost in report.top(n)],
+            }
+        spans = params.get("spans", [1, 7, 30])
+        if not isinstance(spans, list) or not all(isinstance(d, int) and d >= 1 for d in spans):
+            raise RpcError(JSONRPC_INVALID_PARAMS, "spans must be a list of integers >= 1")
+        return {"provider": report.provider, "windows": report.windows(spans)}
+
+    def handle(self, request: Any) -> Optional[Dict[str, Any]]:
+        """Answer one decoded request; returns None for notifications."""
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0":
+            return rpc_error(None, JSONRPC_INVALID_REQUEST, "Invalid Request")
+        request_id = request.get("id")
+        method = request.get("method")
+        params = request.get("params", {})
+        try:
+            if not isinstance(method, str) or not isinstance(params, dict):
+                raise RpcError(JSONRPC_INVALID_REQUEST, "Invalid Request")
+            result = self.call(method, params)
+        except RpcError as exc:
+            response = rpc_error(request_id, exc.code, str(exc))
+        except (OSError, ValueError, RuntimeError) as exc:
+            response = rpc_error(request_id, JSONRPC_USAGE_ERROR, str(exc))
+        except Exception as exc:
+            # A malformed payload must not take down the resident server.
+            response = rpc_error(
+                request_id, JSONRPC_INTERNAL_ERROR, f"Internal error: {type(exc).__name__}: {exc}"
+            )
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return response if "id" in request else None
+
+    def handle_line(self, line: str) -> Any:
+        """Answer one line of input (a request or a batch); None if nothing to send."""
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as exc:
+            return rpc_error(None, JSONRPC_PARSE_ERROR, f"Parse error: {exc}")
+        if isinstance(message, list):
+            if not message:
+                return rpc_error(None, JSONRPC_INVALID_REQUEST, "Invalid Request")
+            responses = [response for response in map(self.handle, message) if response]
+            return responses or None
+        return self.handle(message)
+
+
+def rpc_error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def serve(
+    provider: str = "codex",
+    stdin=None,
+    stdout=None,
+    timeout: Optional[float] = CODEXBAR_TIMEOUT_S,
+    cache_ttl: float = CODEXBAR_CACHE_TTL_S,
+) -> int:
+    """Answer JSON-RPC requests, one per line, until EOF or `shutdown`."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    server = UsageServer(provider, timeout=timeout, cache_ttl=cache_ttl)
+    for line in stdin:
+        if not line.strip():
+            continue
+        response = server.handle_line(line)
+        if response is not None:
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+        if server.closed:
+            break
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Summarize CodexBar model usage from local cost logs.")
     parser.add_argument("--provider", choices=["codex", "claude"], default="codex")
-    parser.add_argument("--mode", choices=["current", "all"], default="current")
+    parser.add_argument("--mode", choices=["current", "all", "fleet"], default="current")
     parser.add_argument("--model", help="Explicit model name to report instead of auto-current.")
-    parser.add_argument("--input", help="Path to codexbar cost JSON (or '-' for stdin).")
+    parser.add_argument(
+        "--input",
+        help="Path to codexbar cost JSON ('-' for stdin), or a directory/glob of exports to merge.",
+    )
     parser.add_argument("--days", type=positive_int, help="Limit to last N days (based on daily rows).")
     parser.add_argument("--format", choices=["text", "json"], default="text")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output.")
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        help="Processes parsing a directory/glob of exports (default: CPU count).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=CODEXBAR_TIMEOUT_S,
+        help=f"Seconds to wait for codexbar before giving up (default: {CODEXBAR_TIMEOUT_S:g}).",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=CODEXBAR_CACHE_TTL_S,
+        help=(
+            "Seconds to reuse the last codexbar output for the same provider; 0 disables "
+            f"(default: {CODEXBAR_CACHE_TTL_S:g})."
+        ),
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Answer JSON-RPC requests on stdin/stdout (one per line) until EOF.",
+    )
 
     args = parser.parse_args()
 
+    if args.serve:
+        return serve(args.provider, timeout=args.timeout, cache_ttl=args.cache_ttl)
+
+    if args.mode == "fleet":
+        if not is_multi_input(args.input):
+            eprint("--mode fleet needs --input <directory or glob> of codexbar exports.")
+            return 1
+        paths = expand_inputs(args.input)
+        if not paths:
+            eprint(f"No .json exports found for {args.input}.")
+            return 1
+        rows, errors = load_usage_rows(paths, workers=args.workers)
+        for error in errors:
+            eprint(f"Skipping unreadable export {error}")
+        fleet = build_json_fleet(filter_rows_by_days(rows, args.days), args.provider)
+        if not fleet["models"]:
+            eprint("No model breakdowns found in codexbar cost exports.")
+            return 2
+        if args.format == "json":
+            print(json.dumps(fleet, indent=2 if args.pretty else None, sort_keys=args.pretty))
+        else:
+            print(render_text_fleet(fleet))
+        return 0
+
     try:
-        payload = load_payload(args.input, args.provider)
+        payload = load_payload(
+            args.input,
+            args.provider,
+            timeout=args.timeout,
+            cache_ttl=args.cache_ttl,
+            workers=args.workers,
+        )
     except Exception as exc:
         eprint(str(exc))
         return 1
 
-    entries = parse_daily_entries(payload)
-    entries = filter_by_days(entries, args.days)
+    report = UsageReport.from_payload(payload, args.provider).window(args.days)
+    indent = 2 if args.pretty else None
 
     if args.mode == "current":
-        model = args.model
-        latest_date = None
-        if not model:
-            model, latest_date = pick_current_model(entries)
-        if not model:
+        payload_out = report.current(args.model)
+        if payload_out is None:
             eprint("No model data found in codexbar cost payload.")
             return 2
-        totals = aggregate_costs(entries)
-        total_cost = totals.get(model)
-        latest_cost_date, latest_cost = latest_day_cost(entries, model)
 
         if args.format == "json":
-            payload_out = build_json_current(
-                provider=args.provider,
-                model=model,
-                latest_date=latest_date,
-                total_cost=total_cost,
-                latest_cost=latest_cost,
-                latest_cost_date=latest_cost_date,
-                entry_count=len(entries),
-            )
-            indent = 2 if args.pretty else None
             print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
         else:
             print(
                 render_text_current(
                     provider=args.provider,
-                    model=model,
-                    latest_date=latest_date,
-                    total_cost=total_cost,
-                    latest_cost=latest_cost,
-                    latest_cost_date=latest_cost_date,
-                    entry_count=len(entries),
+                    model=payload_out["model"],
+                    latest_date=payload_out["latestModelDate"],
+                    total_cost=payload_out["totalCostUSD"],
+                    latest_cost=payload_out["latestDayCostUSD"],
+                    latest_cost_date=payload_out["latestDayCostDate"],
+                    entry_count=payload_out["dailyRowCount"],
                 )
             )
         return 0
 
-    totals = aggregate_costs(entries)
+    totals = report.totals()
     if not totals:
         eprint("No model breakdowns found in codexbar cost payload.")
         return 2
 
     if args.format == "json":
-        payload_out = build_json_all(provider=args.provider, totals=totals)
-        indent = 2 if args.pretty else None
-        print(json.dumps(payload_out, indent=indent, sort_keys=args.pretty))
+        print(json.dumps(report.all(), indent=indent, sort_keys=args.pretty))
     else:
         print(render_text_all(provider=args.provider, totals=totals))
     return 0
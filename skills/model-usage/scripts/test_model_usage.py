@@ -4,10 +4,51 @@ Tests for model_usage helpers.
 """
 
 import argparse
+import io
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
 from datetime import date, timedelta
 from unittest import TestCase, main
+from unittest.mock import patch
 
-from model_usage import filter_by_days, positive_int
+import model_usage
+from model_usage import (
+    UsageReport,
+    UsageServer,
+    build_json_fleet,
+    expand_inputs,
+    filter_by_days,
+    load_payload,
+    load_usage_rows,
+    merge_usage,
+    positive_int,
+    run_codexbar_cost,
+    serve,
+)
+
+
+def day(offset: int) -> str:
+    return (date.today() - timedelta(days=offset)).strftime("%Y-%m-%d")
+
+
+PAYLOAD = {
+    "provider": "codex",
+    "daily": [
+        {
+            "date": day(0),
+            "modelBreakdowns": [
+                {"modelName": "gpt-5-mini", "cost": 2.0},
+                {"modelName": "gpt-5", "cost": 0.5},
+            ],
+        },
+        {"date": day(40), "modelBreakdowns": [{"modelName": "o3", "cost": 4.0}]},
+        {"date": day(2), "modelBreakdowns": [{"modelName": "gpt-5", "cost": 1.0}]},
+    ],
+}
 
 
 class TestModelUsage(TestCase):
@@ -36,5 +77,260 @@ class TestModelUsage(TestCase):
         self.assertEqual(filtered[1]["date"], today.strftime("%Y-%m-%d"))
 
 
+
+class TestUsageReport(TestCase):
+    def test_queries(self):
+        report = UsageReport.from_payload(PAYLOAD)
+
+        self.assertEqual(report.current_model(), ("gpt-5-mini", day(0)))
+        self.assertEqual(report.total_cost(), 7.5)
+        self.assertEqual(report.total_cost("gpt-5"), 1.5)
+        self.assertIsNone(report.total_cost("missing"))
+        self.assertEqual(report.top(2), [("o3", 4.0), ("gpt-5-mini", 2.0)])
+        self.assertEqual(report.latest_day_cost("gpt-5"), (day(0), 0.5))
+        self.assertEqual(
+            report.windows([1, 7, 60]),
+            [
+                {"days": 1, "totalCostUSD": 2.5},
+                {"days": 7, "totalCostUSD": 3.5},
+                {"days": 60, "totalCostUSD": 7.5},
+            ],
+        )
+        self.assertEqual(report.window(7).top(1), [("gpt-5-mini", 2.0)])
+        self.assertEqual(report.current()["dailyRowCount"], 3)
+        self.assertEqual(report.all()["models"][0], {"model": "o3", "totalCostUSD": 4.0})
+
+    def test_from_rows_accepts_an_iterator(self):
+        report = UsageReport(iter(PAYLOAD["daily"]), provider="claude")
+
+        self.assertEqual(report.provider, "claude")
+        self.assertEqual(len(report.entries), 3)
+        self.assertIsNone(UsageReport([]).current())
+
+
+class TestUsageServer(TestCase):
+    def request(self, server, method, params=None, request_id=1):
+        line = json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        return server.handle_line(line)
+
+    def test_methods_and_errors(self):
+        server = UsageServer()
+        params = {"payload": [PAYLOAD]}
+
+        self.assertEqual(self.request(server, "current", params)["result"]["model"], "gpt-5-mini")
+        top = self.request(server, "top", {**params, "n": 1, "days": 7})["result"]
+        self.assertEqual(top["models"], [{"model": "gpt-5-mini", "totalCostUSD": 2.0}])
+        self.assertEqual(self.request(server, "totals", params)["result"]["totalCostUSD"], 7.5)
+        self.assertEqual(self.request(server, "nope", params)["error"]["code"], -32601)
+        self.assertEqual(self.request(server, "top", {**params, "n": 0})["error"]["code"], -32602)
+        self.assertEqual(server.handle_line("{")["error"]["code"], -32700)
+        missing = self.request(server, "all", {"payload": [PAYLOAD], "provider": "claude"})
+        self.assertEqual(missing["error"]["code"], -32000)
+
+    def test_server_survives_a_request_that_raises(self):
+        server = UsageServer()
+        bad = {"payload": {"provider": "codex", "daily": [{"date": 5}, {"date": day(0)}]}}
+
+        self.assertEqual(self.request(server, "all", bad)["result"]["models"], [])
+        with patch("model_usage.UsageReport.all", side_effect=TypeError("boom")):
+            broken = self.request(server, "all", {"payload": PAYLOAD})
+        self.assertEqual(broken["error"]["code"], -32603)
+        self.assertIn("boom", broken["error"]["message"])
+        answer = self.request(server, "totals", {"payload": PAYLOAD}, request_id=2)
+        self.assertEqual(answer["result"]["totalCostUSD"], 7.5)
+
+    def test_serve_answers_each_line_until_shutdown(self):
+        lines = [
+            {"jsonrpc": "2.0", "id": 1, "method": "all", "params": {"payload": PAYLOAD}},
+            {"jsonrpc": "2.0", "method": "all", "params": {"payload": PAYLOAD}},
+            {"jsonrpc": "2.0", "id": 2, "method": "shutdown"},
+            {"jsonrpc": "2.0", "id": 3, "method": "all", "params": {"payload": PAYLOAD}},
+        ]
+        stdout = io.StringIO()
+
+        serve(stdin=io.StringIO("\n".join(map(json.dumps, lines)) + "\n"), stdout=stdout)
+
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([response["id"] for response in responses], [1, 2])
+        self.assertEqual(responses[0]["result"]["mode"], "all")
+
+
+
+class TestFleetMerge(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_export(self, rel_path, data):
+        path = os.path.join(self.root, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+        return path
+
+    def test_overlapping_exports_are_deduplicated(self):
+        morning = {"date": day(0), "modelBreakdowns": [{"modelName": "gpt-5", "cost": 1.0}]}
+        evening = {"date": day(0), "modelBreakdowns": [{"modelName": "gpt-5", "cost": 3.0}]}
+        yesterday = {"date": day(1), "modelBreakdowns": [{"modelName": "o3", "cost": 2.0}]}
+        self.write_export("a/laptop.1.json", [{"provider": "codex", "daily": [morning]}])
+        self.write_export("a/laptop.2.json", [{"provider": "codex", "daily": [evening, yesterday]}])
+        self.write_export("ci-1.json", {"provider": "codex", "daily": [morning]})
+        self.write_export("b/other.json", {"host": "ci-1", "provider": "claude", "daily": [evening]})
+
+        rows, errors = load_usage_rows(expand_inputs(self.root))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            rows,
+            {
+                ("laptop", "codex", day(0), "gpt-5"): 3.0,
+                ("laptop", "codex", day(1), "o3"): 2.0,
+                ("ci-1", "codex", day(0), "gpt-5"): 1.0,
+                ("ci-1", "claude", day(0), "gpt-5"): 3.0,
+            },
+        )
+        fleet = build_json_fleet(rows, "codex")
+        self.assertEqual(fleet["hostCount"], 2)
+        self.assertEqual(fleet["totalCostUSD"], 6.0)
+        self.assertEqual(
+            fleet["models"],
+            [
+                {"model": "gpt-5", "totalCostUSD": 4.0, "hostCount": 2},
+                {"model": "o3", "totalCostUSD": 2.0, "hostCount": 1},
+            ],
+        )
+        self.assertEqual([host["host"] for host in fleet["hosts"]], ["laptop", "ci-1"])
+
+        payload = load_payload(os.path.join(self.root, "*.json"), "codex")
+        self.assertEqual(UsageReport.from_payload(payload).totals(), {"gpt-5": 1.0})
+
+    def test_parallel_merge_matches_serial_and_reports_bad_files(self):
+        for i in range(40):
+            entry = {"date": day(i % 3), "modelBreakdowns": [{"modelName": "m", "cost": i}]}
+            self.write_export(f"host-{i % 5}.{i}.json", [{"provider": "codex", "daily": [entry]}])
+        with open(os.path.join(self.root, "broken.json"), "w", encoding="utf-8") as handle:
+            handle.write("{")
+        paths = expand_inputs(self.root)
+
+        serial = load_usage_rows(paths, workers=1)
+        parallel = load_usage_rows(paths, workers=4)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(len(serial[1]), 1)
+        self.assertIn("broken.json", serial[1][0])
+        self.assertEqual(len(serial[0]), 15)
+
+    def test_workers_apply_to_multi_file_input_in_every_mode(self):
+        entry = {"date": day(0), "modelBreakdowns": [{"modelName": "m", "cost": 1.0}]}
+        self.write_export("host.json", {"provider": "codex", "daily": [entry]})
+
+        for mode in ("current", "all", "fleet"):
+            with self.subTest(mode=mode), patch.object(
+                model_usage, "load_usage_rows", wraps=load_usage_rows
+            ) as load, patch("sys.stdout", io.StringIO()), patch(
+                "sys.argv", ["model_usage.py", "--input", self.root, "--mode", mode, "--workers", "3"]
+            ):
+                self.assertEqual(model_usage.main(), 0)
+            self.assertEqual(load.call_args.kwargs["workers"], 3)
+
+    def test_merge_is_order_independent(self):
+        parts = [{("h", "codex", "d", "m"): 1.0}, {("h", "codex", "d", "m"): 2.0}]
+
+        self.assertEqual(merge_usage(parts), merge_usage(reversed(parts)))
+
+
+
+class TestRunCodexbarCost(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bin_dir = os.path.join(self.tmp.name, "bin")
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.calls = os.path.join(self.tmp.name, "calls")
+        os.makedirs(self.bin_dir)
+        self.old_path = os.environ["PATH"]
+        os.environ["PATH"] = self.bin_dir + os.pathsep + self.old_path
+
+    def tearDown(self):
+        os.environ["PATH"] = self.old_path
+        self.tmp.cleanup()
+
+    def install_codexbar(self, body):
+        path = os.path.join(self.bin_dir, "codexbar")
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(f"#!/bin/sh\necho run >> '{self.calls}'\n{body}\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+
+    def call_count(self):
+        with open(self.calls, encoding="utf-8") as handle:
+            return len(handle.readlines())
+
+    def test_output_is_cached_per_provider(self):
+        self.install_codexbar('''echo '[{"provider": "'"$5"'", "daily": []}]' ''')
+
+        first = run_codexbar_cost("codex", cache_dir=self.cache_dir)
+        second = run_codexbar_cost("codex", cache_dir=self.cache_dir)
+        other = run_codexbar_cost("claude", cache_dir=self.cache_dir)
+        run_codexbar_cost("codex", cache_ttl=0, cache_dir=self.cache_dir)
+
+        self.assertEqual(first, [{"provider": "codex", "daily": []}])
+        self.assertEqual(second, first)
+        self.assertEqual(other[0]["provider"], "claude")
+        self.assertEqual(self.call_count(), 3)
+        self.assertTrue(os.path.isfile(os.path.join(self.cache_dir, "codexbar-cost-claude.json")))
+
+    def test_expired_or_invalid_cache_reruns_codexbar(self):
+        self.install_codexbar("echo '[]'")
+        run_codexbar_cost("codex", cache_dir=self.cache_dir)
+        cache_path = os.path.join(self.cache_dir, "codexbar-cost-codex.json")
+        os.utime(cache_path, (0, 0))
+        run_codexbar_cost("codex", cache_dir=self.cache_dir)
+        with open(cache_path, "w", encoding="utf-8") as handle:
+            handle.write("{")
+        run_codexbar_cost("codex", cache_dir=self.cache_dir)
+
+        self.assertEqual(self.call_count(), 3)
+
+    def test_hung_codexbar_times_out(self):
+        self.install_codexbar("exec sleep 10")
+
+        with self.assertRaisesRegex(RuntimeError, "timed out"):
+            run_codexbar_cost("codex", timeout=0.2, cache_dir=self.cache_dir)
+
+    def test_concurrent_callers_share_the_timeout_of_a_hung_codexbar(self):
+        self.install_codexbar("exec sleep 10")
+        durations, errors = [], []
+
+        def call():
+            started = time.monotonic()
+            try:
+                run_codexbar_cost("codex", timeout=0.5, cache_dir=self.cache_dir)
+            except RuntimeError as exc:
+                errors.append(str(exc))
+            durations.append(time.monotonic() - started)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual(len(errors), 3)
+        self.assertTrue(all("timed out" in error for error in errors), errors)
+        # Queued callers must not wait for the hung run and then run codexbar themselves.
+        self.assertLess(max(durations), 1.0)
+        self.assertEqual(self.call_count(), 1)
+
+    def test_failures_are_not_cached(self):
+        self.install_codexbar("exit 3")
+
+        for _ in range(2):
+            with self.assertRaisesRegex(RuntimeError, "exit 3"):
+                run_codexbar_cost("codex", cache_dir=self.cache_dir)
+        self.assertEqual(self.call_count(), 2)
+
+
 if __name__ == "__main__":
     main()
@@ -14,13 +14,32 @@ Usage:
 
 Multi-image editing (up to 14 images):
     uv run generate_image.py --prompt "combine these images" --filename "output.png" -i img1.png -i img2.png -i img3.png
+
+Warm worker (pay interpreter, uv and SDK startup once, then serve many requests):
+    uv run generate_image.py --serve
+    # stdin:  {"id": 1, "args": ["--prompt", "a lobster", "--filename", "out.png"]}
+    # stdout: {"id": 1, "exit_code": 0, "stdout": "...MEDIA:/abs/out.png\n", "stderr": ""}
+
+Streaming (print model text and save each image as soon as it arrives):
+    uv run generate_image.py --prompt "..." --filename "output.png" --stream
+
+Machine-readable progress (JSON lines on stderr, or --events-file):
+    uv run generate_image.py --prompt "..." --filename "output.png" --events jsonl
 """
 
 import argparse
+import json
 import os
 import sys
+import time
 from pathlib import Path
 
+# Vendored copy of skills/_shared/imagegen_core.py (job model, retries, writer, events).
+import imagegen_core
+from imagegen_core import EventStream, elapsed_ms, numbered_output_path
+
+MODEL = "gemini-3-pro-image-preview"
+
 SUPPORTED_ASPECT_RATIOS = [
     "1:1",
     "2:3",
@@ -35,11 +54,48 @@ SUPPORTED_ASPECT_RATIOS = [
 ]
 
 
+def to_png_bytes(image_data) -> bytes:
+    """Decode inline image data and re-encode it as RGB PNG."""
+    from io import BytesIO
+
+    from PIL import Image as PILImage
+
+    # inline_data.data is already bytes, not base64
+    if isinstance(image_data, str):
+        # If it's a string, it might be base64
+        image_data = b"".join(imagegen_core.iter_b64_decode(image_data))
+
+    image = PILImage.open(BytesIO(image_data))
+
+    # Ensure RGB mode for PNG (convert RGBA to RGB with white background if needed)
+    if image.mode == 'RGBA':
+        rgb_image = PILImage.new('RGB', image.size, (255, 255, 255))
+        rgb_image.paste(image, mask=image.split()[3])
+        image = rgb_image
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+    out = BytesIO()
+    image.save(out, 'PNG')
+    return out.getvalue()
+
+
+def save_png(image_data, output_path: Path) -> tuple[float, float]:
+    """Convert inline image data to PNG and write it atomically.
+
+    Returns (decode_ms, save_ms).
+    """
+    decode_started = time.perf_counter()
+    png = to_png_bytes(image_data)
+    decode_ms = elapsed_ms(decode_started)
+
+    save_started = time.perf_counter()
+    imagegen_core.write_atomic(output_path, png)
+    return decode_ms, elapsed_ms(save_started)
+
+
 def get_api_key(provided_key: str | None) -> str | None:
     """Get API key from argument first, then environment."""
-    if provided_key:
-        return provided_key
-    return os.environ.get("GEMINI_API_KEY")
+    return imagegen_core.resolve_api_key(provided_key, "GEMINI_API_KEY")
 
 
 def auto_detect_resolution(max_input_dim: int) -> str:
@@ -69,7 +125,95 @@ def choose_output_resolution(
     return "1K", False
 
 
-def main():
+_CLIENTS: dict = {}
+
+
+def get_client(api_key: str):
+    """Return a cached genai client so warm workers reuse connections.
+
+    GEMINI_BASE_URL points the client at another endpoint (e.g. the local mock
+    server in skills/_shared/mock_image_server.py).
+    """
+    base_url = os.environ.get("GEMINI_BASE_URL") or None
+    cache_key = (api_key, base_url)
+    client = _CLIENTS.get(cache_key)
+    if client is None:
+        from google import genai
+
+        if base_url:
+            from google.genai import types
+
+            client = genai.Client(api_key=api_key, http_options=types.HttpOptions(base_url=base_url))
+        else:
+            client = genai.Client(api_key=api_key)
+        _CLIENTS[cache_key] = client
+    return client
+
+
+def serve(stdin=None, stdout=None) -> int:
+    """Serve generation requests from JSON lines on stdin.
+
+    Each request is `{"id": ..., "args": [...]}` (or a bare argv list); each reply
+    is one JSON line with the exit code and the captured stdout/stderr of that run.
+    Imports and API clients stay warm between requests.
+    """
+    import contextlib
+    import io
+    import traceback
+
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for raw_line in stdin:
+        line = raw_line.strip()
+        if not line:
+            continue
+        request_id = None
+        out_buf, err_buf = io.StringIO(), io.StringIO()
+        try:
+            request = json.loads(line)
+            if isinstance(request, dict):
+                request_id = request.get("id")
+                argv = request.get("args")
+            else:
+                argv = request
+            if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+                raise ValueError("request args must be a list of strings")
+        except ValueError as e:
+            exit_code = 2
+            err_buf.write(f"Error: invalid request: {e}\n")
+        else:
+            if "--serve" in argv:
+                exit_code = 2
+                err_buf.write("Error: --serve cannot be nested\n")
+            else:
+                with contextlib.redirect_stdout(out_buf), contextlib.redirect_stderr(err_buf):
+                    try:
+                        main(argv)
+                        exit_code = 0
+                    except SystemExit as e:
+                        code = e.code
+                        exit_code = code if isinstance(code, int) else (0 if code is None else 1)
+                    except Exception:
+                        # A failing request must not take the warm worker down with it.
+                        exit_code = 1
+                        traceback.print_exc()
+        reply = {
+            "id": request_id,
+            "exit_code": exit_code,
+            "stdout": out_buf.getvalue(),
+            "stderr": err_buf.getvalue(),
+        }
+        stdout.write(json.dumps(reply) + "\n")
+        stdout.flush()
+    return 0
+
+
+def main(argv: list[str] | None = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv == ["--serve"]:
+        sys.exit(serve())
+
     parser = argparse.ArgumentParser(
         description="Generate images using Nano Banana Pro (Gemini 3 Pro Image)"
     )
@@ -106,8 +250,62 @@ def main():
         "--api-key", "-k",
         help="Gemini API key (overrides GEMINI_API_KEY env var)"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the response: print text and save each image as soon as it arrives."
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Retries on rate limits, 5xx and timeouts (non-streaming only; default: 2)."
+    )
+    parser.add_argument(
+        "--events",
+        choices=["jsonl"],
+        default=None,
+        help="Stream machine-readable progress/timing events (jsonl) to stderr or --events-file."
+    )
+    parser.add_argument(
+        "--events-file",
+        default=None,
+        metavar="PATH",
+        help="Write --events output to PATH instead of stderr ('-' for stdout)."
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run as a warm worker reading JSON requests from stdin (must be the only flag)."
+    )
+
+    args = parser.parse_args(argv)
+    if args.serve:
+        parser.error("--serve must be the only flag")
+
+    events_handle = None
+    if args.events_file and not args.events:
+        parser.error("--events-file requires --events jsonl")
+    if args.events:
+        if args.events_file in (None, ""):
+            events_handle = sys.stderr
+        elif args.events_file == "-":
+            events_handle = sys.stdout
+        else:
+            try:
+                events_handle = open(args.events_file, "a", encoding="utf-8")
+            except OSError as e:
+                parser.error(f"cannot open --events-file {args.events_file}: {e.strerror or e}")
+    try:
+        run(args, EventStream(events_handle))
+    finally:
+        if events_handle not in (None, sys.stdout, sys.stderr):
+            events_handle.close()
 
-    args = parser.parse_args()
+
+def run(args: argparse.Namespace, events: EventStream) -> None:
+    """Generate (or edit) one image as described by parsed CLI args."""
+    events.emit("start", prompt_chars=len(args.prompt), input_images=len(args.input_images or []))
 
     # Get API key
     api_key = get_api_key(args.api_key)
@@ -116,15 +314,14 @@ def main():
         print("Please either:", file=sys.stderr)
         print("  1. Provide --api-key argument", file=sys.stderr)
         print("  2. Set GEMINI_API_KEY environment variable", file=sys.stderr)
+        events.emit("error", message="No API key provided")
         sys.exit(1)
 
     # Import here after checking API key to avoid slow import on error
-    from google import genai
-    from google.genai import types
     from PIL import Image as PILImage
 
-    # Initialise client
-    client = genai.Client(api_key=api_key)
+    # Initialise client (cached across requests in --serve mode)
+    client = get_client(api_key)
 
     # Set up output path
     output_path = Path(args.filename)
@@ -136,20 +333,30 @@ def main():
     if args.input_images:
         if len(args.input_images) > 14:
             print(f"Error: Too many input images ({len(args.input_images)}). Maximum is 14.", file=sys.stderr)
+            events.emit("error", message="Too many input images")
             sys.exit(1)
 
         for img_path in args.input_images:
             try:
+                load_started = time.perf_counter()
                 with PILImage.open(img_path) as img:
                     copied = img.copy()
                     width, height = copied.size
                 input_images.append(copied)
                 print(f"Loaded input image: {img_path}")
+                events.emit(
+                    "input_image_loaded",
+                    path=str(img_path),
+                    width=width,
+                    height=height,
+                    load_ms=elapsed_ms(load_started),
+                )
 
                 # Track largest dimension for auto-resolution
                 max_input_dim = max(max_input_dim, width, height)
             except Exception as e:
                 print(f"Error loading input image '{img_path}': {e}", file=sys.stderr)
+                events.emit("error", message=f"Error loading input image '{img_path}': {e}")
                 sys.exit(1)
 
     output_resolution, auto_detected = choose_output_resolution(
@@ -163,71 +370,78 @@ def main():
             f"(from max input dimension {max_input_dim})"
         )
 
-    # Build contents (images first if editing, prompt only if generating)
     if input_images:
-        contents = [*input_images, args.prompt]
         img_count = len(input_images)
         print(f"Processing {img_count} image{'s' if img_count > 1 else ''} with resolution {output_resolution}...")
     else:
-        contents = args.prompt
         print(f"Generating image with resolution {output_resolution}...")
 
+    # Images go first if editing, prompt only if generating
+    job = imagegen_core.ImageJob(
+        prompt=args.prompt,
+        model=MODEL,
+        output_path=output_path,
+        params={"image_size": output_resolution, "aspect_ratio": args.aspect_ratio},
+        inputs=input_images,
+    )
+    backend = imagegen_core.GeminiBackend(client)
+
     try:
-        # Build image config with optional aspect ratio
-        image_cfg_kwargs = {"image_size": output_resolution}
-        if args.aspect_ratio:
-            image_cfg_kwargs["aspect_ratio"] = args.aspect_ratio
-
-        response = client.models.generate_content(
-            model="gemini-3-pro-image-preview",
-            contents=contents,
-            config=types.GenerateContentConfig(
-                response_modalities=["TEXT", "IMAGE"],
-                image_config=types.ImageConfig(**image_cfg_kwargs)
-            )
+        events.emit(
+            "request_start",
+            model=MODEL,
+            resolution=output_resolution,
+            aspect_ratio=args.aspect_ratio,
+            stream=args.stream,
         )
-
-        # Process response and convert to PNG
-        image_saved = False
-        for part in response.parts:
-            if part.text is not None:
-                print(f"Model response: {part.text}")
-            elif part.inline_data is not None:
-                # Convert inline data to PIL Image and save as PNG
-                from io import BytesIO
-
-                # inline_data.data is already bytes, not base64
-                image_data = part.inline_data.data
-                if isinstance(image_data, str):
-                    # If it's a string, it might be base64
-                    import base64
-                    image_data = base64.b64decode(image_data)
-
-                image = PILImage.open(BytesIO(image_data))
-
-                # Ensure RGB mode for PNG (convert RGBA to RGB with white background if needed)
-                if image.mode == 'RGBA':
-                    rgb_image = PILImage.new('RGB', image.size, (255, 255, 255))
-                    rgb_image.paste(image, mask=image.split()[3])
-                    rgb_image.save(str(output_path), 'PNG')
-                elif image.mode == 'RGB':
-                    image.save(str(output_path), 'PNG')
-                else:
-                    image.convert('RGB').save(str(output_path), 'PNG')
-                image_saved = True
-
-        if image_saved:
-            full_path = output_path.resolve()
+        request_started = time.perf_counter()
+        if args.stream:
+            parts = backend.stream(job)
+        else:
+            retry = imagegen_core.RetryPolicy(max_attempts=max(0, args.retries) + 1)
+            parts = retry.call(lambda: backend.parts(job))
+
+        # Process response parts as they arrive and convert images to PNG
+        saved_paths: list[Path] = []
+        first_part_seen = False
+        for part in parts:
+            if not first_part_seen:
+                first_part_seen = True
+                events.emit("first_part", ttfp_ms=elapsed_ms(request_started))
+            if isinstance(part, str):
+                print(f"Model response: {part}", flush=True)
+                events.emit("model_text", text=part)
+                continue
+            image_path = numbered_output_path(output_path, len(saved_paths) + 1)
+            decode_ms, save_ms = save_png(part.data, image_path)
+            full_path = image_path.resolve()
+            saved_paths.append(full_path)
+            events.emit(
+                "image_saved",
+                path=str(full_path),
+                decode_ms=decode_ms,
+                save_ms=save_ms,
+                bytes=image_path.stat().st_size,
+            )
             print(f"\nImage saved: {full_path}")
             # OpenClaw parses MEDIA: tokens and will attach the file on
             # supported chat providers. Emit the canonical MEDIA:<path> form.
-            print(f"MEDIA:{full_path}")
+            print(f"MEDIA:{full_path}", flush=True)
+
+        if saved_paths:
+            events.emit(
+                "done",
+                paths=[str(path) for path in saved_paths],
+                request_ms=elapsed_ms(request_started),
+            )
         else:
             print("Error: No image was generated in the response.", file=sys.stderr)
+            events.emit("error", message="No image was generated in the response")
             sys.exit(1)
 
     except Exception as e:
         print(f"Error generating image: {e}", file=sys.stderr)
+        events.emit("error", message=f"Error generating image: {e}")
         sys.exit(1)
 
 
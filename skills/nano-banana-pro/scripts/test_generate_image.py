@@ -34,3 +34,174 @@ def test_choose_output_resolution_defaults_to_1k_without_inputs():
 
 def test_choose_output_resolution_respects_explicit_1k_with_large_input():
     assert MODULE.choose_output_resolution("1K", 3500, True) == ("1K", False)
+
+
+def _serve_lines(lines):
+    import io
+    import json
+
+    out = io.StringIO()
+    assert MODULE.serve(stdin=io.StringIO("\n".join(lines) + "\n"), stdout=out) == 0
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_serve_replies_per_request_with_exit_code_and_output(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+
+    replies = _serve_lines(
+        [
+            '{"id": 1, "args": ["--prompt", "x", "--filename", "out.png"]}',
+            '["--prompt", "y", "--filename", "out.png"]',
+        ]
+    )
+
+    assert [reply["id"] for reply in replies] == [1, None]
+    assert all(reply["exit_code"] == 1 for reply in replies)
+    assert "No API key provided" in replies[0]["stderr"]
+
+
+def test_serve_rejects_malformed_requests_without_exiting():
+    replies = _serve_lines(["not json", '{"id": 2, "args": "--prompt"}', '{"id": 3, "args": ["--serve"]}'])
+
+    assert [reply["exit_code"] for reply in replies] == [2, 2, 2]
+    assert "invalid request" in replies[1]["stderr"]
+    assert "cannot be nested" in replies[2]["stderr"]
+
+
+def test_serve_survives_a_request_that_raises(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    calls = []
+
+    def fake_run(args, events):
+        calls.append(args.prompt)
+        if args.prompt == "bad":
+            raise RuntimeError("boom")
+        print("ok")
+
+    monkeypatch.setattr(MODULE, "run", fake_run)
+    replies = _serve_lines(
+        [
+            '{"id": 1, "args": ["--prompt", "bad", "--filename", "out.png"]}',
+            '{"id": 2, "args": ["--prompt", "good", "--filename", "out.png"]}',
+        ]
+    )
+
+    assert calls == ["bad", "good"]
+    assert [reply["exit_code"] for reply in replies] == [1, 0]
+    assert "RuntimeError: boom" in replies[0]["stderr"]
+    assert replies[1]["stdout"] == "ok\n"
+
+
+def test_unwritable_events_file_is_a_usage_error(tmp_path):
+    events_file = tmp_path / "missing" / "e.jsonl"
+    replies = _serve_lines(
+        [
+            f'{{"id": 1, "args": ["--prompt", "x", "--filename", "out.png", "--events", "jsonl", "--events-file", "{events_file}"]}}',
+            '{"id": 2, "args": ["--prompt"]}',
+        ]
+    )
+
+    assert [reply["exit_code"] for reply in replies] == [2, 2]
+    assert "cannot open --events-file" in replies[0]["stderr"]
+
+
+def test_event_stream_is_noop_without_handle():
+    events = MODULE.EventStream()
+
+    assert not events.enabled
+    events.emit("start")
+
+
+def test_event_stream_writes_timed_json_lines():
+    import io
+    import json
+
+    handle = io.StringIO()
+    events = MODULE.EventStream(handle)
+    events.emit("request_start", model=MODULE.MODEL)
+    events.emit("image_saved", bytes=123)
+
+    records = [json.loads(line) for line in handle.getvalue().splitlines()]
+    assert [record["event"] for record in records] == ["request_start", "image_saved"]
+    assert records[1]["bytes"] == 123
+    assert records[0]["t_ms"] <= records[1]["t_ms"]
+
+
+def test_events_report_missing_api_key(monkeypatch, tmp_path):
+    import json
+
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    events_path = tmp_path / "events.jsonl"
+
+    with pytest.raises(SystemExit):
+        MODULE.main(
+            ["-p", "x", "-f", "out.png", "--events", "jsonl", "--events-file", str(events_path)]
+        )
+
+    records = [json.loads(line) for line in events_path.read_text().splitlines()]
+    assert [record["event"] for record in records] == ["start", "error"]
+
+
+def test_numbered_output_path_keeps_first_name_and_numbers_the_rest():
+    output = Path("out/sunset.png")
+
+    assert MODULE.numbered_output_path(output, 1) == output
+    assert MODULE.numbered_output_path(output, 2) == Path("out/sunset-2.png")
+    assert MODULE.numbered_output_path(output, 10) == Path("out/sunset-10.png")
+
+
+def _install_fake_sdk(monkeypatch, stream_chunks):
+    import sys
+    import types
+
+    genai_types = types.SimpleNamespace(
+        GenerateContentConfig=lambda **kwargs: kwargs,
+        ImageConfig=lambda **kwargs: kwargs,
+    )
+    google_pkg = types.ModuleType("google")
+    genai_pkg = types.ModuleType("google.genai")
+    genai_pkg.types = genai_types
+    google_pkg.genai = genai_pkg
+    pil_pkg = types.ModuleType("PIL")
+    pil_pkg.Image = types.SimpleNamespace()
+    monkeypatch.setitem(sys.modules, "google", google_pkg)
+    monkeypatch.setitem(sys.modules, "google.genai", genai_pkg)
+    monkeypatch.setitem(sys.modules, "PIL", pil_pkg)
+
+    class FakeModels:
+        def generate_content_stream(self, **kwargs):
+            yield from stream_chunks
+
+    monkeypatch.setattr(MODULE, "get_client", lambda _key: types.SimpleNamespace(models=FakeModels()))
+
+
+def test_stream_prints_text_and_saves_each_image_incrementally(monkeypatch, tmp_path, capsys):
+    from types import SimpleNamespace
+
+    def part(text=None, data=None):
+        inline = SimpleNamespace(data=data) if data is not None else None
+        return SimpleNamespace(text=text, inline_data=inline)
+
+    chunks = [
+        SimpleNamespace(parts=[part(text="Here you go")]),
+        SimpleNamespace(parts=None),
+        SimpleNamespace(parts=[part(data=b"one")]),
+        SimpleNamespace(parts=[part(data=b"two")]),
+    ]
+    _install_fake_sdk(monkeypatch, chunks)
+
+    saved = []
+
+    def fake_save_png(data, path):
+        path.write_bytes(data)
+        saved.append(path.name)
+        return 1.0, 2.0
+
+    monkeypatch.setattr(MODULE, "save_png", fake_save_png)
+
+    MODULE.main(["-p", "x", "-f", str(tmp_path / "img.png"), "-k", "key", "--stream"])
+
+    out = capsys.readouterr().out
+    assert saved == ["img.png", "img-2.png"]
+    assert out.index("Model response: Here you go") < out.index("MEDIA:")
+    assert f"MEDIA:{(tmp_path / 'img-2.png').resolve()}" in out
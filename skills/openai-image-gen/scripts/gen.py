@@ -1,18 +1,20 @@
 #!/usr/bin/env python3
 import argparse
-import base64
 import datetime as dt
 import json
-import os
 import random
 import re
 import sys
-import urllib.error
-import urllib.request
 from collections.abc import Callable
-from html import escape as html_escape
 from pathlib import Path
 
+# Vendored copy of skills/_shared/imagegen_core.py (scheduler, backends, writer).
+import imagegen_core
+
+# html is imported where it is used: the agent runs this script many times a day
+# and most invocations never reach that code path (missing key, invalid flags,
+# --help). See scripts/bench-image-skill-startup.py.
+
 
 def slugify(text: str) -> str:
     text = text.lower().strip()
@@ -154,9 +156,7 @@ def normalize_output_format(model: str, output_format: str) -> str:
     )
 
 
-def request_images(
-    api_key: str,
-    prompt: str,
+def build_image_params(
     model: str,
     size: str,
     quality: str,
@@ -164,13 +164,8 @@ def request_images(
     output_format: str = "",
     style: str = "",
 ) -> dict:
-    url = "https://api.openai.com/v1/images/generations"
-    args = {
-        "model": model,
-        "prompt": prompt,
-        "size": size,
-        "n": 1,
-    }
+    """Model-specific request fields for the OpenAI Images API (besides model/prompt/n)."""
+    args = {"size": size}
 
     # Quality parameter - dall-e-2 doesn't accept this parameter
     if model != "dall-e-2":
@@ -188,25 +183,12 @@ def request_images(
     if model == "dall-e-3" and style:
         args["style"] = style
 
-    body = json.dumps(args).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        method="POST",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        data=body,
-    )
-    try:
-        with urllib.request.urlopen(req, timeout=300) as resp:
-            return json.loads(resp.read().decode("utf-8"))
-    except urllib.error.HTTPError as e:
-        payload = e.read().decode("utf-8", errors="replace")
-        raise RuntimeError(f"OpenAI Images API failed ({e.code}): {payload}") from e
+    return args
 
 
 def write_gallery(out_dir: Path, items: list[dict]) -> None:
+    from html import escape as html_escape
+
     thumbs = "\n".join(
         [
             f"""
@@ -240,7 +222,7 @@ def write_gallery(out_dir: Path, items: list[dict]) -> None:
     (out_dir / "index.html").write_text(html, encoding="utf-8")
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="Generate images via OpenAI Images API.")
     ap.add_argument("--prompt", help="Single prompt. If omitted, random prompts are generated.")
     ap.add_argument("--count", type=int, default=8, help="How many images to generate.")
@@ -251,9 +233,16 @@ def main() -> int:
     ap.add_argument("--output-format", default="", help="Output format (GPT models only): png, jpeg, or webp.")
     ap.add_argument("--style", default="", help="Image style (dall-e-3 only): vivid or natural.")
     ap.add_argument("--out-dir", default="", help="Output directory (default: ./tmp/openai-image-gen-<ts>).")
-    args = ap.parse_args()
-
-    api_key = (os.environ.get("OPENAI_API_KEY") or "").strip()
+    ap.add_argument("--concurrency", type=int, default=4, help="Parallel requests (default: 4).")
+    ap.add_argument("--retries", type=int, default=2, help="Retries per image on 429/5xx/timeouts (default: 2).")
+    ap.add_argument("--rps", type=float, default=0.0, help="Max requests per second (default: unlimited).")
+    args = ap.parse_args(argv)
+    if args.concurrency < 1:
+        ap.error("--concurrency must be >= 1")
+    if args.retries < 0:
+        ap.error("--retries must be >= 0")
+
+    api_key = imagegen_core.resolve_api_key(None, "OPENAI_API_KEY")
     if not api_key:
         print("Missing OPENAI_API_KEY", file=sys.stderr)
         return 2
@@ -287,40 +276,52 @@ def main() -> int:
     else:
         file_ext = "png"
 
-    items: list[dict] = []
-    for idx, prompt in enumerate(prompts, start=1):
-        print(f"[{idx}/{len(prompts)}] {prompt}")
-        res = request_images(
-            api_key,
-            prompt,
-            args.model,
-            size,
-            quality,
-            normalized_background,
-            normalized_output_format,
-            normalized_style,
+    params = build_image_params(
+        args.model,
+        size,
+        quality,
+        normalized_background,
+        normalized_output_format,
+        normalized_style,
+    )
+    jobs = [
+        imagegen_core.ImageJob(
+            prompt=prompt,
+            model=args.model,
+            output_path=out_dir / f"{idx:03d}-{slugify(prompt)[:40]}.{file_ext}",
+            params=params,
+            index=idx,
         )
-        data = res.get("data", [{}])[0]
-        image_b64 = data.get("b64_json")
-        image_url = data.get("url")
-        if not image_b64 and not image_url:
-            raise RuntimeError(f"Unexpected response: {json.dumps(res)[:400]}")
-
-        filename = f"{idx:03d}-{slugify(prompt)[:40]}.{file_ext}"
-        filepath = out_dir / filename
-        if image_b64:
-            filepath.write_bytes(base64.b64decode(image_b64))
-        else:
-            try:
-                urllib.request.urlretrieve(image_url, filepath)
-            except urllib.error.URLError as e:
-                raise RuntimeError(f"Failed to download image from {image_url}: {e}") from e
-
-        items.append({"prompt": prompt, "file": filename})
+        for idx, prompt in enumerate(prompts, start=1)
+    ]
+
+    def report(result: imagegen_core.JobResult) -> None:
+        job = result.job
+        status = f"{result.latency_s:.1f}s" if result.ok else f"FAILED: {result.error}"
+        print(f"[{job.index}/{len(jobs)}] {job.prompt} ({status})", flush=True)
+
+    scheduler = imagegen_core.Scheduler(
+        imagegen_core.OpenAIImagesBackend(api_key),
+        concurrency=args.concurrency,
+        retry=imagegen_core.RetryPolicy(max_attempts=args.retries + 1),
+        rate_limiter=imagegen_core.RateLimiter(rate=args.rps, burst=args.concurrency),
+    )
+    results = scheduler.run(jobs, on_result=report)
+
+    items: list[dict] = [
+        {"prompt": result.job.prompt, "file": path.name}
+        for result in results
+        for path in result.paths
+    ]
+    failed = [result for result in results if not result.ok]
 
     (out_dir / "prompts.json").write_text(json.dumps(items, indent=2), encoding="utf-8")
     write_gallery(out_dir, items)
     print(f"\nWrote: {(out_dir / 'index.html').as_posix()}")
+    imagegen_core.print_metrics(scheduler.metrics)
+    if failed:
+        print(f"{len(failed)} of {len(jobs)} images failed.", file=sys.stderr)
+        return 1
     return 0
 
 
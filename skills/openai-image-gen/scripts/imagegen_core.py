@@ -0,0 +1,633 @@
+#!/usr/bin/env python3
+"""
+Shared image-generation core for the openai-image-gen and nano-banana-pro skills.
+
+Provides a provider-agnostic job model, a scheduler with concurrency limits,
+retries and rate limiting, an output writer (atomic writes, streaming base64
+decode), a metrics collector and progress events. Backends plug in through a
+single `generate(job)` method; OpenAI Images (REST) and Gemini (google-genai SDK)
+ship here.
+
+Stdlib only, and heavier stdlib modules are imported where they are used so the
+skill scripts keep their startup budget (scripts/bench-image-skill-startup.py).
+
+This copy in skills/_shared is the source of truth. Each image skill ships a
+byte-identical copy in its own scripts/ folder so it still works when
+installed on its own. Edit only this file, then regenerate the copies with
+`python3 scripts/sync-imagegen-core.py` (the pre-commit hook runs it with
+--check, and test_imagegen_core.py fails while they differ).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+
+# Plain classes rather than dataclasses/typing: those two imports alone cost
+# ~30 ms, more than the rest of a skill script's startup.
+
+OPENAI_DEFAULT_BASE_URL = "https://api.openai.com/v1"
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+B64_CHUNK_CHARS = 4 * 64 * 1024  # multiple of 4 so each slice decodes on its own
+
+
+class ImageGenError(RuntimeError):
+    """A generation request failed.
+
+    `retryable` marks transient failures (rate limits, 5xx, timeouts);
+    `retry_after` carries the server's Retry-After hint in seconds.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        status: int | None = None,
+        retryable: bool = False,
+        retry_after: float | None = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class ImageJob:
+    """One prompt to render. Extra images in a response get numbered paths."""
+
+    __slots__ = ("prompt", "model", "output_path", "params", "inputs", "index")
+
+    def __init__(
+        self,
+        prompt: str,
+        model: str,
+        output_path: Path,
+        params: dict[str, object] | None = None,
+        inputs: list[object] | None = None,
+        index: int = 0,
+    ):
+        self.prompt = prompt
+        self.model = model
+        self.output_path = Path(output_path)
+        self.params = dict(params or {})
+        self.inputs = list(inputs or [])
+        self.index = index
+
+    def __repr__(self) -> str:
+        return f"ImageJob(index={self.index!r}, model={self.model!r}, prompt={self.prompt!r})"
+
+
+class GeneratedImage:
+    """Image payload as returned by a backend: raw bytes, base64 text or a URL."""
+
+    __slots__ = ("data", "url", "mime_type")
+
+    def __init__(
+        self,
+        data: bytes | str | None = None,
+        url: str | None = None,
+        mime_type: str | None = None,
+    ):
+        self.data = data
+        self.url = url
+        self.mime_type = mime_type
+
+
+class BackendResponse:
+    __slots__ = ("images", "texts")
+
+    def __init__(
+        self,
+        images: list[GeneratedImage] | None = None,
+        texts: list[str] | None = None,
+    ):
+        self.images = list(images or [])
+        self.texts = list(texts or [])
+
+
+class JobResult:
+    __slots__ = ("job", "paths", "texts", "attempts", "latency_s", "bytes_written", "error")
+
+    def __init__(self, job: ImageJob):
+        self.job = job
+        self.paths: list[Path] = []
+        self.texts: list[str] = []
+        self.attempts = 0
+        self.latency_s = 0.0
+        self.bytes_written = 0
+        self.error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def resolve_api_key(provided_key: str | None, env_var: str) -> str | None:
+    """Return the explicit key if given, else the (stripped) environment value."""
+    if provided_key and provided_key.strip():
+        return provided_key.strip()
+    value = (os.environ.get(env_var) or "").strip()
+    return value or None
+
+
+def numbered_output_path(output_path: Path, index: int) -> Path:
+    """Path for the index-th image of a response (1-based).
+
+    The first image keeps the requested filename; further images get a numeric
+    suffix (output.png, output-2.png, output-3.png, ...).
+    """
+    if index <= 1:
+        return output_path
+    return output_path.with_name(f"{output_path.stem}-{index}{output_path.suffix}")
+
+
+def elapsed_ms(started: float) -> float:
+    """Milliseconds elapsed since a time.perf_counter() reading."""
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+class EventStream:
+    """Write timestamped progress events as JSON lines; a no-op when disabled.
+
+    Every event carries `event`, wall-clock `ts` and `t_ms` (milliseconds since
+    the stream was created) so consumers can compute per-phase latencies.
+    """
+
+    def __init__(self, handle=None):
+        self._handle = handle
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self._handle is not None
+
+    def emit(self, event: str, **fields) -> None:
+        if self._handle is None:
+            return
+        record = {
+            "event": event,
+            "ts": round(time.time(), 3),
+            "t_ms": elapsed_ms(self._start),
+            **fields,
+        }
+        with self._lock:
+            self._handle.write(json.dumps(record) + "\n")
+            self._handle.flush()
+
+
+# --- output -----------------------------------------------------------------
+
+
+def write_atomic(path: Path, chunks: bytes | Iterable[bytes]) -> int:
+    """Write bytes (or an iterable of byte chunks) to path atomically.
+
+    Data goes to a temp file in the same directory which then replaces the
+    target, so readers never observe a half-written image. Returns bytes written.
+    """
+    import tempfile
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(chunks, (bytes, bytearray, memoryview)):
+        chunks = [bytes(chunks)]
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    written = 0
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk)
+                written += len(chunk)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    return written
+
+
+def iter_b64_decode(text: str, chunk_chars: int = B64_CHUNK_CHARS) -> Iterator[bytes]:
+    """Decode base64 text in bounded slices instead of one large allocation."""
+    import binascii
+
+    if len(text) % 4 or "\n" in text or "\r" in text or " " in text:
+        text = "".join(text.split())
+    for start in range(0, len(text), chunk_chars):
+        yield binascii.a2b_base64(text[start : start + chunk_chars])
+
+
+def iter_url(url: str, timeout: float = 300, chunk_size: int = 256 * 1024) -> Iterator[bytes]:
+    """Stream a URL's body in chunks."""
+    import urllib.error
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            while True:
+                chunk = resp.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+    except urllib.error.URLError as e:
+        raise ImageGenError(f"Failed to download image from {url}: {e}", retryable=True) from e
+
+
+def image_chunks(image: GeneratedImage) -> Iterable[bytes]:
+    if isinstance(image.data, (bytes, bytearray)):
+        return [bytes(image.data)]
+    if isinstance(image.data, str):
+        return iter_b64_decode(image.data)
+    if image.url:
+        return iter_url(image.url)
+    raise ImageGenError("Backend returned an image without data or URL")
+
+
+class OutputWriter:
+    """Persist backend images for a job.
+
+    `transform`, when given, receives the fully decoded bytes and returns the
+    bytes to store (e.g. re-encode as PNG); otherwise data is streamed straight
+    to disk.
+    """
+
+    def __init__(self, transform: Callable[[bytes], bytes] | None = None):
+        self.transform = transform
+
+    def write_image(self, image: GeneratedImage, path: Path) -> int:
+        chunks = image_chunks(image)
+        if self.transform is not None:
+            return write_atomic(path, self.transform(b"".join(chunks)))
+        return write_atomic(path, chunks)
+
+    def write(self, job: ImageJob, response: BackendResponse) -> tuple[list[Path], int]:
+        paths: list[Path] = []
+        total = 0
+        for number, image in enumerate(response.images, start=1):
+            path = numbered_output_path(job.output_path, number)
+            total += self.write_image(image, path)
+            paths.append(path)
+        return paths, total
+
+
+# --- metrics ----------------------------------------------------------------
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    """Nearest-rank percentile; None for an empty list."""
+    import math
+
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(pct / 100 * len(ordered))))
+    return ordered[rank - 1]
+
+
+class Metrics:
+    """Thread-safe collector for per-job latency, retries and output size."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.latencies_s: list[float] = []
+        self.ok = 0
+        self.failed = 0
+        self.retries = 0
+        self.bytes_written = 0
+
+    def record(self, result: JobResult) -> None:
+        with self._lock:
+            self.latencies_s.append(result.latency_s)
+            self.retries += max(0, result.attempts - 1)
+            self.bytes_written += result.bytes_written
+            if result.ok:
+                self.ok += 1
+            else:
+                self.failed += 1
+
+    def summary(self) -> dict[str, object]:
+        with self._lock:
+            wall_s = time.perf_counter() - self._started
+            latencies = list(self.latencies_s)
+            done = self.ok + self.failed
+
+            def ms(value: float | None) -> float | None:
+                return None if value is None else round(value * 1000, 1)
+
+            return {
+                "jobs": done,
+                "ok": self.ok,
+                "failed": self.failed,
+                "retries": self.retries,
+                "bytesWritten": self.bytes_written,
+                "wallS": round(wall_s, 3),
+                "jobsPerS": round(done / wall_s, 3) if wall_s > 0 else None,
+                "latencyMs": {
+                    "p50": ms(percentile(latencies, 50)),
+                    "p95": ms(percentile(latencies, 95)),
+                    "max": ms(max(latencies) if latencies else None),
+                },
+            }
+
+
+# --- scheduling ---------------------------------------------------------------
+
+
+class RateLimiter:
+    """Token bucket: at most `rate` acquisitions per second, bursting to `burst`.
+
+    A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: int = 1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for retryable ImageGenErrors."""
+
+    def __init__(self, max_attempts: int = 3, base_delay_s: float = 1.0, max_delay_s: float = 30.0):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+
+    def delay(self, attempt: int, error: ImageGenError) -> float:
+        import random
+
+        if error.retry_after is not None:
+            return min(self.max_delay_s, max(0.0, error.retry_after))
+        ceiling = min(self.max_delay_s, self.base_delay_s * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def call(self, fn: Callable[[], object], sleep=time.sleep) -> object:
+        """Call fn, retrying retryable ImageGenErrors up to max_attempts times."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return fn()
+            except ImageGenError as e:
+                if not e.retryable or attempt >= self.max_attempts:
+                    raise
+                sleep(self.delay(attempt, e))
+
+
+class Scheduler:
+    """Run jobs against a backend with bounded concurrency, retries and rate limits."""
+
+    def __init__(
+        self,
+        backend,
+        writer: OutputWriter | None = None,
+        *,
+        concurrency: int = 1,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        metrics: Metrics | None = None,
+        sleep=time.sleep,
+    ):
+        self.backend = backend
+        self.writer = writer or OutputWriter()
+        self.concurrency = max(1, concurrency)
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.metrics = metrics or Metrics()
+        self._sleep = sleep
+
+    def run_job(self, job: ImageJob) -> JobResult:
+        result = JobResult(job=job)
+        started = time.perf_counter()
+        while True:
+            result.attempts += 1
+            self.rate_limiter.acquire()
+            try:
+                response = self.backend.generate(job)
+                if not response.images:
+                    raise ImageGenError("No image was generated in the response.")
+                result.paths, result.bytes_written = self.writer.write(job, response)
+                result.texts = list(response.texts)
+                break
+            except ImageGenError as e:
+                if not e.retryable or result.attempts >= self.retry.max_attempts:
+                    result.error = str(e)
+                    break
+                self._sleep(self.retry.delay(result.attempts, e))
+            except Exception as e:
+                result.error = str(e) or type(e).__name__
+                break
+        result.latency_s = time.perf_counter() - started
+        self.metrics.record(result)
+        return result
+
+    def run(
+        self,
+        jobs: list[ImageJob],
+        on_result: Callable[[JobResult], None] | None = None,
+    ) -> list[JobResult]:
+        """Run all jobs and return results in job order.
+
+        `on_result` is called (serialized) as each job finishes.
+        """
+        callback_lock = threading.Lock()
+
+        def run_one(job: ImageJob) -> JobResult:
+            result = self.run_job(job)
+            if on_result is not None:
+                with callback_lock:
+                    on_result(result)
+            return result
+
+        if self.concurrency == 1 or len(jobs) <= 1:
+            return [run_one(job) for job in jobs]
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(jobs))) as pool:
+            return list(pool.map(run_one, jobs))
+
+
+# --- backends -----------------------------------------------------------------
+
+
+def post_json(url: str, payload: dict, headers: dict[str, str], timeout: float) -> dict:
+    """POST JSON and decode the JSON reply, mapping HTTP failures to ImageGenError."""
+    import urllib.error
+    import urllib.request
+
+    req = urllib.request.Request(
+        url,
+        method="POST",
+        headers={"Content-Type": "application/json", **headers},
+        data=json.dumps(payload).encode("utf-8"),
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        body = e.read().decode("utf-8", errors="replace")
+        retry_after = e.headers.get("Retry-After") if e.headers else None
+        try:
+            retry_after_s = float(retry_after) if retry_after else None
+        except ValueError:
+            retry_after_s = None
+        raise ImageGenError(
+            f"HTTP {e.code}: {body}",
+            status=e.code,
+            retryable=e.code in RETRYABLE_STATUS,
+            retry_after=retry_after_s,
+        ) from e
+    except (urllib.error.URLError, TimeoutError) as e:
+        raise ImageGenError(f"Request failed: {e}", retryable=True) from e
+
+
+class OpenAIImagesBackend:
+    """OpenAI Images API (`/images/generations`).
+
+    The base URL defaults to OPENAI_BASE_URL or the public endpoint, which lets
+    tests and load runs point at a local mock server.
+    """
+
+    name = "openai"
+
+    def __init__(self, api_key: str, base_url: str | None = None, timeout: float = 300):
+        self.api_key = api_key
+        self.base_url = (
+            base_url or os.environ.get("OPENAI_BASE_URL") or OPENAI_DEFAULT_BASE_URL
+        ).rstrip("/")
+        self.timeout = timeout
+
+    def generate(self, job: ImageJob) -> BackendResponse:
+        payload = {"model": job.model, "prompt": job.prompt, "n": 1, **job.params}
+        try:
+            res = post_json(
+                f"{self.base_url}/images/generations",
+                payload,
+                {"Authorization": f"Bearer {self.api_key}"},
+                self.timeout,
+            )
+        except ImageGenError as e:
+            raise ImageGenError(
+                f"OpenAI Images API failed ({e.status}): {e}" if e.status else str(e),
+                status=e.status,
+                retryable=e.retryable,
+                retry_after=e.retry_after,
+            ) from e
+        response = BackendResponse()
+        for item in res.get("data") or []:
+            if not isinstance(item, dict):
+                continue
+            if item.get("b64_json"):
+                response.images.append(GeneratedImage(data=item["b64_json"]))
+            elif item.get("url"):
+                response.images.append(GeneratedImage(url=item["url"]))
+        if not response.images:
+            raise ImageGenError(f"Unexpected response: {json.dumps(res)[:400]}")
+        return response
+
+
+class GeminiBackend:
+    """Gemini image generation through the google-genai SDK client.
+
+    `job.params` may carry `image_size` and `aspect_ratio`; `job.inputs` holds
+    images (e.g. PIL images) sent ahead of the prompt for editing.
+    """
+
+    name = "gemini"
+
+    def __init__(self, client):
+        self.client = client
+
+    def _request(self, job: ImageJob) -> dict[str, object]:
+        from google.genai import types
+
+        image_cfg_kwargs = {
+            key: job.params[key] for key in ("image_size", "aspect_ratio") if job.params.get(key)
+        }
+        return {
+            "model": job.model,
+            "contents": [*job.inputs, job.prompt] if job.inputs else job.prompt,
+            "config": types.GenerateContentConfig(
+                response_modalities=["TEXT", "IMAGE"],
+                image_config=types.ImageConfig(**image_cfg_kwargs),
+            ),
+        }
+
+    @staticmethod
+    def _as_error(exc: Exception) -> ImageGenError:
+        status = getattr(exc, "code", None)
+        status = status if isinstance(status, int) else None
+        return ImageGenError(str(exc), status=status, retryable=status in RETRYABLE_STATUS)
+
+    @staticmethod
+    def iter_parts(response) -> Iterator[str | GeneratedImage]:
+        for part in getattr(response, "parts", None) or []:
+            if part.text is not None:
+                yield part.text
+            elif part.inline_data is not None:
+                yield GeneratedImage(
+                    data=part.inline_data.data,
+                    mime_type=getattr(part.inline_data, "mime_type", None),
+                )
+
+    def parts(self, job: ImageJob) -> list[str | GeneratedImage]:
+        """Send one request and return its text and image parts in order."""
+        try:
+            response = self.client.models.generate_content(**self._request(job))
+        except Exception as e:
+            raise self._as_error(e) from e
+        return list(self.iter_parts(response))
+
+    def generate(self, job: ImageJob) -> BackendResponse:
+        result = BackendResponse()
+        for item in self.parts(job):
+            if isinstance(item, str):
+                result.texts.append(item)
+            else:
+                result.images.append(item)
+        return result
+
+    def stream(self, job: ImageJob) -> Iterator[str | GeneratedImage]:
+        """Yield text and images as streamed chunks arrive (no retries)."""
+        try:
+            for response in self.client.models.generate_content_stream(**self._request(job)):
+                yield from self.iter_parts(response)
+        except Exception as e:
+            raise self._as_error(e) from e
+
+
+def print_metrics(metrics: Metrics, file=None) -> None:
+    """One-line human summary of a Metrics collector."""
+    summary = metrics.summary()
+    latency = summary["latencyMs"]
+    print(
+        f"Jobs: {summary['ok']} ok, {summary['failed']} failed, {summary['retries']} retries; "
+        f"{summary['wallS']:.1f}s wall; latency p50 {latency['p50']} ms, p95 {latency['p95']} ms",
+        file=file or sys.stderr,
+    )
@@ -5,6 +5,7 @@ from pathlib import Path
 
 import pytest
 from gen import (
+    build_image_params,
     normalize_background,
     normalize_output_format,
     normalize_style,
@@ -138,3 +139,45 @@ def test_write_gallery_normal_output():
         assert "a lobster astronaut, golden hour" in html
         assert 'src="001-lobster.png"' in html
         assert "002-nook.png" in html
+
+
+def test_build_image_params_omits_quality_for_dalle2():
+    assert build_image_params("dall-e-2", "512x512", "standard") == {"size": "512x512"}
+
+
+def test_build_image_params_keeps_model_specific_fields():
+    assert build_image_params("gpt-image-1", "1024x1024", "high", "transparent", "webp", "vivid") == {
+        "size": "1024x1024",
+        "quality": "high",
+        "background": "transparent",
+        "output_format": "webp",
+    }
+    assert build_image_params("dall-e-3", "1024x1024", "hd", style="natural")["style"] == "natural"
+
+
+def test_main_generates_batch_against_mock_server(monkeypatch, tmp_path):
+    import gen
+
+    # The mock server is a repo dev tool, not shipped with the skill.
+    monkeypatch.syspath_prepend(str(Path(__file__).resolve().parents[2] / "_shared"))
+    mock_image_server = pytest.importorskip("mock_image_server")
+
+    server = mock_image_server.start_server(
+        mock_image_server.MockConfig(seed=1, rate_limit_rate=0.3, retry_after_s=0, payload_bytes=2_000)
+    )
+    try:
+        monkeypatch.setenv("OPENAI_BASE_URL", f"{server.base_url}/v1")
+        monkeypatch.setenv("OPENAI_API_KEY", "mock")
+        code = gen.main(
+            ["--prompt", "a lobster", "--count", "6", "--concurrency", "3", "--retries", "5",
+             "--out-dir", str(tmp_path)]
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert code == 0
+    images = sorted(p.name for p in tmp_path.glob("*.png"))
+    assert images == [f"{i:03d}-a-lobster.png" for i in range(1, 7)]
+    assert (tmp_path / "001-a-lobster.png").read_bytes().startswith(b"\x89PNG")
+    assert server.stats["ok"] == 6
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Skill Catalog Builder - Writes a single JSON index of every skill under a root
+
+Each valid skill's frontmatter (name, description, metadata, ...), SKILL.md
+content hash and path go into one compact file, so a consumer can load the
+whole skill list with one read instead of opening every SKILL.md. Rebuilds
+are incremental: skills whose SKILL.md size and mtime are unchanged are
+copied from the previous catalog without being opened, and touched files
+whose content hash is unchanged are not re-parsed.
+
+Usage:
+    python build_catalog.py <skills-root> [--output skill-catalog.json] [--force]
+
+Example:
+    python build_catalog.py skills --output dist/skill-catalog.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import quick_validate
+from skill_discovery import discover_skills
+
+CATALOG_VERSION = 1
+
+
+def _catalog_options() -> dict:
+    # Entries are only reusable if they were produced by the same rules and parser.
+    return {
+        "catalogVersion": CATALOG_VERSION,
+        "validatorVersion": quick_validate.VALIDATOR_VERSION,
+        "parser": quick_validate.YAML_LOADER.__name__ if quick_validate.yaml else "fallback",
+    }
+
+
+def load_catalog(catalog_path) -> dict | None:
+    """Read a catalog written by build_catalog, or None if missing or unreadable."""
+    try:
+        catalog = json.loads(Path(catalog_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return catalog if isinstance(catalog, dict) else None
+
+
+def _index_skill(skill_dir: Path, rel_path: str, stat, previous=None) -> tuple[dict, bool]:
+    """
+    Hash, parse and validate one SKILL.md into a catalog entry. If the hash
+    matches previous (the same skill's old entry), that entry is reused with
+    the new stat instead. Returns (entry, reused).
+    """
+    skill_md = skill_dir / "SKILL.md"
+    entry = {"path": rel_path, "size": stat.st_size, "mtimeNs": stat.st_mtime_ns}
+    try:
+        entry["sha256"] = hashlib.sha256(skill_md.read_bytes()).hexdigest()
+        if previous is not None and previous.get("sha256") == entry["sha256"]:
+            return {**previous, **entry}, True
+        frontmatter_text = quick_validate.read_frontmatter(skill_md)
+    except quick_validate.FrontmatterTooLargeError as e:
+        return {**entry, "valid": False, "message": str(e)}, False
+    except (OSError, UnicodeDecodeError) as e:
+        return {**entry, "valid": False, "message": f"Could not read SKILL.md: {e}"}, False
+
+    frontmatter, error = quick_validate.parse_frontmatter(frontmatter_text)
+    if error is not None:
+        return {**entry, "valid": False, "message": error}, False
+    valid, message = quick_validate.check_frontmatter(frontmatter)
+    entry.update(valid=valid, message=message)
+    if valid:
+        entry["frontmatter"] = frontmatter
+    return entry, False
+
+
+def build_catalog(root, catalog_path, force=False) -> tuple[dict, dict]:
+    """
+    Build (or incrementally refresh) the catalog for every skill under root.
+
+    Returns (catalog, stats); the catalog file is only rewritten when its
+    content changes.
+    """
+    started = time.perf_counter()
+    root = Path(root).resolve()
+    catalog_path = Path(catalog_path)
+    options = _catalog_options()
+
+    previous = None if force else load_catalog(catalog_path)
+    reusable = {}
+    if previous is not None and previous.get("options") == options:
+        for entry in previous.get("skills", []) + previous.get("invalid", []):
+            reusable[entry.get("path")] = entry
+
+    stats = {"skills": 0, "reused": 0, "indexed": 0, "invalid": 0}
+    entries = []
+    for skill_dir in discover_skills(root):
+        rel_path = skill_dir.relative_to(root).as_posix() or "."
+        stat = (skill_dir / "SKILL.md").stat()
+        entry = reusable.get(rel_path)
+        if entry is not None and (entry.get("size"), entry.get("mtimeNs")) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            stats["reused"] += 1
+        else:
+            entry, reused = _index_skill(skill_dir, rel_path, stat, previous=entry)
+            stats["reused" if reused else "indexed"] += 1
+        entries.append(entry)
+
+    skills = [entry for entry in entries if entry["valid"]]
+    invalid = [entry for entry in entries if not entry["valid"]]
+    stats.update(skills=len(skills), invalid=len(invalid))
+    catalog = {"options": options, "root": str(root), "skills": skills, "invalid": invalid}
+
+    text = json.dumps(catalog, separators=(",", ":"), ensure_ascii=False, default=str)
+    try:
+        unchanged = catalog_path.read_text(encoding="utf-8") == text
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = catalog_path.with_name(f".{catalog_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(text, encoding="utf-8")
+            os.replace(tmp_path, catalog_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    stats["written"] = not unchanged
+    stats["ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return catalog, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a JSON catalog of every skill under a root.")
+    parser.add_argument("root", help="Folder to search for skills")
+    parser.add_argument(
+        "--output", "-o", default="skill-catalog.json", help="Catalog file (default: %(default)s)"
+    )
+    parser.add_argument("--force", action="store_true", help="Re-index every skill")
+    args = parser.parse_args(argv)
+
+    catalog, stats = build_catalog(args.root, args.output, force=args.force)
+    for entry in catalog["invalid"]:
+        print(f"[WARN] Skipping invalid skill {entry['path']}: {entry['message']}", file=sys.stderr)
+    action = "Wrote" if stats["written"] else "Up to date"
+    print(
+        f"[OK] {action}: {args.output} ({stats['skills']} skills, {stats['invalid']} invalid; "
+        f"{stats['indexed']} indexed, {stats['reused']} reused, {stats['ms']} ms)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
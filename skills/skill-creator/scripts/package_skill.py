@@ -3,18 +3,419 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--jobs N] [--level 0-9]
+                                  [--lzma] [--force] [--reproducible]
+    python utils/package_skill.py --all <path/to/skills-root> [output-directory] [--workers N]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] --watch
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --jobs 8 --level 9
+    python utils/package_skill.py --all skills ./dist --reproducible
 """
 
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import struct
 import sys
+import time
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
 from pathlib import Path
 
+import skill_watch
 from quick_validate import validate_skill
+from skill_discovery import (
+    EMBEDDED_MANIFEST_NAME,
+    EMBEDDED_MANIFEST_VERSION,
+    EXCLUDED_DIRS,
+    discover_skills,
+)
+
+DEFAULT_LEVEL = 6
+
+# Already-compressed formats: deflating them again costs CPU and saves ~nothing.
+COMPRESSED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif", ".heic",
+    ".mp3", ".mp4", ".m4a", ".mov", ".webm", ".ogg",
+    ".zip", ".skill", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".jar", ".whl",
+    ".woff", ".woff2", ".docx", ".xlsx", ".pptx",
+}
+TEXT_EXTENSIONS = {
+    ".md", ".txt", ".rst", ".py", ".js", ".mjs", ".ts", ".sh", ".json", ".yaml", ".yml",
+    ".toml", ".html", ".css", ".csv", ".tsv", ".xml", ".svg", ".sql",
+}
+# Below this size the deflate header outweighs any saving.
+STORE_BELOW_BYTES = 256
+# --lzma only pays off on large text references.
+LZMA_MIN_BYTES = 64 * 1024
+
+MANIFEST_VERSION = 1
+
+# Reproducible mode: every entry gets this timestamp unless SOURCE_DATE_EPOCH is set.
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+METHOD_NAMES = {
+    zipfile.ZIP_STORED: "stored",
+    zipfile.ZIP_DEFLATED: "deflate",
+    zipfile.ZIP_LZMA: "lzma",
+}
+
+
+@dataclass(frozen=True)
+class SkillFile:
+    """A regular file found while walking a skill folder."""
+
+    path: Path
+    rel_path: str
+    size: int
+    mtime_ns: int
+    mode: int
+
+
+def iter_skill_files(skill_path: Path):
+    """
+    Yield the regular files of a skill folder as SkillFile entries.
+
+    Uses a single os.scandir pass per directory: excluded directories are
+    pruned before they are entered, symlinks are skipped (never followed), and
+    each file's stat comes from its DirEntry. Entries are yielded in a stable
+    (name-sorted, depth-first) order; files and subdirectories that disappear
+    during the walk are skipped.
+    """
+    stack = [(str(skill_path), "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except FileNotFoundError:
+            # A subdirectory removed mid-walk (e.g. while watching) is simply gone.
+            if not rel_dir:
+                raise
+            continue
+        subdirs = []
+        for entry in entries:
+            # Security: never follow or package symlinks.
+            if entry.is_symlink():
+                print(f"[WARN] Skipping symlink: {entry.path}", file=sys.stderr)
+                continue
+            rel_path = f"{rel_dir}{entry.name}"
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS:
+                    subdirs.append((entry.path, f"{rel_path}/"))
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            yield SkillFile(
+                path=Path(entry.path),
+                rel_path=rel_path,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                mode=stat.st_mode,
+            )
+        stack.extend(reversed(subdirs))
+
+
+@dataclass(frozen=True)
+class CompressedEntry:
+    """A skill file compressed ahead of time, ready to be copied into the zip verbatim."""
+
+    skill_file: SkillFile
+    compress_type: int
+    crc: int
+    file_size: int
+    data: bytes
+    sha256: str
+    elapsed_ms: float = 0.0
+    reused: bool = False
+
+    def manifest_record(self) -> dict:
+        return {
+            "path": self.skill_file.rel_path,
+            "size": self.file_size,
+            "mtimeNs": self.skill_file.mtime_ns,
+            "mode": self.skill_file.mode,
+            "sha256": self.sha256,
+            "method": METHOD_NAMES[self.compress_type],
+            "compressedSize": len(self.data),
+            "ms": round(self.elapsed_ms, 3),
+            "reused": self.reused,
+        }
+
+
+@dataclass(frozen=True)
+class ReusedEntry:
+    """A skill file whose compressed entry can be copied from the previous archive."""
+
+    skill_file: SkillFile
+    sha256: str
+
+
+def choose_compression(skill_file: SkillFile, lzma: bool = False) -> int:
+    """
+    Pick the zip compression method for a file from its extension and size.
+
+    Media, archives and web fonts are stored, as are tiny files; large text
+    files use LZMA when `lzma` is set; everything else is deflated.
+    """
+    suffix = Path(skill_file.rel_path).suffix.lower()
+    if suffix in COMPRESSED_EXTENSIONS or skill_file.size < STORE_BELOW_BYTES:
+        return zipfile.ZIP_STORED
+    if lzma and suffix in TEXT_EXTENSIONS and skill_file.size >= LZMA_MIN_BYTES:
+        return zipfile.ZIP_LZMA
+    return zipfile.ZIP_DEFLATED
+
+
+def compress_file(
+    skill_file: SkillFile,
+    level: int = DEFAULT_LEVEL,
+    compress_type: int = zipfile.ZIP_DEFLATED,
+) -> CompressedEntry:
+    """
+    Read one file and compress it into the raw stream a zip entry stores.
+
+    Falls back to ZIP_STORED when compression would not make the entry smaller.
+    """
+    started = time.perf_counter()
+    raw = skill_file.path.read_bytes()
+    return _compress_bytes(skill_file, raw, level, compress_type, started)
+
+
+def _compress_bytes(
+    skill_file: SkillFile, raw: bytes, level: int, compress_type: int, started: float
+) -> CompressedEntry:
+    data = raw
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        data = compressor.compress(raw) + compressor.flush()
+    elif compress_type == zipfile.ZIP_LZMA:
+        compressor = zipfile.LZMACompressor()
+        data = compressor.compress(raw) + compressor.flush()
+    if len(data) >= len(raw):
+        compress_type, data = zipfile.ZIP_STORED, raw
+    return CompressedEntry(
+        skill_file=skill_file,
+        compress_type=compress_type,
+        crc=zlib.crc32(raw),
+        file_size=len(raw),
+        data=data,
+        sha256=hashlib.sha256(raw).hexdigest(),
+        elapsed_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def _stat_matches(record: dict, skill_file: SkillFile) -> bool:
+    return (
+        record.get("size") == skill_file.size
+        and record.get("mtimeNs") == skill_file.mtime_ns
+        and record.get("mode") == skill_file.mode
+    )
+
+
+def _prepare_entry(skill_file: SkillFile, level: int, lzma: bool, previous: dict | None):
+    """
+    Compress one file, or return a ReusedEntry when `previous` (its record in
+    the last manifest) shows it is unchanged: same size/mtime/mode, or failing
+    that, the same content hash.
+    """
+    if previous is not None and _stat_matches(previous, skill_file):
+        return ReusedEntry(skill_file, previous["sha256"])
+    started = time.perf_counter()
+    raw = skill_file.path.read_bytes()
+    if previous is not None:
+        digest = hashlib.sha256(raw).hexdigest()
+        if digest == previous.get("sha256"):
+            return ReusedEntry(skill_file, digest)
+    return _compress_bytes(
+        skill_file, raw, level, choose_compression(skill_file, lzma), started
+    )
+
+
+def compress_files(
+    skill_files,
+    jobs: int = 1,
+    level: int = DEFAULT_LEVEL,
+    lzma: bool = False,
+    previous: dict | None = None,
+):
+    """
+    Yield a CompressedEntry per skill file, in input order, using the method
+    chosen by choose_compression.
+
+    `previous` maps relative paths to records of the last manifest; files that
+    are unchanged since then are yielded as ReusedEntry instead.
+
+    With jobs > 1 files are compressed on a thread pool (zlib releases the GIL
+    while compressing); at most 2 * jobs compressed entries are held in memory.
+    """
+    previous = previous or {}
+    if jobs <= 1:
+        for skill_file in skill_files:
+            yield _prepare_entry(skill_file, level, lzma, previous.get(skill_file.rel_path))
+        return
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for skill_file in skill_files:
+            pending.append(
+                pool.submit(
+                    _prepare_entry, skill_file, level, lzma, previous.get(skill_file.rel_path)
+                )
+            )
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# Appending pre-compressed bytes needs ZipFile internals (the fields its own
+# write path keeps up to date). They are unchanged across the CPython versions
+# below; anywhere else write_compressed_entry recompresses via the public API.
+_RAW_WRITE_VERSIONS = ((3, 10), (3, 14))
+_RAW_WRITE_ATTRS = ("fp", "start_dir", "filelist", "NameToInfo", "_didModify", "_writing")
+
+
+def _raw_writes_supported(zipf: zipfile.ZipFile) -> bool:
+    low, high = _RAW_WRITE_VERSIONS
+    return (
+        low <= sys.version_info[:2] <= high
+        and all(hasattr(zipf, name) for name in _RAW_WRITE_ATTRS)
+        and not zipf._writing
+    )
+
+
+def _decompress_entry(compress_type: int, data: bytes) -> bytes:
+    if compress_type == zipfile.ZIP_DEFLATED:
+        return zlib.decompress(data, -15)
+    if compress_type == zipfile.ZIP_LZMA:
+        return zipfile.LZMADecompressor().decompress(data)
+    return data
+
+
+def write_compressed_entry(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, data: bytes) -> None:
+    """
+    Append an already-compressed entry to a zip opened for writing.
+
+    zinfo must carry CRC, file_size and compress_type; data is written as-is
+    after the local file header and the entry is registered for the central
+    directory that ZipFile writes on close. On Python versions whose ZipFile
+    internals are not known to match, the entry is decompressed and written
+    with ZipFile.writestr instead (same archive, just slower).
+    """
+    if not _raw_writes_supported(zipf):
+        raw = _decompress_entry(zinfo.compress_type, data)
+        if zlib.crc32(raw) != zinfo.CRC or len(raw) != zinfo.file_size:
+            raise zipfile.BadZipFile(f"Compressed data does not match {zinfo.filename}")
+        zipf.writestr(zinfo, raw)
+        return
+    zinfo.compress_size = len(data)
+    if zinfo.compress_type == zipfile.ZIP_LZMA:
+        zinfo.flag_bits |= 0x02
+    zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+    zipf.fp.seek(zipf.start_dir)
+    zinfo.header_offset = zipf.start_dir
+    zipf.fp.write(zinfo.FileHeader(zip64))
+    zipf.fp.write(data)
+    zipf.start_dir = zipf.fp.tell()
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf._didModify = True
+
+
+def read_compressed_entry(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo) -> bytes:
+    """Return an entry's raw compressed bytes without decompressing them."""
+    zipf.fp.seek(zinfo.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, zipf.fp.read(zipfile.sizeFileHeader))
+    if header[0] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header for {zinfo.filename}")
+    # Skip the file name and extra field (the last two header fields).
+    zipf.fp.seek(header[-2] + header[-1], os.SEEK_CUR)
+    return zipf.fp.read(zinfo.compress_size)
+
+
+def _copy_previous_entry(
+    previous_zip: zipfile.ZipFile, arcname: str, entry: ReusedEntry
+) -> CompressedEntry:
+    zinfo = previous_zip.getinfo(arcname)
+    return CompressedEntry(
+        skill_file=entry.skill_file,
+        compress_type=zinfo.compress_type,
+        crc=zinfo.CRC,
+        file_size=zinfo.file_size,
+        data=read_compressed_entry(previous_zip, zinfo),
+        sha256=entry.sha256,
+        reused=True,
+    )
+
+
+def reproducible_date_time() -> tuple:
+    """Entry timestamp for reproducible archives: SOURCE_DATE_EPOCH (UTC) or 1980-01-01."""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if not epoch:
+        return REPRODUCIBLE_DATE_TIME
+    date_time = time.gmtime(int(epoch))[:6]
+    if date_time[0] < 1980:
+        return REPRODUCIBLE_DATE_TIME
+    return min(date_time, (2107, 12, 31, 23, 59, 58))
+
+
+def _zip_info(arcname: str, entry: CompressedEntry, date_time=None) -> zipfile.ZipInfo:
+    """
+    Build the ZipInfo for an entry. By default this is what zipfile.write would
+    use (file mtime and mode); passing date_time normalizes the timestamp,
+    permissions (0644, or 0755 for executables) and creating system instead.
+    """
+    mode = entry.skill_file.mode
+    normalize = date_time is not None
+    if not normalize:
+        date_time = time.localtime(entry.skill_file.mtime_ns / 1e9)[:6]
+        if date_time[0] < 1980:
+            date_time = REPRODUCIBLE_DATE_TIME
+    else:
+        mode = 0o100755 if mode & 0o111 else 0o100644
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    if normalize:
+        zinfo.create_system = 3
+    zinfo.external_attr = (mode & 0xFFFF) << 16
+    zinfo.compress_type = entry.compress_type
+    zinfo.CRC = entry.crc
+    zinfo.file_size = entry.file_size
+    return zinfo
+
+
+def embedded_manifest(skill_name: str, records: list[dict]) -> bytes:
+    """The manifest stored inside the archive: path, size and SHA-256 of every entry."""
+    manifest = {
+        "version": EMBEDDED_MANIFEST_VERSION,
+        "skill": skill_name,
+        "algorithm": "sha256",
+        "entries": [
+            {"path": record["path"], "size": record["size"], "sha256": record["sha256"]}
+            for record in records
+        ],
+    }
+    return (json.dumps(manifest, indent=1) + "\n").encode("utf-8")
+
+
+def _embedded_manifest_info(arcname: str, date_time=None) -> zipfile.ZipInfo:
+    zinfo = zipfile.ZipInfo(arcname, date_time or time.localtime()[:6])
+    zinfo.create_system = 3
+    zinfo.external_attr = 0o100644 << 16
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    return zinfo
 
 
 def _is_within(path: Path, root: Path) -> bool:
@@ -25,42 +426,140 @@ def _is_within(path: Path, root: Path) -> bool:
         return False
 
 
-def package_skill(skill_path, output_dir=None):
+def manifest_path_for(archive_path: Path) -> Path:
+    """Sidecar manifest written next to a .skill archive."""
+    return archive_path.with_name(f"{archive_path.name}.manifest.json")
+
+
+def load_manifest(manifest_path: Path, archive_path: Path, options: dict) -> dict | None:
+    """
+    Return the previous manifest if it still describes archive_path as built
+    with the same options, else None.
+    """
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        archive_stat = archive_path.stat()
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(manifest, dict)
+        or manifest.get("version") != MANIFEST_VERSION
+        or manifest.get("options") != options
+        or manifest.get("archiveSize") != archive_stat.st_size
+        or manifest.get("archiveMtimeNs") != archive_stat.st_mtime_ns
+    ):
+        return None
+    return manifest
+
+
+def _is_up_to_date(manifest: dict, skill_files: list[SkillFile]) -> bool:
+    entries = manifest.get("entries") or []
+    return len(entries) == len(skill_files) and all(
+        record.get("path") == skill_file.rel_path and _stat_matches(record, skill_file)
+        for record, skill_file in zip(entries, skill_files)
+    )
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+@dataclass(frozen=True)
+class PackageResult:
+    """The archive written (None on error) and whether it was already up to date."""
+
+    archive: Path | None
+    up_to_date: bool = False
+
+
+def package_skill(
+    skill_path,
+    output_dir=None,
+    jobs=None,
+    level=DEFAULT_LEVEL,
+    lzma=False,
+    force=False,
+    reproducible=False,
+    validate=True,
+):
     """
     Package a skill folder into a .skill file.
 
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        jobs: Number of files compressed concurrently (defaults to the CPU count)
+        level: zlib compression level, 0-9
+        lzma: Compress large text files with LZMA instead of deflate
+        force: Rebuild from scratch even if the previous manifest says nothing changed
+        reproducible: Write a byte-identical archive for identical content (sorted
+            entries, normalized timestamps and permissions)
+        validate: Run quick_validate first (watch mode validates on its own)
 
     Returns:
         Path to the created .skill file, or None if error
     """
+    return _package_skill(
+        skill_path,
+        output_dir,
+        jobs=jobs,
+        level=level,
+        lzma=lzma,
+        force=force,
+        reproducible=reproducible,
+        validate=validate,
+    ).archive
+
+
+def _package_skill(
+    skill_path,
+    output_dir=None,
+    jobs=None,
+    level=DEFAULT_LEVEL,
+    lzma=False,
+    force=False,
+    reproducible=False,
+    validate=True,
+) -> PackageResult:
     skill_path = Path(skill_path).resolve()
 
     # Validate skill folder exists
     if not skill_path.exists():
         print(f"[ERROR] Skill folder not found: {skill_path}")
-        return None
+        return PackageResult(None)
 
     if not skill_path.is_dir():
         print(f"[ERROR] Path is not a directory: {skill_path}")
-        return None
+        return PackageResult(None)
 
     # Validate SKILL.md exists
     skill_md = skill_path / "SKILL.md"
     if not skill_md.exists():
         print(f"[ERROR] SKILL.md not found in {skill_path}")
-        return None
+        return PackageResult(None)
 
     # Run validation before packaging
-    print("Validating skill...")
-    valid, message = validate_skill(skill_path)
-    if not valid:
-        print(f"[ERROR] Validation failed: {message}")
-        print("   Please fix the validation errors before packaging.")
-        return None
-    print(f"[OK] {message}\n")
+    if validate:
+        print("Validating skill...")
+        valid, message = validate_skill(skill_path)
+        if not valid:
+            print(f"[ERROR] Validation failed: {message}")
+            print("   Please fix the validation errors before packaging.")
+            return PackageResult(None)
+        print(f"[OK] {message}\n")
 
     # Determine output location
     skill_name = skill_path.name
@@ -71,63 +570,366 @@ def package_skill(skill_path, output_dir=None):
         output_path = Path.cwd()
 
     skill_filename = output_path / f"{skill_name}.skill"
+    resolved_output = skill_filename.resolve()
+    manifest_path = manifest_path_for(skill_filename)
+    resolved_manifest = manifest_path.resolve()
+
+    # Collect files first so nothing is written if any path escapes the root.
+    # Symlinks are never followed, so walked paths are already resolved.
+    skill_files = []
+    for skill_file in iter_skill_files(skill_path):
+        file_path = skill_file.path
+        if not _is_within(file_path, skill_path):
+            print(f"[ERROR] File escapes skill root: {file_path}")
+            return PackageResult(None)
+        # If output lives under skill_path, avoid writing archive into itself.
+        if file_path == resolved_output:
+            print(f"[WARN] Skipping output archive: {file_path}")
+            continue
+        if file_path == resolved_manifest or skill_file.rel_path == EMBEDDED_MANIFEST_NAME:
+            continue
+        skill_files.append(skill_file)
 
-    EXCLUDED_DIRS = {".git", ".svn", ".hg", "__pycache__", "node_modules"}
+    # SKILL.md goes first so readers (skill_archive) find the frontmatter in
+    # the first pages of the archive.
+    skill_files.sort(key=lambda skill_file: skill_file.rel_path != "SKILL.md")
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    options = {"level": level, "lzma": lzma, "reproducible": reproducible}
+    date_time = None
+    if reproducible:
+        skill_files.sort(
+            key=lambda skill_file: (skill_file.rel_path != "SKILL.md", skill_file.rel_path)
+        )
+        date_time = reproducible_date_time()
+        options["dateTime"] = list(date_time)
 
-    # Create the .skill file (zip format)
+    manifest = None if force else load_manifest(manifest_path, skill_filename, options)
+    if manifest is not None and _is_up_to_date(manifest, skill_files):
+        print(f"[OK] Up to date: {skill_filename} ({len(skill_files)} files unchanged)")
+        print(f"[OK] SHA-256: {manifest.get('archiveSha256')}")
+        return PackageResult(skill_filename, up_to_date=True)
+    previous = {record["path"]: record for record in manifest["entries"]} if manifest else {}
+
+    # Create the .skill file (zip format): compress changed files concurrently,
+    # copy unchanged entries from the previous archive, and write everything in
+    # order (SKILL.md first) to a temporary file that replaces the archive on success.
+    tmp_filename = skill_filename.with_name(f".{skill_filename.name}.{os.getpid()}.tmp")
     try:
-        with zipfile.ZipFile(skill_filename, "w", zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob("*"):
-                # Security: never follow or package symlinks.
-                if file_path.is_symlink():
-                    print(f"[WARN] Skipping symlink: {file_path}")
-                    continue
-
-                rel_parts = file_path.relative_to(skill_path).parts
-                if any(part in EXCLUDED_DIRS for part in rel_parts):
-                    continue
-
-                if file_path.is_file():
-                    resolved_file = file_path.resolve()
-                    if not _is_within(resolved_file, skill_path):
-                        print(f"[ERROR] File escapes skill root: {file_path}")
-                        return None
-                    # If output lives under skill_path, avoid writing archive into itself.
-                    if resolved_file == skill_filename.resolve():
-                        print(f"[WARN] Skipping output archive: {file_path}")
-                        continue
-
-                    # Calculate the relative path within the zip.
-                    arcname = Path(skill_name) / file_path.relative_to(skill_path)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
-
-        print(f"\n[OK] Successfully packaged skill to: {skill_filename}")
-        return skill_filename
+        started = time.perf_counter()
+        records = []
+        with ExitStack() as stack:
+            previous_zip = (
+                stack.enter_context(zipfile.ZipFile(skill_filename, "r")) if previous else None
+            )
+            zipf = stack.enter_context(zipfile.ZipFile(tmp_filename, "w", zipfile.ZIP_DEFLATED))
+            entries = compress_files(skill_files, jobs=jobs, level=level, lzma=lzma, previous=previous)
+            for entry in entries:
+                arcname = f"{skill_name}/{entry.skill_file.rel_path}"
+                if isinstance(entry, ReusedEntry):
+                    entry = _copy_previous_entry(previous_zip, arcname, entry)
+                write_compressed_entry(zipf, _zip_info(arcname, entry, date_time), entry.data)
+                records.append(entry.manifest_record())
+                action = "Reused" if entry.reused else "Added"
+                print(f"  {action}: {arcname} ({records[-1]['method']})")
+            zipf.writestr(
+                _embedded_manifest_info(f"{skill_name}/{EMBEDDED_MANIFEST_NAME}", date_time),
+                embedded_manifest(skill_name, records),
+            )
+        os.replace(tmp_filename, skill_filename)
+        elapsed = time.perf_counter() - started
+
+        archive_stat = skill_filename.stat()
+        archive_sha256 = file_sha256(skill_filename)
+        _write_json_atomic(
+            manifest_path,
+            {
+                "version": MANIFEST_VERSION,
+                "skill": skill_name,
+                "archive": skill_filename.name,
+                "archiveSize": archive_stat.st_size,
+                "archiveMtimeNs": archive_stat.st_mtime_ns,
+                "archiveSha256": archive_sha256,
+                "options": options,
+                "entries": records,
+            },
+        )
+
+        compressed = [record for record in records if not record["reused"]]
+        total_in = sum(record["size"] for record in compressed)
+        total_out = sum(record["compressedSize"] for record in compressed)
+        methods = {}
+        for record in records:
+            methods[record["method"]] = methods.get(record["method"], 0) + 1
+        mb_in = total_in / 1e6
+        throughput = mb_in / elapsed if elapsed > 0 else float("inf")
+        print(
+            f"\n[OK] Compressed {len(compressed)} files, {mb_in:.2f} MB -> "
+            f"{total_out / 1e6:.2f} MB in {elapsed:.2f}s "
+            f"({throughput:.1f} MB/s, jobs={jobs}, level={level})"
+        )
+        if len(compressed) < len(records):
+            print(f"[OK] Reused {len(records) - len(compressed)} unchanged entries")
+        print("[OK] Methods: " + ", ".join(f"{name}={n}" for name, n in sorted(methods.items())))
+        print(f"[OK] Manifest: {manifest_path}")
+        print(f"[OK] SHA-256: {archive_sha256}")
+        print(f"[OK] Successfully packaged skill to: {skill_filename}")
+        return PackageResult(skill_filename)
 
     except Exception as e:
         print(f"[ERROR] Error creating .skill file: {e}")
-        return None
+        return PackageResult(None)
+    finally:
+        tmp_filename.unlink(missing_ok=True)
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+def _skill_result(skill_dir: Path, **fields) -> dict:
+    result = {
+        "skill": skill_dir.name,
+        "path": str(skill_dir),
+        "ok": False,
+        "seconds": 0.0,
+        "archive": None,
+        "files": None,
+        "size": None,
+        "sha256": None,
+        "upToDate": False,
+        "log": "",
+    }
+    result.update(fields)
+    return result
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
 
-    print(f"Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
+def _package_one(skill_dir: Path, output_dir, options: dict) -> dict:
+    """Package a single skill with its output captured; runs in a worker process."""
+    started = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            outcome = _package_skill(skill_dir, output_dir, **options)
+    except Exception as e:  # Keep one broken skill from taking down the batch.
+        outcome = PackageResult(None)
+        log.write(f"[ERROR] {e}\n")
+    archive_path = outcome.archive
+    result = _skill_result(
+        skill_dir,
+        ok=archive_path is not None,
+        seconds=time.perf_counter() - started,
+        archive=str(archive_path) if archive_path else None,
+        upToDate=outcome.up_to_date,
+        log=log.getvalue(),
+    )
+    if archive_path is not None:
+        result["size"] = archive_path.stat().st_size
+        try:
+            manifest = json.loads(manifest_path_for(archive_path).read_text(encoding="utf-8"))
+            result["files"] = len(manifest["entries"])
+            result["sha256"] = manifest.get("archiveSha256")
+        except (OSError, ValueError, KeyError):
+            pass
+    return result
+
+
+def package_all(root, output_dir=None, workers=None, **options) -> list[dict]:
+    """
+    Validate and package every skill under root across a process pool.
+
+    options are passed to package_skill (jobs defaults to 1 here, since the
+    pool already spreads the work over the cores). Returns one result dict
+    per skill, in discovery order.
+    """
+    skills = discover_skills(root)
+    if options.get("jobs") is None:
+        options["jobs"] = 1
+    output_dir = Path(output_dir).resolve() if output_dir else Path.cwd()
+
+    by_name = {}
+    for skill_dir in skills:
+        by_name.setdefault(skill_dir.name, []).append(skill_dir)
+    duplicates = {name for name, dirs in by_name.items() if len(dirs) > 1}
+    results = {}
+    for skill_dir in skills:
+        if skill_dir.name in duplicates:
+            results[skill_dir] = _skill_result(
+                skill_dir,
+                log=f"[ERROR] Another skill is also named '{skill_dir.name}'; "
+                "their archives would collide\n",
+            )
+    todo = [skill_dir for skill_dir in skills if skill_dir not in results]
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(todo) or 1))
+    if workers == 1:
+        for skill_dir in todo:
+            results[skill_dir] = _package_one(skill_dir, output_dir, options)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                skill_dir: pool.submit(_package_one, skill_dir, output_dir, options)
+                for skill_dir in todo
+            }
+            for skill_dir, future in futures.items():
+                results[skill_dir] = future.result()
+    return [results[skill_dir] for skill_dir in skills]
+
+
+def print_summary(results: list[dict], wall_seconds: float) -> None:
+    width = max([len("skill")] + [len(result["skill"]) for result in results])
+    print(f"{'skill':<{width}}  {'status':<10} {'files':>5} {'size KB':>9} {'time s':>7}")
+    for result in results:
+        if not result["ok"]:
+            status = "FAILED"
+        elif result["upToDate"]:
+            status = "up-to-date"
+        else:
+            status = "packaged"
+        files = "-" if result["files"] is None else result["files"]
+        size = "-" if result["size"] is None else f"{result['size'] / 1024:.1f}"
+        print(
+            f"{result['skill']:<{width}}  {status:<10} {files:>5} {size:>9} "
+            f"{result['seconds']:7.2f}"
+        )
+    failed = [result for result in results if not result["ok"]]
+    busy = sum(result["seconds"] for result in results)
+    speedup = busy / wall_seconds if wall_seconds > 0 else 1.0
+    print(
+        f"\n{len(results) - len(failed)}/{len(results)} skills packaged in "
+        f"{wall_seconds:.2f}s (sum of per-skill times {busy:.2f}s, {speedup:.1f}x)"
+    )
+    for result in failed:
+        print(f"\n[ERROR] {result['skill']} ({result['path']}):")
+        print(result["log"].rstrip())
+
+
+def watch_skill(skill_path, output_dir=None, debounce=skill_watch.DEBOUNCE_S, **options) -> None:
+    """
+    Package a skill, then repackage it whenever its files change, until
+    interrupted. Bursts of changes are debounced into one rebuild, SKILL.md is
+    only re-validated when it changes, and each rebuild reuses the unchanged
+    entries of the previous archive.
+    """
+    skill_path = Path(skill_path).resolve()
+    archive = (Path(output_dir).resolve() if output_dir else Path.cwd()) / f"{skill_path.name}.skill"
+    # Our own outputs (and their temporary files) must not trigger rebuilds.
+    outputs = [archive, manifest_path_for(archive)]
+    outputs += [path.with_name(f".{path.name}.{os.getpid()}.tmp") for path in outputs]
+    ignore = {
+        path.relative_to(skill_path).as_posix() for path in outputs if _is_within(path, skill_path)
+    }
+    watcher = skill_watch.make_watcher(skill_path, ignore=ignore)
+    print(f"[WATCH] Watching {skill_path} ({watcher.kind}); press Ctrl+C to stop\n")
+    changed = {"SKILL.md"}
+    valid = failed = False
+    try:
+        while True:
+            started = time.perf_counter()
+            result = None
+            try:
+                if failed or "SKILL.md" in changed or skill_watch.OVERFLOW in changed:
+                    valid, message = validate_skill(skill_path)
+                    print(f"[OK] {message}" if valid else f"[ERROR] Validation failed: {message}")
+                if valid:
+                    result = package_skill(skill_path, output_dir, validate=False, **options)
+                failed = False
+            except Exception as e:
+                # Files can change under us mid-rebuild; keep watching and start over
+                # (including validation) on the next change.
+                failed = True
+                print(f"[ERROR] Rebuild failed: {e}")
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            outcome = "Rebuilt" if result else "Not packaged"
+            print(f"[WATCH] {outcome} in {elapsed_ms:.0f} ms; waiting for changes...\n")
+            changed = skill_watch.wait_for_changes(watcher, debounce)
+            print(f"[WATCH] Changed: {', '.join(sorted(changed))}")
+    except KeyboardInterrupt:
+        print("\n[WATCH] Stopped")
+    finally:
+        watcher.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Validate a skill folder and package it into a .skill file."
+    )
+    parser.add_argument(
+        "skill_path", help="Path to the skill folder (with --all: root to search for skills)"
+    )
+    parser.add_argument("output_dir", nargs="?", help="Output directory (default: cwd)")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Files compressed concurrently (default: CPU count)",
+    )
+    parser.add_argument(
+        "--level",
+        type=int,
+        default=DEFAULT_LEVEL,
+        choices=range(10),
+        metavar="0-9",
+        help=f"zlib compression level (default: {DEFAULT_LEVEL})",
+    )
+    parser.add_argument(
+        "--lzma",
+        action="store_true",
+        help="Use LZMA for text files of 64 KiB or more (needs an LZMA-capable unzip)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild the archive even if its manifest says nothing changed",
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Byte-identical output for identical content: sorted entries, fixed "
+        "timestamps (SOURCE_DATE_EPOCH or 1980-01-01) and normalized permissions",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Package every folder with a SKILL.md under skill_path",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="With --all: skills packaged in parallel processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and repackage (re-validating only on SKILL.md edits) on every change",
+    )
+    args = parser.parse_args(argv)
+    if args.watch and args.all:
+        parser.error("--watch packages a single skill; it cannot be combined with --all")
+
+    options = {
+        "level": args.level,
+        "lzma": args.lzma,
+        "force": args.force,
+        "reproducible": args.reproducible,
+    }
+    if args.all:
+        started = time.perf_counter()
+        results = package_all(
+            args.skill_path, args.output_dir, workers=args.workers, jobs=args.jobs, **options
+        )
+        if not results:
+            print(f"[ERROR] No SKILL.md found under {args.skill_path}")
+            sys.exit(1)
+        print_summary(results, time.perf_counter() - started)
+        sys.exit(0 if all(result["ok"] for result in results) else 1)
+
+    print(f"Packaging skill: {args.skill_path}")
+    if args.output_dir:
+        print(f"   Output directory: {args.output_dir}")
     print()
 
-    result = package_skill(skill_path, output_dir)
+    if args.watch:
+        watch_skill(args.skill_path, args.output_dir, jobs=args.jobs, **options)
+        sys.exit(0)
+
+    result = package_skill(args.skill_path, args.output_dir, jobs=args.jobs, **options)
 
     if result:
         sys.exit(0)
@@ -1,51 +1,239 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python quick_validate.py <skill_directory>
+    python quick_validate.py validate-all [root] [--workers N] [--no-cache] [--output report.json]
 """
 
+import argparse
+import hashlib
+import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+from skill_discovery import discover_skills
+
 try:
     import yaml
 except ModuleNotFoundError:
     yaml = None
 
+# libyaml's C loader is several times faster than the pure-Python SafeLoader
+# and builds the same objects; use it whenever PyYAML was built with it.
+YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
 MAX_SKILL_NAME_LENGTH = 64
+# Bump whenever a validation rule changes so cached results are not reused.
+VALIDATOR_VERSION = "2"
+MAX_CACHE_ENTRIES = 2048
+# Frontmatter is a few lines; anything past this is a missing closing fence.
+MAX_FRONTMATTER_BYTES = 64 * 1024
+
+
+class FrontmatterTooLargeError(ValueError):
+    pass
+
+
+def read_frontmatter(path, max_bytes: int = MAX_FRONTMATTER_BYTES) -> Optional[str]:
+    """
+    Read only the frontmatter of a SKILL.md, line by line, stopping at the
+    closing `---`; the document body is never read.
+
+    Returns None if the file does not start with a frontmatter block or the
+    block is never closed. Raises FrontmatterTooLargeError once more than
+    max_bytes have been read without finding the closing fence.
+    """
+    with open(path, "rb") as handle:
+        return read_frontmatter_stream(handle, max_bytes)
 
 
-def _extract_frontmatter(content: str) -> Optional[str]:
-    lines = content.splitlines()
-    if not lines or lines[0].strip() != "---":
+def read_frontmatter_stream(handle, max_bytes: int = MAX_FRONTMATTER_BYTES) -> Optional[str]:
+    """Like read_frontmatter, for any binary stream with readline()."""
+    lines = []
+    line = handle.readline(max_bytes + 1)
+    total = len(line)
+    if line.strip() != b"---":
         return None
-    for i in range(1, len(lines)):
-        if lines[i].strip() == "---":
-            return "\n".join(lines[1:i])
-    return None
+    while True:
+        line = handle.readline(max_bytes + 1 - total)
+        total += len(line)
+        if total > max_bytes:
+            raise FrontmatterTooLargeError(
+                f"Frontmatter exceeds {max_bytes} bytes (missing closing '---'?)"
+            )
+        if not line:
+            return None
+        if line.strip() == b"---":
+            break
+        lines.append(line)
+    return "\n".join(b"".join(lines).decode("utf-8").splitlines())
+
+
+_YAML_NULL = {"", "~", "null", "Null", "NULL"}
+_YAML_TRUE = {"true", "True", "TRUE", "yes", "Yes", "YES", "on", "On", "ON"}
+_YAML_FALSE = {"false", "False", "FALSE", "no", "No", "NO", "off", "Off", "OFF"}
+_YAML_INT = re.compile(r"[-+]?(?:0|[1-9][0-9_]*)")
+_YAML_FLOAT = re.compile(r"[-+]?(?:[0-9][0-9_]*)?\.[0-9_]*(?:[eE][-+][0-9]+)?")
+_FLOW_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<double>"(?:[^"\\]|\\.)*")
+      | (?P<single>'(?:[^']|'')*')
+      | (?P<punct>[\[\]{},]|:(?=[\s\[\]{},]|$))
+      | (?P<plain>[^\s\[\]{},](?:[^\[\]{},:]|:(?![\s\[\]{},]|$))*)
+    )""",
+    re.VERBOSE | re.DOTALL,
+)
+_BLOCK_SCALAR = re.compile(r"[|>][-+]?")
+_TRAILING_COMMENT = re.compile(r"(?:^|\s+)#.*$")
+
+
+def _resolve_plain_scalar(text: str):
+    """Resolve an unquoted scalar the way PyYAML's SafeLoader does for common types."""
+    text = text.strip()
+    if text in _YAML_NULL:
+        return None
+    if text in _YAML_TRUE:
+        return True
+    if text in _YAML_FALSE:
+        return False
+    if _YAML_INT.fullmatch(text):
+        return int(text.replace("_", ""))
+    if _YAML_FLOAT.fullmatch(text) and text not in {".", "+.", "-."}:
+        return float(text.replace("_", ""))
+    return text
+
 
+def _unquote(text: str) -> str:
+    if text.startswith('"'):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text[1:-1]
+    return text[1:-1].replace("''", "'")
+
+
+def _parse_flow(text: str):
+    """Parse a YAML flow collection ({...} / [...]); raises ValueError if unsupported."""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _FLOW_TOKEN.match(text, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Unsupported flow syntax at {pos}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == "punct":
+            tokens.append((match.group(kind), None))
+        elif kind == "plain":
+            tokens.append(("scalar", _resolve_plain_scalar(match.group(kind))))
+        else:
+            tokens.append(("scalar", _unquote(match.group(kind))))
+    position = 0
+
+    def take(expected=None):
+        nonlocal position
+        if position >= len(tokens):
+            raise ValueError("Unexpected end of flow collection")
+        kind, value = tokens[position]
+        if expected is not None and kind not in expected:
+            raise ValueError(f"Expected {expected}, got {kind}")
+        position += 1
+        return kind, value
+
+    def peek():
+        return tokens[position][0] if position < len(tokens) else None
+
+    def node():
+        kind, value = take(("{", "[", "scalar"))
+        if kind == "scalar":
+            return value
+        closing = "}" if kind == "{" else "]"
+        items = {} if kind == "{" else []
+        while peek() != closing:
+            if kind == "{":
+                key = node()
+                take((":",))
+                items[key] = None if peek() in (",", "}") else node()
+            else:
+                items.append(node())
+            if peek() != closing:
+                take((",",))
+        take((closing,))
+        return items
+
+    result = node()
+    if position != len(tokens):
+        raise ValueError("Trailing content after flow collection")
+    return result
+
+
+def _fallback_value(value: str, continuation: list[str]):
+    """Convert a top-level value plus its indented continuation lines."""
+    if _BLOCK_SCALAR.fullmatch(value):
+        lines = [line.rstrip() for line in continuation]
+        while lines and not lines[-1]:
+            lines.pop()
+        indent = min((len(line) - len(line.lstrip()) for line in lines if line), default=0)
+        lines = [line[indent:] for line in lines]
+        if value[0] == ">":
+            paragraphs = "\n".join(lines).split("\n\n")
+            body = "\n".join(paragraph.replace("\n", " ") for paragraph in paragraphs)
+        else:
+            body = "\n".join(lines)
+        return body if value.endswith("-") or not body else body + "\n"
 
-def _parse_simple_frontmatter(frontmatter_text: str) -> Optional[dict[str, str]]:
+    stripped = [line.strip() for line in continuation if line.strip()]
+    if not value and stripped and all(line.startswith("- ") for line in stripped):
+        items = []
+        for line in stripped:
+            item = line[2:].strip()
+            if item[:1] in ('"', "'") and item[-1:] == item[:1]:
+                items.append(_unquote(item))
+            else:
+                items.append(_resolve_plain_scalar(item))
+        return items
+
+    # Plain and quoted scalars fold continuation lines with a single space.
+    text = " ".join([value, *stripped]) if value else " ".join(stripped)
+    if text.startswith(("{", "[")):
+        try:
+            return _parse_flow(text)
+        except ValueError:
+            return text
+    if len(text) >= 2 and text[0] in ('"', "'") and text[-1] == text[0]:
+        return _unquote(text)
+    return _resolve_plain_scalar(text)
+
+
+def _parse_simple_frontmatter(frontmatter_text: str) -> Optional[dict]:
     """
     Minimal fallback parser used when PyYAML is unavailable.
-    Supports simple `key: value` mappings used by SKILL.md frontmatter.
+    Supports the subset of YAML used by SKILL.md frontmatter: top-level
+    `key: value` pairs with plain, quoted or multi-line scalars, block
+    scalars (| and >), simple block lists, and flow collections ({...}, [...]),
+    resolving booleans, nulls and numbers the way PyYAML does.
     """
-    parsed: dict[str, str] = {}
-    current_key: Optional[str] = None
+    entries: list[tuple[str, str, list[str]]] = []
     for raw_line in frontmatter_text.splitlines():
         stripped = raw_line.strip()
-        if not stripped or stripped.startswith("#"):
+        is_indented = raw_line[:1].isspace()
+        if not stripped or (stripped.startswith("#") and not is_indented):
+            if entries and not stripped:
+                entries[-1][2].append("")
             continue
 
-        is_indented = raw_line[:1].isspace()
         if is_indented:
-            if current_key is None:
+            if not entries:
                 return None
-            current_value = parsed[current_key]
-            parsed[current_key] = (
-                f"{current_value}\n{stripped}" if current_value else stripped
-            )
+            entries[-1][2].append(raw_line)
             continue
 
         if ":" not in stripped:
@@ -55,13 +243,11 @@ def _parse_simple_frontmatter(frontmatter_text: str) -> Optional[dict[str, str]]
         value = value.strip()
         if not key:
             return None
-        if (value.startswith('"') and value.endswith('"')) or (
-            value.startswith("'") and value.endswith("'")
-        ):
-            value = value[1:-1]
-        parsed[key] = value
-        current_key = key
-    return parsed
+        if not value.startswith(("'", '"', "{", "[")):
+            value = _TRAILING_COMMENT.sub("", value)
+        entries.append((key, value, []))
+
+    return {key: _fallback_value(value, continuation) for key, value, continuation in entries}
 
 
 def validate_skill(skill_path):
@@ -73,28 +259,46 @@ def validate_skill(skill_path):
         return False, "SKILL.md not found"
 
     try:
-        content = skill_md.read_text(encoding="utf-8")
-    except OSError as e:
+        frontmatter_text = read_frontmatter(skill_md)
+    except FrontmatterTooLargeError as e:
+        return False, str(e)
+    except (OSError, UnicodeDecodeError) as e:
         return False, f"Could not read SKILL.md: {e}"
 
-    frontmatter_text = _extract_frontmatter(content)
+    return validate_frontmatter(frontmatter_text)
+
+
+def validate_frontmatter(frontmatter_text: Optional[str]):
+    """Validate extracted frontmatter text (None if absent); returns (valid, message)."""
+    frontmatter, error = parse_frontmatter(frontmatter_text)
+    if error is not None:
+        return False, error
+    return check_frontmatter(frontmatter)
+
+
+def parse_frontmatter(frontmatter_text: Optional[str]):
+    """Parse extracted frontmatter text; returns (frontmatter dict, None) or (None, error)."""
     if frontmatter_text is None:
-        return False, "Invalid frontmatter format"
+        return None, "Invalid frontmatter format"
     if yaml is not None:
         try:
-            frontmatter = yaml.safe_load(frontmatter_text)
+            frontmatter = yaml.load(frontmatter_text, Loader=YAML_LOADER)
             if not isinstance(frontmatter, dict):
-                return False, "Frontmatter must be a YAML dictionary"
+                return None, "Frontmatter must be a YAML dictionary"
         except yaml.YAMLError as e:
-            return False, f"Invalid YAML in frontmatter: {e}"
+            return None, f"Invalid YAML in frontmatter: {e}"
     else:
         frontmatter = _parse_simple_frontmatter(frontmatter_text)
         if frontmatter is None:
             return (
-                False,
+                None,
                 "Invalid YAML in frontmatter: unsupported syntax without PyYAML installed",
             )
+    return frontmatter, None
+
 
+def check_frontmatter(frontmatter: dict):
+    """Apply the validation rules to parsed frontmatter; returns (valid, message)."""
     allowed_properties = {"name", "description", "license", "allowed-tools", "metadata"}
 
     unexpected_keys = set(frontmatter.keys()) - allowed_properties
@@ -149,11 +353,143 @@ def validate_skill(skill_path):
     return True, "Skill is valid!"
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
+def default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "openclaw" / "skill-creator" / "validate-cache.json"
+
+
+def _cache_key(frontmatter_text: str) -> str:
+    # The fallback parser accepts a narrower syntax than PyYAML, so results
+    # from the two are cached separately.
+    parser = "pyyaml" if yaml is not None else "fallback"
+    key = f"{VALIDATOR_VERSION}\0{parser}\0{frontmatter_text}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def _load_cache(cache_path: Path) -> dict:
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    entries = data.get("entries") if isinstance(data, dict) else None
+    return entries if isinstance(entries, dict) else {}
+
+
+def _save_cache(cache_path: Path, entries: dict) -> None:
+    # Keep the most recently used entries (dict order is insertion order).
+    entries = dict(list(entries.items())[-MAX_CACHE_ENTRIES:])
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps({"entries": entries}), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _validate_cached(skill_dir: Path, cache: dict) -> tuple[dict, Optional[str]]:
+    """Validate one skill, consulting cache; returns (result, cache key)."""
+    result = {"skill": skill_dir.name, "path": str(skill_dir), "cached": False}
+    try:
+        frontmatter_text = read_frontmatter(skill_dir / "SKILL.md")
+    except FrontmatterTooLargeError as e:
+        result.update(valid=False, message=str(e))
+        return result, None
+    except (OSError, UnicodeDecodeError) as e:
+        result.update(valid=False, message=f"Could not read SKILL.md: {e}")
+        return result, None
+    if frontmatter_text is None:
+        result.update(valid=False, message="Invalid frontmatter format")
+        return result, None
+    key = _cache_key(frontmatter_text)
+    hit = cache.get(key)
+    if isinstance(hit, list) and len(hit) == 2:
+        result.update(valid=bool(hit[0]), message=hit[1], cached=True)
+        return result, key
+    valid, message = validate_frontmatter(frontmatter_text)
+    result.update(valid=valid, message=message)
+    return result, key
+
+
+def validate_all(root, workers=None, cache_path=None, use_cache=True) -> dict:
+    """
+    Validate every skill under root concurrently and return a JSON-ready report.
+
+    Only the frontmatter of each SKILL.md is read. Results are cached by
+    frontmatter hash plus VALIDATOR_VERSION, so only skills whose frontmatter
+    changed since the last run are parsed again.
+    """
+    started = time.perf_counter()
+    skills = discover_skills(root)
+    cache_path = Path(cache_path) if cache_path else default_cache_path()
+    cache = _load_cache(cache_path) if use_cache else {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(pool.map(lambda skill_dir: _validate_cached(skill_dir, cache), skills))
+
+    results = []
+    for result, key in outcomes:
+        results.append(result)
+        if key is not None:
+            cache.pop(key, None)
+            cache[key] = [result["valid"], result["message"]]
+    if use_cache:
+        try:
+            _save_cache(cache_path, cache)
+        except OSError as e:
+            print(f"[WARN] Could not write validation cache {cache_path}: {e}", file=sys.stderr)
+
+    valid = sum(1 for result in results if result["valid"])
+    return {
+        "validatorVersion": VALIDATOR_VERSION,
+        "root": str(Path(root).resolve()),
+        "summary": {
+            "total": len(results),
+            "valid": valid,
+            "invalid": len(results) - valid,
+            "cached": sum(1 for result in results if result["cached"]),
+            "seconds": round(time.perf_counter() - started, 4),
+        },
+        "skills": results,
+    }
+
+
+def validate_all_main(argv) -> int:
+    parser = argparse.ArgumentParser(
+        prog="quick_validate.py validate-all",
+        description="Validate every skill under a root and print a JSON report.",
+    )
+    parser.add_argument("root", nargs="?", default=".", help="Folder to search for skills")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent validations")
+    parser.add_argument("--cache", default=None, help="Cache file (default: user cache dir)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the cache")
+    parser.add_argument("--output", default=None, help="Write the report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = validate_all(
+        args.root, workers=args.workers, cache_path=args.cache, use_cache=not args.no_cache
+    )
+    text = json.dumps(report, indent=2) + "\n"
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    return 0 if report["summary"]["invalid"] == 0 else 1
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["validate-all"]:
+        return validate_all_main(argv[1:])
+    if len(argv) != 1:
         print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
+        print("       python quick_validate.py validate-all [root] [--no-cache] [--output FILE]")
+        return 1
 
-    valid, message = validate_skill(sys.argv[1])
+    valid, message = validate_skill(argv[0])
     print(message)
-    sys.exit(0 if valid else 1)
+    return 0 if valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Skill Archive Reader - Lazy, random-access reads from a packaged .skill file
+
+The archive is memory-mapped and only its central directory is parsed on
+open. SKILL.md frontmatter is read by inflating just the start of SKILL.md,
+and other members are decompressed only when first requested, with a small
+LRU of decompressed members. package_skill writes SKILL.md as the first
+entry, so the frontmatter sits in the first pages of the file.
+
+Usage:
+    python skill_archive.py <path/to/skill.skill> [member]
+
+Example:
+    python skill_archive.py dist/my-skill.skill
+    python skill_archive.py dist/my-skill.skill references/api.md
+"""
+
+import io
+import json
+import mmap
+import struct
+import sys
+import zipfile
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+try:  # Optional in CPython builds, as for zipfile.
+    import bz2
+except ImportError:
+    bz2 = None
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+import quick_validate
+from skill_discovery import EMBEDDED_MANIFEST_NAME
+
+DEFAULT_CACHE_ENTRIES = 16
+DEFAULT_CACHE_BYTES = 8 * 1024 * 1024
+# Compressed bytes handed to the decompressor per step.
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def _lzma1_filter(props: bytes) -> dict:
+    """Decode the 5-byte LZMA1 properties (lc/lp/pb byte, then dictionary size)."""
+    if len(props) != 5 or props[0] >= 9 * 5 * 5:
+        raise zipfile.BadZipFile("Corrupt LZMA properties")
+    pb, lp_lc = divmod(props[0], 9 * 5)
+    lp, lc = divmod(lp_lc, 9)
+    return {
+        "id": lzma.FILTER_LZMA1,
+        "lc": lc,
+        "lp": lp,
+        "pb": pb,
+        "dict_size": int.from_bytes(props[1:], "little"),
+    }
+
+
+class _ZipLZMADecompressor:
+    """
+    Zip-flavoured LZMA: a 4-byte header (version, properties size) and the
+    LZMA1 properties precede the raw stream.
+    """
+
+    def __init__(self):
+        self._header = b""
+        self._decompressor = None
+
+    def decompress(self, data) -> bytes:
+        if self._decompressor is None:
+            self._header += data
+            if len(self._header) < 4:
+                return b""
+            (props_size,) = struct.unpack_from("<H", self._header, 2)
+            if len(self._header) < 4 + props_size:
+                return b""
+            props, data = self._header[4 : 4 + props_size], self._header[4 + props_size :]
+            self._decompressor = lzma.LZMADecompressor(
+                lzma.FORMAT_RAW, filters=[_lzma1_filter(props)]
+            )
+            self._header = b""
+        return self._decompressor.decompress(data)
+
+
+def _decompressor(compress_type: int):
+    """A decompressor for a zip compression method, or None for stored members."""
+    if compress_type == zipfile.ZIP_STORED:
+        return None
+    if compress_type == zipfile.ZIP_DEFLATED:
+        return zlib.decompressobj(-15)
+    if compress_type == zipfile.ZIP_BZIP2 and bz2 is not None:
+        return bz2.BZ2Decompressor()
+    if compress_type == zipfile.ZIP_LZMA and lzma is not None:
+        return _ZipLZMADecompressor()
+    raise NotImplementedError(f"Unsupported compression method {compress_type}")
+
+
+class _MemberReader(io.RawIOBase):
+    """Inflates one member from a memoryview of its compressed bytes, on demand."""
+
+    def __init__(self, data: memoryview, zinfo: zipfile.ZipInfo):
+        self._data = data
+        self._zinfo = zinfo
+        self._offset = 0
+        self._decompressor = _decompressor(zinfo.compress_type)
+        self._pending = b""
+        self._produced = 0
+        self._crc = 0
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        # Drop the export so the archive's mmap can be closed.
+        self._data.release()
+        super().close()
+
+    def _fill(self) -> None:
+        while not self._pending and not self._eof:
+            chunk = self._data[self._offset : self._offset + READ_CHUNK_BYTES]
+            self._offset += len(chunk)
+            if self._decompressor is None:
+                output = bytes(chunk)
+            else:
+                output = self._decompressor.decompress(chunk)
+                if self._offset >= len(self._data) and hasattr(self._decompressor, "flush"):
+                    output += self._decompressor.flush()
+            if self._offset >= len(self._data):
+                self._eof = True
+            self._produced += len(output)
+            self._crc = zlib.crc32(output, self._crc)
+            self._pending = output
+        if self._eof and not self._pending and (
+            self._produced != self._zinfo.file_size or self._crc != self._zinfo.CRC
+        ):
+            raise zipfile.BadZipFile(f"Bad CRC-32 or size for {self._zinfo.filename}")
+
+    def readinto(self, buffer) -> int:
+        self._fill()
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class SkillArchive:
+    """
+    Read-only view of a .skill archive.
+
+    Member names are relative to the skill folder (e.g. "SKILL.md",
+    "references/api.md"). Use as a context manager, or call close().
+    """
+
+    def __init__(
+        self,
+        path,
+        cache_entries: int = DEFAULT_CACHE_ENTRIES,
+        cache_bytes: int = DEFAULT_CACHE_BYTES,
+    ):
+        self.path = Path(path)
+        self.cache_entries = cache_entries
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._frontmatter = None
+        self.stats = {"hits": 0, "misses": 0, "inflatedBytes": 0}
+
+        with open(self.path, "rb") as handle:
+            try:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise zipfile.BadZipFile(f"Not a skill archive: {self.path} ({e})") from e
+        try:
+            with zipfile.ZipFile(self._mmap) as zipf:
+                infos = [info for info in zipf.infolist() if not info.is_dir()]
+            top_levels = {info.filename.split("/", 1)[0] for info in infos}
+            if len(top_levels) != 1 or any("/" not in info.filename for info in infos):
+                raise zipfile.BadZipFile(f"Expected a single skill folder in {self.path}")
+        except BaseException:
+            self._mmap.close()
+            raise
+        self.skill_name = top_levels.pop()
+        prefix = f"{self.skill_name}/"
+        self._infos = {info.filename[len(prefix) :]: info for info in infos}
+        # The embedded manifest describes the archive; it is not one of the skill's files.
+        self._manifest_info = self._infos.pop(EMBEDDED_MANIFEST_NAME, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self) -> None:
+        self._cache.clear()
+        self._cached_bytes = 0
+        self._mmap.close()
+
+    def names(self) -> list[str]:
+        """Member paths in archive order."""
+        return list(self._infos)
+
+    def __contains__(self, name) -> bool:
+        return name in self._infos
+
+    def getinfo(self, name: str) -> zipfile.ZipInfo:
+        try:
+            return self._infos[name]
+        except KeyError:
+            raise KeyError(f"No member {name!r} in {self.path}") from None
+
+    def _compressed_view(self, zinfo: zipfile.ZipInfo) -> memoryview:
+        if zinfo.flag_bits & 0x1:
+            raise zipfile.BadZipFile(f"Encrypted member {zinfo.filename} is not supported")
+        header = struct.unpack_from(zipfile.structFileHeader, self._mmap, zinfo.header_offset)
+        if header[0] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"Bad local file header for {zinfo.filename}")
+        # Skip the file name and extra field (the last two header fields).
+        start = zinfo.header_offset + zipfile.sizeFileHeader + header[-2] + header[-1]
+        return memoryview(self._mmap)[start : start + zinfo.compress_size]
+
+    def open(self, name: str) -> io.BufferedReader:
+        """Stream a member, inflating it as it is read; bypasses the cache."""
+        zinfo = self.getinfo(name)
+        return io.BufferedReader(_MemberReader(self._compressed_view(zinfo), zinfo))
+
+    def read(self, name: str) -> bytes:
+        """Return a member's contents, decompressing it on first use."""
+        data = self._cache.get(name)
+        if data is not None:
+            self._cache.move_to_end(name)
+            self.stats["hits"] += 1
+            return data
+        self.stats["misses"] += 1
+        with self.open(name) as stream:
+            data = stream.read()
+        self.stats["inflatedBytes"] += len(data)
+        if len(data) <= self.cache_bytes and self.cache_entries > 0:
+            self._cache[name] = data
+            self._cached_bytes += len(data)
+            while len(self._cache) > self.cache_entries or self._cached_bytes > self.cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+        return data
+
+    def read_text(self, name: str, encoding: str = "utf-8") -> str:
+        return self.read(name).decode(encoding)
+
+    def manifest(self) -> dict | None:
+        """The per-entry hash manifest package_skill embeds, or None for older archives."""
+        if self._manifest_info is None:
+            return None
+        with io.BufferedReader(
+            _MemberReader(self._compressed_view(self._manifest_info), self._manifest_info)
+        ) as stream:
+            return json.loads(stream.read())
+
+    def frontmatter(self) -> dict:
+        """
+        Parse SKILL.md's frontmatter, inflating only as much of SKILL.md as
+        needed to reach the closing `---`. Raises ValueError if it is missing
+        or malformed.
+        """
+        if self._frontmatter is None:
+            with self.open("SKILL.md") as stream:
+                text = quick_validate.read_frontmatter_stream(stream)
+            frontmatter, error = quick_validate.parse_frontmatter(text)
+            if error is not None:
+                raise ValueError(f"{self.path}: {error}")
+            self._frontmatter = frontmatter
+        return self._frontmatter
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (1, 2):
+        print("Usage: python skill_archive.py <path/to/skill.skill> [member]")
+        return 1
+    try:
+        with SkillArchive(argv[0]) as archive:
+            if len(argv) == 2:
+                sys.stdout.buffer.write(archive.read(argv[1]))
+                return 0
+            summary = {"skill": archive.skill_name, "frontmatter": archive.frontmatter()}
+            summary["members"] = archive.names()
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(summary, indent=2, ensure_ascii=False, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
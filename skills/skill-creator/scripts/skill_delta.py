@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Skill Delta - Per-entry deltas between two versions of a .skill archive
+
+`make` compares two archives entry by entry. Unchanged entries are copied
+from the old archive when applying. Modified entries are stored as a binary
+diff of their contents when re-compressing the result reproduces the new
+entry byte for byte; otherwise, and for added entries, the new compressed
+entry is stored as-is. `apply` rebuilds the new archive from the old one and
+checks its size and SHA-256 against the digest recorded in the delta.
+
+Usage:
+    python skill_delta.py make <old.skill> <new.skill> [-o new.skilldelta]
+    python skill_delta.py apply <old.skill> <delta> [-o new.skill]
+
+Example:
+    python skill_delta.py make dist/v1/my-skill.skill dist/v2/my-skill.skill -o my-skill.skilldelta
+    python skill_delta.py apply ~/.skills/my-skill.skill my-skill.skilldelta -o my-skill.skill
+"""
+
+import argparse
+import difflib
+import hashlib
+import io
+import json
+import os
+import struct
+import sys
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from package_skill import DEFAULT_LEVEL, file_sha256
+
+DELTA_VERSION = 1
+DELTA_SUFFIX = ".skilldelta"
+# Fixed timestamp for the delta's own entries, so identical inputs give identical deltas.
+DELTA_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class DeltaError(ValueError):
+    """Raised when a delta does not match its base archive or fails verification."""
+
+
+@dataclass(frozen=True)
+class ArchiveRecord:
+    """One entry's bytes as laid out in the archive: local header, data, trailer."""
+
+    info: zipfile.ZipInfo
+    header: bytes
+    data: bytes
+    trailer: bytes
+
+    @property
+    def raw(self) -> bytes:
+        return self.header + self.data + self.trailer
+
+
+def read_records(archive_bytes: bytes) -> tuple[bytes, dict, bytes]:
+    """
+    Split an archive into (head, records by name in file order, tail).
+
+    Each record spans from its local header up to the next entry (so data
+    descriptors are kept); tail is the central directory and end record.
+    """
+    with zipfile.ZipFile(io.BytesIO(archive_bytes)) as zipf:
+        infos = sorted(zipf.infolist(), key=lambda info: info.header_offset)
+        start_dir = zipf.start_dir
+    ends = [info.header_offset for info in infos[1:]] + [start_dir]
+    records = {}
+    for info, end in zip(infos, ends):
+        fields = struct.unpack_from(zipfile.structFileHeader, archive_bytes, info.header_offset)
+        if fields[0] != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+        data_start = info.header_offset + zipfile.sizeFileHeader + fields[-2] + fields[-1]
+        data_end = data_start + info.compress_size
+        records[info.filename] = ArchiveRecord(
+            info=info,
+            header=archive_bytes[info.header_offset : data_start],
+            data=archive_bytes[data_start:data_end],
+            trailer=archive_bytes[data_end:end],
+        )
+    head_end = infos[0].header_offset if infos else start_dir
+    return archive_bytes[:head_end], records, archive_bytes[start_dir:]
+
+
+def diff_bytes(old: bytes, new: bytes) -> tuple[list, bytes]:
+    """
+    Line-level binary diff: returns (ops, literal) where ops are
+    ["c", offset, length] (copy from old) or ["i", length] (take the next
+    length bytes of literal).
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    old_offsets = [0]
+    for line in old_lines:
+        old_offsets.append(old_offsets[-1] + len(line))
+    ops, literal = [], []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["c", old_offsets[i1], old_offsets[i2] - old_offsets[i1]])
+        elif j2 > j1:
+            chunk = b"".join(new_lines[j1:j2])
+            ops.append(["i", len(chunk)])
+            literal.append(chunk)
+    return ops, b"".join(literal)
+
+
+def patch_bytes(old: bytes, ops: list, literal: bytes) -> bytes:
+    """Inverse of diff_bytes."""
+    out, position = [], 0
+    for op in ops:
+        if op[0] == "c":
+            out.append(old[op[1] : op[1] + op[2]])
+        else:
+            out.append(literal[position : position + op[1]])
+            position += op[1]
+    return b"".join(out)
+
+
+def _compress(raw: bytes, compress_type: int, level: int) -> bytes:
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        return compressor.compress(raw) + compressor.flush()
+    if compress_type == zipfile.ZIP_LZMA:
+        compressor = zipfile.LZMACompressor()
+        return compressor.compress(raw) + compressor.flush()
+    return raw
+
+
+def _find_level(raw: bytes, record: ArchiveRecord):
+    """Return a level that reproduces record.data from raw, or None."""
+    compress_type = record.info.compress_type
+    if compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_LZMA):
+        return None
+    levels = [DEFAULT_LEVEL] + [level for level in range(10) if level != DEFAULT_LEVEL]
+    if compress_type != zipfile.ZIP_DEFLATED:
+        levels = [DEFAULT_LEVEL]
+    for level in levels:
+        if _compress(raw, compress_type, level) == record.data:
+            return level
+    return None
+
+
+class _BlobWriter:
+    def __init__(self):
+        self.blobs = []
+
+    def add(self, data: bytes) -> int:
+        self.blobs.append(data)
+        return len(self.blobs) - 1
+
+
+def make_delta(old_archive, new_archive, delta_path) -> dict:
+    """Write the delta that turns old_archive into new_archive; returns its header."""
+    old_bytes = Path(old_archive).read_bytes()
+    new_bytes = Path(new_archive).read_bytes()
+    _, old_records, _ = read_records(old_bytes)
+    head, new_records, tail = read_records(new_bytes)
+
+    blobs = _BlobWriter()
+    entries = []
+    summary = {"added": [], "removed": [], "modified": [], "unchanged": 0, "patched": 0}
+    old_zip = zipfile.ZipFile(io.BytesIO(old_bytes))
+    new_zip = zipfile.ZipFile(io.BytesIO(new_bytes))
+    with old_zip, new_zip:
+        for name, record in new_records.items():
+            old_record = old_records.get(name)
+            if old_record is not None and old_record.raw == record.raw:
+                entries.append({"name": name, "op": "copy"})
+                summary["unchanged"] += 1
+                continue
+            summary["added" if old_record is None else "modified"].append(name)
+            entry = None
+            if old_record is not None:
+                old_content, new_content = old_zip.read(name), new_zip.read(name)
+                entry = _patch_entry(name, record, old_content, new_content, blobs)
+                summary["patched"] += entry is not None
+            entries.append(entry or {"name": name, "op": "raw", "blob": blobs.add(record.raw)})
+    summary["removed"] = sorted(set(old_records) - set(new_records))
+
+    header = {
+        "version": DELTA_VERSION,
+        "base": {"size": len(old_bytes), "sha256": hashlib.sha256(old_bytes).hexdigest()},
+        "target": {"size": len(new_bytes), "sha256": hashlib.sha256(new_bytes).hexdigest()},
+        "head": blobs.add(head),
+        "entries": entries,
+        "tail": blobs.add(tail),
+        "summary": summary,
+    }
+    delta_path = Path(delta_path)
+    tmp_path = delta_path.with_name(f".{delta_path.name}.{os.getpid()}.tmp")
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as delta:
+            delta.writestr(zipfile.ZipInfo("delta.json", DELTA_DATE_TIME), json.dumps(header))
+            for index, blob in enumerate(blobs.blobs):
+                if blob:
+                    delta.writestr(zipfile.ZipInfo(f"blobs/{index}", DELTA_DATE_TIME), blob)
+        os.replace(tmp_path, delta_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return header
+
+
+def _patch_entry(name, record, old_content, new_content, blobs: _BlobWriter):
+    """A "patch" entry for a modified member, or None if a raw copy is smaller or required."""
+    level = _find_level(new_content, record)
+    if level is None:
+        return None
+    ops, literal = diff_bytes(old_content, new_content)
+    if len(zlib.compress(literal)) + len(json.dumps(ops)) >= len(record.data):
+        return None
+    return {
+        "name": name,
+        "op": "patch",
+        "header": blobs.add(record.header),
+        "trailer": blobs.add(record.trailer),
+        "method": record.info.compress_type,
+        "level": level,
+        "crc": record.info.CRC,
+        "ops": ops,
+        "literal": blobs.add(literal),
+    }
+
+
+def read_delta_header(delta: zipfile.ZipFile) -> dict:
+    """Return the header of an open delta file, checking its version."""
+    try:
+        header = json.loads(delta.read("delta.json"))
+    except (KeyError, ValueError) as e:
+        raise DeltaError(f"Not a skill delta: {delta.filename}") from e
+    if header.get("version") != DELTA_VERSION:
+        raise DeltaError(f"Unsupported delta version {header.get('version')!r}")
+    return header
+
+
+def _blob(delta: zipfile.ZipFile, index: int) -> bytes:
+    # Empty blobs are not stored.
+    try:
+        return delta.read(f"blobs/{index}")
+    except KeyError:
+        return b""
+
+
+def apply_delta(old_archive, delta_path, output_path) -> Path:
+    """Rebuild the new archive from old_archive and a delta, verifying its digest."""
+    old_bytes = Path(old_archive).read_bytes()
+    with zipfile.ZipFile(delta_path) as delta, zipfile.ZipFile(io.BytesIO(old_bytes)) as old_zip:
+        header = read_delta_header(delta)
+        base = header["base"]
+        if len(old_bytes) != base["size"] or hashlib.sha256(old_bytes).hexdigest() != base["sha256"]:
+            raise DeltaError(f"{old_archive} is not the archive this delta was made from")
+        _, old_records, _ = read_records(old_bytes)
+
+        parts = [_blob(delta, header["head"])]
+        for entry in header["entries"]:
+            name, op = entry["name"], entry["op"]
+            if op in ("copy", "patch") and name not in old_records:
+                raise DeltaError(f"delta references unknown entry {name!r}")
+            if op == "copy":
+                parts.append(old_records[name].raw)
+            elif op == "raw":
+                parts.append(_blob(delta, entry["blob"]))
+            elif op == "patch":
+                literal = _blob(delta, entry["literal"])
+                content = patch_bytes(old_zip.read(name), entry["ops"], literal)
+                if zlib.crc32(content) != entry["crc"]:
+                    raise DeltaError(f"Patched content of {name} fails its CRC check")
+                parts.append(_blob(delta, entry["header"]))
+                parts.append(_compress(content, entry["method"], entry["level"]))
+                parts.append(_blob(delta, entry["trailer"]))
+            else:
+                raise DeltaError(f"Unknown delta op {op!r} for {name}")
+        parts.append(_blob(delta, header["tail"]))
+
+    target = header["target"]
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as handle:
+            for part in parts:
+                handle.write(part)
+        if tmp_path.stat().st_size != target["size"] or file_sha256(tmp_path) != target["sha256"]:
+            raise DeltaError(f"Rebuilt archive does not match the delta's SHA-256 {target['sha256']}")
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return output_path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Make or apply .skill archive deltas.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    make = subparsers.add_parser("make", help="Write a delta from OLD to NEW")
+    make.add_argument("old")
+    make.add_argument("new")
+    make.add_argument("--output", "-o", help=f"Delta file (default: <new>{DELTA_SUFFIX})")
+    apply = subparsers.add_parser("apply", help="Rebuild NEW from OLD and a delta")
+    apply.add_argument("old")
+    apply.add_argument("delta")
+    apply.add_argument("--output", "-o", help="Archive to write (default: replace OLD)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "make":
+            output = Path(args.output or Path(args.new).with_suffix(DELTA_SUFFIX))
+            header = make_delta(args.old, args.new, output)
+            summary = header["summary"]
+            delta_size, new_size = output.stat().st_size, header["target"]["size"]
+            print(
+                f"[OK] Delta written to: {output} ({len(summary['added'])} added, "
+                f"{len(summary['removed'])} removed, {len(summary['modified'])} modified "
+                f"[{summary['patched']} as diffs], {summary['unchanged']} unchanged)"
+            )
+            print(
+                f"[OK] {delta_size} bytes vs {new_size} for the full archive "
+                f"({delta_size / max(new_size, 1):.1%})"
+            )
+        else:
+            output = apply_delta(args.old, args.delta, args.output or args.old)
+            print(f"[OK] Rebuilt and verified: {output} (SHA-256 {file_sha256(output)})")
+    except (OSError, DeltaError, zipfile.BadZipFile) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Skill discovery and archive layout constants shared by the skill-creator scripts.
+"""
+
+import os
+from pathlib import Path
+
+EXCLUDED_DIRS = {".git", ".svn", ".hg", "__pycache__", "node_modules"}
+
+# Per-entry SHA-256 manifest stored inside the archive, next to SKILL.md; see verify_skill.py.
+EMBEDDED_MANIFEST_NAME = ".skill-manifest.json"
+EMBEDDED_MANIFEST_VERSION = 1
+
+
+def discover_skills(root) -> list[Path]:
+    """
+    Return every folder under root (including root) that contains a SKILL.md,
+    sorted by path. Excluded and symlinked directories are not entered, nor
+    are the folders of skills already found.
+    """
+    skills = []
+    stack = [Path(root).resolve()]
+    while stack:
+        directory = stack.pop()
+        if (directory / "SKILL.md").is_file():
+            skills.append(directory)
+            continue
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False) and entry.name not in EXCLUDED_DIRS:
+                    stack.append(Path(entry.path))
+    return sorted(skills)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Skill Store - Content-addressed storage and installs for packaged skills
+
+Every file of an added skill is stored once under objects/<sha256[:2]>/,
+keyed by its content (and executable bit), with a small JSON index per
+skill. Installing a skill recreates its folder with hard links into the
+store, falling back to copies where hard links are not possible, so skills
+that share scripts, templates or assets share their bytes on disk too.
+Objects are read-only; installed files must be replaced, not edited in place.
+
+Usage:
+    python skill_store.py add <store> <skill.skill | skill-folder>...
+    python skill_store.py install <store> <skill-name> <destination>
+    python skill_store.py report <skills-root> [--json] [--top N]
+
+Example:
+    python skill_store.py add ~/.skill-store dist/*.skill
+    python skill_store.py install ~/.skill-store pdf ~/.skills/pdf
+    python skill_store.py report skills
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from package_skill import _is_within, _write_json_atomic, file_sha256, iter_skill_files
+from skill_archive import SkillArchive
+from skill_discovery import discover_skills
+
+STORE_VERSION = 1
+# Skill names become index file names, so they may not contain separators or start with a dot.
+SKILL_NAME_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+SHA256_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def _object_path(store: Path, sha256: str, executable: bool) -> Path:
+    # Hard links share permissions, so executable copies are separate objects.
+    return store / "objects" / sha256[:2] / (sha256[2:] + (".x" if executable else ""))
+
+
+def _check_skill_name(skill_name: str) -> str:
+    if not isinstance(skill_name, str) or not SKILL_NAME_RE.fullmatch(skill_name):
+        raise ValueError(f"Invalid skill name: {skill_name!r}")
+    return skill_name
+
+
+def _check_rel_path(rel_path: str) -> str:
+    """Reject member paths that could land outside the skill folder (zip-slip)."""
+    path = PurePosixPath(rel_path) if isinstance(rel_path, str) else None
+    if (
+        path is None
+        or not rel_path
+        or "\\" in rel_path
+        or path.is_absolute()
+        or any(part in ("", ".", "..") for part in rel_path.split("/"))
+    ):
+        raise ValueError(f"Unsafe path in skill: {rel_path!r}")
+    return rel_path
+
+
+def _check_sha256(digest: str) -> str:
+    """Object names come from index files, which can be edited by hand."""
+    if not isinstance(digest, str) or not SHA256_RE.fullmatch(digest):
+        raise ValueError(f"Invalid sha256 in skill index: {digest!r}")
+    return digest
+
+
+def _index_path(store: Path, skill_name: str) -> Path:
+    return store / "skills" / f"{_check_skill_name(skill_name)}.json"
+
+
+def _put_object(store: Path, data: bytes, executable: bool) -> tuple[str, bool]:
+    """Store data if it is not already present; returns (sha256, newly_stored)."""
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = _object_path(store, sha256, executable)
+    if path.exists():
+        return sha256, False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        tmp_path.chmod(0o555 if executable else 0o444)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return sha256, True
+
+
+def _iter_source_files(source: Path):
+    """
+    Yield (skill_name, rel_path, data, executable) for a .skill archive or
+    skill folder. Raises ValueError for an unsafe skill name or member path.
+    """
+    if source.is_dir():
+        skill_name = _check_skill_name(source.name)
+        for skill_file in iter_skill_files(source):
+            yield (
+                skill_name,
+                _check_rel_path(skill_file.rel_path),
+                skill_file.path.read_bytes(),
+                bool(skill_file.mode & 0o111),
+            )
+        return
+    with SkillArchive(source, cache_entries=0) as archive:
+        skill_name = _check_skill_name(archive.skill_name)
+        names = [_check_rel_path(name) for name in archive.names()]
+        for name in names:
+            mode = archive.getinfo(name).external_attr >> 16
+            yield skill_name, name, archive.read(name), bool(mode & 0o111)
+
+
+def add_skill(store, source) -> dict:
+    """Add a packaged .skill archive (or a skill folder) to the store; returns its index."""
+    store, source = Path(store), Path(source)
+    files = []
+    skill_name = source.name
+    stored_bytes = 0
+    for skill_name, rel_path, data, executable in _iter_source_files(source):
+        sha256, stored = _put_object(store, data, executable)
+        stored_bytes += len(data) if stored else 0
+        files.append(
+            {"path": rel_path, "sha256": sha256, "size": len(data), "executable": executable}
+        )
+    index = {
+        "version": STORE_VERSION,
+        "skill": skill_name,
+        "source": str(source.resolve()),
+        "files": files,
+        "storedBytes": stored_bytes,
+    }
+    index_path = _index_path(store, skill_name)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    _write_json_atomic(index_path, index)
+    return index
+
+
+def load_index(store, skill_name: str) -> dict:
+    index_path = _index_path(Path(store), skill_name)
+    try:
+        return json.loads(index_path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        raise KeyError(f"Skill {skill_name!r} is not in the store {store}") from None
+
+
+def install_skill(store, skill_name: str, destination) -> dict:
+    """
+    Install a stored skill into destination (which must not exist yet) using
+    hard links into the store. Returns counts of linked and copied files.
+    """
+    store, destination = Path(store), Path(destination)
+    index = load_index(store, skill_name)
+    if destination.exists():
+        raise FileExistsError(f"Destination already exists: {destination}")
+    tmp_dir = destination.with_name(f".{destination.name}.{os.getpid()}.tmp")
+    counts = {"linked": 0, "copied": 0}
+    try:
+        tmp_dir.mkdir(parents=True)
+        tmp_root = tmp_dir.resolve()
+        for record in index["files"]:
+            source = _object_path(store, _check_sha256(record["sha256"]), record["executable"])
+            target = tmp_dir / _check_rel_path(record["path"])
+            # Index files can be edited by hand; never follow one out of the install.
+            if not _is_within(target.resolve(), tmp_root):
+                raise ValueError(f"Unsafe path in skill index: {record['path']!r}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(source, target)
+                counts["linked"] += 1
+            except OSError:
+                # Different filesystem, or links not supported: copy instead.
+                shutil.copy2(source, target)
+                counts["copied"] += 1
+        os.replace(tmp_dir, destination)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return counts
+
+
+def dedup_report(root, top: int = 10) -> dict:
+    """
+    Hash every shipped file of every skill under root and report how many
+    bytes a content-addressed store would save.
+    """
+    root = Path(root).resolve()
+    by_hash = {}
+    skills = discover_skills(root)
+    files = total_bytes = 0
+    for skill_dir in skills:
+        for skill_file in iter_skill_files(skill_dir):
+            files += 1
+            total_bytes += skill_file.size
+            entry = by_hash.setdefault(
+                file_sha256(skill_file.path), {"size": skill_file.size, "paths": []}
+            )
+            entry["paths"].append(skill_file.path.relative_to(root).as_posix())
+    unique_bytes = sum(entry["size"] for entry in by_hash.values())
+    duplicates = [
+        {"sha256": sha256, "size": entry["size"], "copies": len(entry["paths"]), **entry}
+        for sha256, entry in by_hash.items()
+        if len(entry["paths"]) > 1
+    ]
+    duplicates.sort(key=lambda entry: (-(entry["copies"] - 1) * entry["size"], entry["sha256"]))
+    return {
+        "root": str(root),
+        "skills": len(skills),
+        "files": files,
+        "uniqueFiles": len(by_hash),
+        "totalBytes": total_bytes,
+        "uniqueBytes": unique_bytes,
+        "savedBytes": total_bytes - unique_bytes,
+        "duplicates": duplicates[:top],
+    }
+
+
+def print_report(report: dict) -> None:
+    total, saved = report["totalBytes"], report["savedBytes"]
+    print(
+        f"{report['skills']} skills, {report['files']} files ({report['uniqueFiles']} unique), "
+        f"{total} bytes"
+    )
+    print(
+        f"Dedup saves {saved} bytes ({saved / max(total, 1):.1%}); "
+        f"store size {report['uniqueBytes']} bytes"
+    )
+    for entry in report["duplicates"]:
+        print(f"  {entry['copies']}x {entry['size']} bytes: {', '.join(entry['paths'])}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Content-addressed store for packaged skills.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add = subparsers.add_parser("add", help="Add .skill archives or skill folders to a store")
+    add.add_argument("store")
+    add.add_argument("sources", nargs="+")
+    install = subparsers.add_parser("install", help="Install a stored skill using hard links")
+    install.add_argument("store")
+    install.add_argument("skill")
+    install.add_argument("destination")
+    report = subparsers.add_parser("report", help="Report bytes saved by dedup across a skills root")
+    report.add_argument("root")
+    report.add_argument("--json", action="store_true", help="Print the report as JSON")
+    report.add_argument("--top", type=int, default=10, help="Duplicates to list (default: 10)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "add":
+            for source in args.sources:
+                index = add_skill(args.store, source)
+                print(
+                    f"[OK] Added {index['skill']}: {len(index['files'])} files, "
+                    f"{index['storedBytes']} new bytes stored"
+                )
+        elif args.command == "install":
+            counts = install_skill(args.store, args.skill, args.destination)
+            print(
+                f"[OK] Installed {args.skill} to {args.destination} "
+                f"({counts['linked']} linked, {counts['copied']} copied)"
+            )
+        else:
+            result = dedup_report(args.root, top=args.top)
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                print_report(result)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
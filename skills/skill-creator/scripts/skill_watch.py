@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+File watching for skill folders, used by `package_skill.py --watch`.
+
+On Linux this uses inotify (through ctypes, no extra dependency); elsewhere,
+or if inotify is unavailable, it falls back to polling a stat snapshot of
+the skill folder. Excluded directories (.git, node_modules, ...) are never
+watched or scanned, and symlinks are not followed.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from skill_discovery import EXCLUDED_DIRS
+
+POLL_INTERVAL_S = 0.5
+DEBOUNCE_S = 0.2
+
+# Reported in a change set when events were lost and everything must be rechecked.
+OVERFLOW = "*"
+# Snapshot value for directories: only their appearance or removal counts as a change.
+DIRECTORY = "dir"
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+_EVENT = struct.Struct("iIII")
+
+
+def _is_excluded(rel_path: str) -> bool:
+    return any(part in EXCLUDED_DIRS for part in rel_path.split("/"))
+
+
+def scan(root) -> dict:
+    """
+    Map each path under root to its (size, mtime_ns) for files, or DIRECTORY
+    for directories, so that creating or removing an empty directory is a
+    change (as it is for inotify) but adding files to one is not.
+    """
+    snapshot = {}
+    stack = [(str(root), "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            rel_path = f"{rel_dir}{entry.name}"
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDED_DIRS:
+                        snapshot[rel_path] = DIRECTORY
+                        stack.append((entry.path, f"{rel_path}/"))
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            snapshot[rel_path] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+class PollingWatcher:
+    """Detects changes by comparing stat snapshots every poll_interval seconds."""
+
+    kind = "polling"
+
+    def __init__(self, root, ignore=(), poll_interval: float = POLL_INTERVAL_S):
+        self.root = Path(root)
+        self.ignore = set(ignore)
+        self.poll_interval = poll_interval
+        self._snapshot = scan(self.root)
+
+    def poll(self, timeout=None) -> set:
+        """Return the paths changed since the last call, waiting up to timeout (None: forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = scan(self.root)
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            } - self.ignore
+            self._snapshot = snapshot
+            if changed:
+                return changed
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return set()
+            time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher over every non-excluded directory of root."""
+
+    kind = "inotify"
+
+    def __init__(self, root, ignore=()):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("libc has no inotify support")
+        self.root = Path(root)
+        self.ignore = set(ignore)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}
+        try:
+            self._add_tree(self.root, "")
+        except OSError:
+            self.close()
+            raise
+
+    def _add_tree(self, path, rel_dir: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = rel_dir
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False) and entry.name not in EXCLUDED_DIRS:
+                    self._add_tree(entry.path, f"{rel_dir}{entry.name}/")
+
+    def _read_events(self) -> bytes:
+        chunks = []
+        while True:
+            try:
+                chunks.append(os.read(self._fd, 64 * 1024))
+            except BlockingIOError:
+                return b"".join(chunks)
+
+    def poll(self, timeout=None) -> set:
+        """Return the paths changed since the last call, waiting up to timeout (None: forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            # Events for ignored or excluded paths can leave the batch empty; keep waiting.
+            changed = self._changes(self._read_events())
+            if changed:
+                return changed
+
+    def _changes(self, data: bytes) -> set:
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            start = offset + _EVENT.size
+            name = os.fsdecode(data[start : start + length].rstrip(b"\0"))
+            offset = start + length
+            if mask & IN_Q_OVERFLOW:
+                changed.add(OVERFLOW)
+                continue
+            rel_dir = self._dirs.get(wd)
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            if rel_dir is None or not name:
+                continue
+            rel_path = f"{rel_dir}{name}"
+            if _is_excluded(rel_path) or rel_path in self.ignore:
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self._add_tree(self.root / rel_path, f"{rel_path}/")
+                except OSError:
+                    pass
+                # Files may have landed before the watch was added.
+                changed.update(f"{rel_path}/{path}" for path in scan(self.root / rel_path))
+            changed.add(rel_path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(root, ignore=(), poll_interval: float = POLL_INTERVAL_S):
+    """An InotifyWatcher where possible, otherwise a PollingWatcher."""
+    try:
+        return InotifyWatcher(root, ignore=ignore)
+    except OSError:
+        return PollingWatcher(root, ignore=ignore, poll_interval=poll_interval)
+
+
+def wait_for_changes(watcher, debounce: float = DEBOUNCE_S, timeout=None) -> set:
+    """
+    Block until something changes (or timeout seconds pass; None waits
+    forever), then keep collecting until debounce seconds pass without further
+    changes, and return everything that changed.
+    """
+    changed = watcher.poll(timeout)
+    if not changed:
+        return changed
+    while True:
+        more = watcher.poll(debounce)
+        if not more:
+            return changed
+        changed |= more
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the skill catalog builder.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import build_catalog
+import quick_validate
+
+
+class TestBuildCatalog(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_build_catalog_"))
+        self.root = self.temp_dir / "repo"
+        self.catalog_path = self.temp_dir / "catalog.json"
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_skill(self, rel, name, description="ok"):
+        skill_dir = self.root / rel
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        content = f"---\nname: {name}\ndescription: {description}\n---\n# Skill\n"
+        (skill_dir / "SKILL.md").write_text(content, encoding="utf-8")
+        return skill_dir
+
+    def build(self, **kwargs):
+        return build_catalog.build_catalog(self.root, self.catalog_path, **kwargs)
+
+    def test_catalog_lists_valid_skills_with_frontmatter_and_hash(self):
+        self.write_skill("alpha", "alpha", description="First skill")
+        self.write_skill("group/bad", "Bad_Name")
+
+        catalog, stats = self.build()
+
+        self.assertEqual(stats["indexed"], 2)
+        self.assertEqual(build_catalog.load_catalog(self.catalog_path), catalog)
+        [alpha] = catalog["skills"]
+        self.assertEqual(alpha["path"], "alpha")
+        self.assertEqual(alpha["frontmatter"], {"name": "alpha", "description": "First skill"})
+        self.assertEqual(len(alpha["sha256"]), 64)
+        [bad] = catalog["invalid"]
+        self.assertEqual(bad["path"], "group/bad")
+        self.assertIn("hyphen-case", bad["message"])
+        self.assertNotIn("frontmatter", bad)
+
+    def test_unchanged_rebuild_opens_no_skill_files(self):
+        self.write_skill("alpha", "alpha")
+        self.write_skill("beta", "beta")
+        self.build()
+        mtime = self.catalog_path.stat().st_mtime_ns
+
+        with patch.object(quick_validate, "read_frontmatter") as read_frontmatter:
+            _, stats = self.build()
+
+        read_frontmatter.assert_not_called()
+        self.assertEqual(stats["reused"], 2)
+        self.assertFalse(stats["written"])
+        self.assertEqual(self.catalog_path.stat().st_mtime_ns, mtime)
+
+    def test_only_changed_skills_are_reparsed(self):
+        self.write_skill("alpha", "alpha")
+        beta = self.write_skill("beta", "beta")
+        gamma = self.write_skill("gamma", "gamma")
+        self.build()
+
+        (beta / "SKILL.md").write_text("---\nname: beta\ndescription: new\n---\n", encoding="utf-8")
+        stat = (gamma / "SKILL.md").stat()
+        os.utime(gamma / "SKILL.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with patch.object(
+            quick_validate, "parse_frontmatter", wraps=quick_validate.parse_frontmatter
+        ) as parse:
+            catalog, stats = self.build()
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual((stats["indexed"], stats["reused"]), (1, 2))
+        by_path = {entry["path"]: entry for entry in catalog["skills"]}
+        self.assertEqual(by_path["beta"]["frontmatter"]["description"], "new")
+        self.assertEqual(by_path["gamma"]["mtimeNs"], stat.st_mtime_ns + 10**9)
+
+    def test_removed_skills_drop_out_and_version_change_rebuilds(self):
+        alpha = self.write_skill("alpha", "alpha")
+        self.write_skill("beta", "beta")
+        self.build()
+        shutil.rmtree(alpha)
+
+        with patch.object(quick_validate, "VALIDATOR_VERSION", "test-next"):
+            catalog, stats = self.build()
+
+        self.assertEqual([entry["path"] for entry in catalog["skills"]], ["beta"])
+        self.assertEqual(stats["indexed"], 1)
+        self.assertEqual(catalog["options"]["validatorVersion"], "test-next")
+
+    def test_cli_writes_compact_catalog(self):
+        self.write_skill("alpha", "alpha")
+
+        code = build_catalog.main([str(self.root), "--output", str(self.catalog_path)])
+
+        self.assertEqual(code, 0)
+        text = self.catalog_path.read_text(encoding="utf-8")
+        self.assertNotIn("\n", text)
+        self.assertEqual(json.loads(text)["skills"][0]["path"], "alpha")
+
+
+if __name__ == "__main__":
+    main()
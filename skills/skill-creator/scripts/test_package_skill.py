@@ -3,13 +3,19 @@
 Regression tests for skill packaging security behavior.
 """
 
+import hashlib
+import io
+import json
+import os
 import sys
 import tempfile
+import time
 import types
 import zipfile
+from contextlib import redirect_stdout
 from pathlib import Path
 from unittest import TestCase, main
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 if str(SCRIPT_DIR) not in sys.path:
@@ -155,6 +161,392 @@ class TestPackageSkillSecurity(TestCase):
         self.assertIn("self-output-skill/script.py", names)
         self.assertNotIn("self-output-skill/self-output-skill.skill", names)
 
+    def test_prunes_excluded_directories_without_entering_them(self):
+        skill_dir = self.create_skill("pruned-skill")
+        for excluded in ("node_modules/pkg", ".git/objects", "lib/__pycache__"):
+            (skill_dir / excluded).mkdir(parents=True)
+            (skill_dir / excluded / "junk.txt").write_text("junk\n")
+        (skill_dir / "lib" / "keep.py").write_text("x = 1\n")
+        out_dir = self.temp_dir / "out"
+        out_dir.mkdir()
+
+        scanned = []
+        real_scandir = package_skill_module.os.scandir
+
+        def recording_scandir(path):
+            scanned.append(Path(path).name)
+            return real_scandir(path)
+
+        with patch.object(package_skill_module.os, "scandir", recording_scandir):
+            result = package_skill(str(skill_dir), str(out_dir))
+
+        self.assertIsNotNone(result)
+        with zipfile.ZipFile(out_dir / "pruned-skill.skill", "r") as archive:
+            names = set(archive.namelist())
+        self.assertEqual(
+            names,
+            {
+                "pruned-skill/SKILL.md",
+                "pruned-skill/script.py",
+                "pruned-skill/lib/keep.py",
+                "pruned-skill/.skill-manifest.json",
+            },
+        )
+        self.assertEqual(sorted(scanned), ["lib", "pruned-skill"])
+
+    def test_iter_skill_files_reports_relative_paths_and_sizes(self):
+        skill_dir = self.create_skill("walk-skill")
+        (skill_dir / "refs").mkdir()
+        (skill_dir / "refs" / "a.md").write_text("abc")
+
+        files = {f.rel_path: f for f in package_skill_module.iter_skill_files(skill_dir)}
+
+        self.assertEqual(set(files), {"SKILL.md", "script.py", "refs/a.md"})
+        self.assertEqual(files["refs/a.md"].size, 3)
+        self.assertEqual(files["refs/a.md"].path, skill_dir / "refs" / "a.md")
+
+    def test_iter_skill_files_skips_entries_removed_mid_walk(self):
+        skill_dir = self.create_skill("vanish-skill")
+        (skill_dir / "refs").mkdir()
+        (skill_dir / "refs" / "a.md").write_text("abc")
+
+        walk = package_skill_module.iter_skill_files(skill_dir)
+        first = next(walk)
+        (skill_dir / "script.py").unlink()
+        (skill_dir / "refs" / "a.md").unlink()
+        (skill_dir / "refs").rmdir()
+
+        self.assertEqual([first.rel_path] + [f.rel_path for f in walk], ["SKILL.md"])
+
+    def test_write_compressed_entry_round_trips_through_testzip(self):
+        skill_dir = self.create_skill("raw-skill")
+        contents = {
+            zipfile.ZIP_STORED: b"stored bytes",
+            zipfile.ZIP_DEFLATED: b"deflate me " * 500,
+            zipfile.ZIP_LZMA: b"lzma text " * 500,
+        }
+        for supported in (True, False):
+            with self.subTest(raw_writes=supported):
+                buffer = io.BytesIO()
+                with patch.object(
+                    package_skill_module, "_raw_writes_supported", return_value=supported
+                ), zipfile.ZipFile(buffer, "w") as archive:
+                    archive.writestr("first.txt", b"written normally")
+                    for compress_type, raw in contents.items():
+                        path = skill_dir / f"{compress_type}.txt"
+                        path.write_bytes(raw)
+                        skill_file = next(
+                            f
+                            for f in package_skill_module.iter_skill_files(skill_dir)
+                            if f.path == path
+                        )
+                        entry = package_skill_module.compress_file(
+                            skill_file, compress_type=compress_type
+                        )
+                        self.assertEqual(entry.compress_type, compress_type)
+                        package_skill_module.write_compressed_entry(
+                            archive, package_skill_module._zip_info(path.name, entry), entry.data
+                        )
+
+                with zipfile.ZipFile(buffer) as archive:
+                    self.assertIsNone(archive.testzip())
+                    self.assertEqual(archive.read("first.txt"), b"written normally")
+                    for compress_type, raw in contents.items():
+                        info = archive.getinfo(f"{compress_type}.txt")
+                        self.assertEqual(info.compress_type, compress_type)
+                        self.assertEqual(archive.read(info), raw)
+
+    def test_parallel_compression_matches_serial_archive(self):
+        skill_dir = self.create_skill("parallel-skill")
+        (skill_dir / "refs").mkdir()
+        for i in range(12):
+            (skill_dir / "refs" / f"doc{i}.md").write_text(f"# Doc {i}\n" + "text " * 2000)
+
+        archives = {}
+        for jobs in (1, 4):
+            out_dir = self.temp_dir / f"out-{jobs}"
+            result = package_skill(str(skill_dir), str(out_dir), jobs=jobs, level=9)
+            self.assertIsNotNone(result)
+            with zipfile.ZipFile(result, "r") as archive:
+                self.assertIsNone(archive.testzip())
+                archives[jobs] = [
+                    (info.filename, info.compress_type, archive.read(info))
+                    for info in archive.infolist()
+                ]
+
+        self.assertEqual(archives[1], archives[4])
+        self.assertEqual(archives[4][0][0], "parallel-skill/SKILL.md")
+        docs = [kind for name, kind, _ in archives[4] if name.endswith(".md") and "/refs/" in name]
+        self.assertEqual(docs, [zipfile.ZIP_DEFLATED] * 12)
+
+    def test_main_passes_jobs_and_level(self):
+        skill_dir = self.create_skill("cli-skill")
+        out_dir = self.temp_dir / "out"
+
+        with patch.object(package_skill_module, "package_skill", return_value=out_dir) as fake:
+            with self.assertRaises(SystemExit) as exit_info:
+                package_skill_module.main([str(skill_dir), str(out_dir), "--jobs", "3", "--level", "1"])
+
+        self.assertEqual(exit_info.exception.code, 0)
+        fake.assert_called_once_with(
+            str(skill_dir), str(out_dir), jobs=3, level=1, lzma=False, force=False, reproducible=False
+        )
+
+    def test_compression_policy_stores_media_and_small_files(self):
+        skill_dir = self.create_skill("policy-skill")
+        (skill_dir / "assets").mkdir()
+        (skill_dir / "assets" / "logo.png").write_bytes(b"\x89PNG" + bytes(4000))
+        (skill_dir / "refs").mkdir()
+        (skill_dir / "refs" / "guide.md").write_text("guide line\n" * 1000)
+        (skill_dir / "refs" / "big.md").write_text("reference text\n" * 8000)
+        out_dir = self.temp_dir / "out"
+
+        result = package_skill(str(skill_dir), str(out_dir), jobs=2, lzma=True)
+
+        self.assertIsNotNone(result)
+        with zipfile.ZipFile(result, "r") as archive:
+            self.assertIsNone(archive.testzip())
+            methods = {info.filename: info.compress_type for info in archive.infolist()}
+        self.assertEqual(methods["policy-skill/assets/logo.png"], zipfile.ZIP_STORED)
+        self.assertEqual(methods["policy-skill/SKILL.md"], zipfile.ZIP_STORED)
+        self.assertEqual(methods["policy-skill/refs/guide.md"], zipfile.ZIP_DEFLATED)
+        self.assertEqual(methods["policy-skill/refs/big.md"], zipfile.ZIP_LZMA)
+
+        manifest_file = package_skill_module.manifest_path_for(result)
+        manifest = json.loads(manifest_file.read_text())
+        entries = {entry["path"]: entry for entry in manifest["entries"]}
+        self.assertEqual(entries["refs/big.md"]["method"], "lzma")
+        self.assertEqual(entries["refs/big.md"]["size"], len("reference text\n") * 8000)
+        self.assertLess(entries["refs/big.md"]["compressedSize"], entries["refs/big.md"]["size"])
+        self.assertGreaterEqual(entries["assets/logo.png"]["ms"], 0)
+
+    def test_compress_file_stores_when_deflate_does_not_shrink(self):
+        skill_dir = self.create_skill("random-skill")
+        noise = skill_dir / "noise.bin"
+        noise.write_bytes(os.urandom(4096))
+        (skill_file,) = [
+            f for f in package_skill_module.iter_skill_files(skill_dir) if f.rel_path == "noise.bin"
+        ]
+
+        entry = package_skill_module.compress_file(skill_file, compress_type=zipfile.ZIP_DEFLATED)
+
+        self.assertEqual(entry.compress_type, zipfile.ZIP_STORED)
+        self.assertEqual(entry.data, noise.read_bytes())
+
+    def create_incremental_skill(self, name):
+        skill_dir = self.create_skill(name)
+        (skill_dir / "refs").mkdir()
+        for i in range(3):
+            (skill_dir / "refs" / f"doc{i}.md").write_text(f"# Doc {i}\n" + "words " * 500)
+        return skill_dir
+
+    def manifest_entries(self, archive_path):
+        manifest_file = package_skill_module.manifest_path_for(archive_path)
+        return {entry["path"]: entry for entry in json.loads(manifest_file.read_text())["entries"]}
+
+    def test_rerun_on_unchanged_skill_is_a_no_op(self):
+        skill_dir = self.create_incremental_skill("noop-skill")
+        out_dir = self.temp_dir / "out"
+        archive_path = package_skill(str(skill_dir), str(out_dir))
+        before = archive_path.stat().st_mtime_ns
+
+        with patch.object(package_skill_module, "compress_file") as compress, patch.object(
+            package_skill_module, "_compress_bytes"
+        ) as compress_bytes:
+            result = package_skill(str(skill_dir), str(out_dir))
+
+        self.assertEqual(result, archive_path)
+        self.assertEqual(archive_path.stat().st_mtime_ns, before)
+        compress.assert_not_called()
+        compress_bytes.assert_not_called()
+
+    def test_rerun_recompresses_only_changed_files(self):
+        skill_dir = self.create_incremental_skill("incremental-skill")
+        out_dir = self.temp_dir / "out"
+        archive_path = package_skill(str(skill_dir), str(out_dir))
+        (skill_dir / "refs" / "doc1.md").write_text("# Changed\n" + "other words " * 400)
+        (skill_dir / "refs" / "new.md").write_text("# New\n" + "fresh " * 300)
+        # Touched but identical content is detected by hash and still reused.
+        doc2 = skill_dir / "refs" / "doc2.md"
+        os.utime(doc2, ns=(doc2.stat().st_atime_ns, doc2.stat().st_mtime_ns + 10**9))
+
+        result = package_skill(str(skill_dir), str(out_dir))
+
+        self.assertEqual(result, archive_path)
+        entries = self.manifest_entries(archive_path)
+        self.assertEqual(
+            {path for path, entry in entries.items() if not entry["reused"]},
+            {"refs/doc1.md", "refs/new.md"},
+        )
+        self.assertEqual(entries["refs/doc2.md"]["mtimeNs"], doc2.stat().st_mtime_ns)
+        with zipfile.ZipFile(archive_path, "r") as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(
+                archive.read("incremental-skill/refs/doc1.md").decode(),
+                (skill_dir / "refs" / "doc1.md").read_text(),
+            )
+            self.assertEqual(
+                archive.read("incremental-skill/refs/doc0.md").decode(),
+                (skill_dir / "refs" / "doc0.md").read_text(),
+            )
+        self.assertEqual([p.name for p in out_dir.iterdir() if p.name.endswith(".tmp")], [])
+
+    def test_changed_options_or_force_rebuild_everything(self):
+        skill_dir = self.create_incremental_skill("options-skill")
+        out_dir = self.temp_dir / "out"
+        archive_path = package_skill(str(skill_dir), str(out_dir))
+
+        package_skill(str(skill_dir), str(out_dir), level=9)
+        self.assertFalse(any(entry["reused"] for entry in self.manifest_entries(archive_path).values()))
+
+        package_skill(str(skill_dir), str(out_dir), level=9, force=True)
+        self.assertFalse(any(entry["reused"] for entry in self.manifest_entries(archive_path).values()))
+
+    def test_reproducible_archives_are_byte_identical(self):
+        archives = []
+        for index, (mode, mtime) in enumerate([(0o644, 1_000_000_000), (0o600, 1_700_000_000)]):
+            root = self.temp_dir / f"checkout-{index}"
+            root.mkdir()
+            skill_dir = root / "repro-skill"
+            skill_dir.mkdir()
+            names = ["SKILL.md", "b.md", "a.py"] if index == 0 else ["a.py", "b.md", "SKILL.md"]
+            for name in names:
+                path = skill_dir / name
+                path.write_text(f"content of {name}\n" * 40)
+                path.chmod(mode)
+                os.utime(path, (mtime, mtime))
+            (skill_dir / "a.py").chmod(0o755 if index == 0 else 0o700)
+
+            result = package_skill(str(skill_dir), str(root / "out"), reproducible=True)
+            self.assertIsNotNone(result)
+            archives.append(result)
+
+        self.assertEqual(archives[0].read_bytes(), archives[1].read_bytes())
+        digest = hashlib.sha256(archives[0].read_bytes()).hexdigest()
+        manifest_file = package_skill_module.manifest_path_for(archives[0])
+        self.assertEqual(json.loads(manifest_file.read_text())["archiveSha256"], digest)
+        with zipfile.ZipFile(archives[0], "r") as archive:
+            infos = {info.filename: info for info in archive.infolist()}
+        *entries, embedded = infos
+        self.assertEqual(entries, sorted(entries))
+        self.assertEqual(embedded, "repro-skill/.skill-manifest.json")
+        self.assertEqual(infos["repro-skill/b.md"].date_time, (1980, 1, 1, 0, 0, 0))
+        self.assertEqual(infos["repro-skill/b.md"].external_attr >> 16, 0o100644)
+        self.assertEqual(infos["repro-skill/a.py"].external_attr >> 16, 0o100755)
+
+    def test_reproducible_mode_honours_source_date_epoch(self):
+        skill_dir = self.create_skill("epoch-skill")
+
+        with patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1700000000"}):
+            result = package_skill(str(skill_dir), str(self.temp_dir / "out"), reproducible=True)
+
+        with zipfile.ZipFile(result, "r") as archive:
+            dates = {info.date_time for info in archive.infolist()}
+        self.assertEqual(dates, {(2023, 11, 14, 22, 13, 20)})
+
+    def test_watch_revalidates_only_when_skill_md_changes(self):
+        skill_dir = self.create_skill("watch-skill")
+        out_dir = self.temp_dir / "out"
+        batches = iter([{"script.py"}, {"SKILL.md", "script.py"}])
+
+        def next_batch(_watcher, _debounce):
+            (skill_dir / "script.py").write_text(f"print({time.monotonic_ns()})\n")
+            try:
+                return next(batches)
+            except StopIteration:
+                raise KeyboardInterrupt from None
+
+        validate = MagicMock(return_value=(True, "Skill is valid!"))
+        with patch.object(package_skill_module, "validate_skill", validate), patch.object(
+            package_skill_module.skill_watch, "wait_for_changes", next_batch
+        ), patch.object(
+            package_skill_module, "package_skill", wraps=package_skill_module.package_skill
+        ) as package, redirect_stdout(io.StringIO()) as output:
+            package_skill_module.watch_skill(skill_dir, out_dir)
+
+        self.assertEqual(validate.call_count, 2)
+        self.assertEqual(package.call_count, 3)
+        self.assertTrue(all(call.kwargs["validate"] is False for call in package.call_args_list))
+        self.assertEqual(output.getvalue().count("Reused 1 unchanged entries"), 2)
+        self.assertIn("[WATCH] Stopped", output.getvalue())
+
+    def test_watch_keeps_running_after_a_failed_rebuild(self):
+        skill_dir = self.create_skill("watch-fail-skill")
+        out_dir = self.temp_dir / "out"
+        batches = iter([{"script.py"}, {"script.py"}])
+
+        def next_batch(_watcher, _debounce):
+            try:
+                return next(batches)
+            except StopIteration:
+                raise KeyboardInterrupt from None
+
+        results = [OSError("script.py vanished"), None, None]
+
+        def flaky_package(*args, **kwargs):
+            outcome = results.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return out_dir / "watch-fail-skill.skill"
+
+        validate = MagicMock(return_value=(True, "Skill is valid!"))
+        with patch.object(package_skill_module, "validate_skill", validate), patch.object(
+            package_skill_module.skill_watch, "wait_for_changes", next_batch
+        ), patch.object(
+            package_skill_module, "package_skill", side_effect=flaky_package
+        ) as package, redirect_stdout(io.StringIO()) as output:
+            package_skill_module.watch_skill(skill_dir, out_dir)
+
+        self.assertEqual(package.call_count, 3)
+        # The rebuild after a failure starts over with validation.
+        self.assertEqual(validate.call_count, 2)
+        self.assertIn("[ERROR] Rebuild failed: script.py vanished", output.getvalue())
+        self.assertEqual(output.getvalue().count("[WATCH] Rebuilt"), 2)
+
+    def test_package_all_packages_every_skill_and_reports_failures(self):
+        root = self.temp_dir / "repo"
+        for rel in ("one", "two", "group/three", "a/dup", "b/dup"):
+            skill_dir = root / rel
+            skill_dir.mkdir(parents=True)
+            (skill_dir / "SKILL.md").write_text("---\nname: x\ndescription: y\n---\n")
+            (skill_dir / "notes.md").write_text(f"notes for {rel}\n" * 50)
+        out_dir = self.temp_dir / "dist"
+
+        results = package_skill_module.package_all(root, out_dir, workers=2, reproducible=True)
+
+        self.assertEqual([r["skill"] for r in results], ["dup", "dup", "three", "one", "two"])
+        by_skill = {r["skill"]: r for r in results}
+        for name in ("one", "two", "three"):
+            self.assertTrue(by_skill[name]["ok"], by_skill[name]["log"])
+            self.assertEqual(by_skill[name]["files"], 2)
+            self.assertEqual(by_skill[name]["size"], (out_dir / f"{name}.skill").stat().st_size)
+        self.assertFalse(any(r["ok"] for r in results if r["skill"] == "dup"))
+        self.assertFalse((out_dir / "dup.skill").exists())
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with self.assertRaises(SystemExit) as exit_info:
+                package_skill_module.main(["--all", str(root), str(out_dir), "--reproducible"])
+        self.assertEqual(exit_info.exception.code, 1)
+        self.assertIn("3/5 skills packaged", stdout.getvalue())
+        self.assertIn("up-to-date", stdout.getvalue())
+
+
+    def test_package_all_reports_up_to_date_from_the_packager_not_its_log(self):
+        root = self.temp_dir / "repo"
+        skill_dir = root / "one"
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text("---\nname: one\ndescription: y\n---\n")
+        # Shows up in the "Added:" log line of the first build.
+        (skill_dir / "[OK] Up to date.md").write_text("tricky name\n" * 50)
+        out_dir = self.temp_dir / "dist"
+
+        [first] = package_skill_module.package_all(root, out_dir, workers=1)
+        [second] = package_skill_module.package_all(root, out_dir, workers=1)
+
+        self.assertTrue(first["ok"] and second["ok"], first["log"])
+        self.assertIn("[OK] Up to date", first["log"])
+        self.assertFalse(first["upToDate"])
+        self.assertTrue(second["upToDate"])
 
 if __name__ == "__main__":
     main()
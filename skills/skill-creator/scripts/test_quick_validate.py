@@ -3,12 +3,15 @@
 Regression tests for quick skill validation.
 """
 
+import json
 import tempfile
 from pathlib import Path
 from unittest import TestCase, main
+from unittest.mock import patch
 
 import quick_validate
 
+SKILLS_ROOT = Path(__file__).resolve().parents[2]
 
 class TestQuickValidate(TestCase):
     def setUp(self):
@@ -67,6 +70,148 @@ metadata: |
 
         self.assertTrue(valid, message)
 
+    def write_skill(self, rel, name, description="ok"):
+        skill_dir = self.temp_dir / "repo" / rel
+        skill_dir.mkdir(parents=True, exist_ok=True)
+        content = f"---\nname: {name}\ndescription: {description}\n---\n# Skill\n"
+        (skill_dir / "SKILL.md").write_text(content, encoding="utf-8")
+        return skill_dir
+
+    def test_validate_all_reports_every_skill_and_caches_results(self):
+        self.write_skill("good", "good")
+        bad = self.write_skill("group/bad", "Bad_Name")
+        cache_path = self.temp_dir / "cache.json"
+
+        first = quick_validate.validate_all(self.temp_dir / "repo", workers=2, cache_path=cache_path)
+
+        self.assertEqual(first["summary"]["total"], 2)
+        self.assertEqual(first["summary"]["invalid"], 1)
+        self.assertEqual(first["summary"]["cached"], 0)
+        by_skill = {result["skill"]: result for result in first["skills"]}
+        self.assertTrue(by_skill["good"]["valid"])
+        self.assertIn("hyphen-case", by_skill["bad"]["message"])
+
+        (bad / "SKILL.md").write_text("---\nname: bad\ndescription: fixed\n---\n", encoding="utf-8")
+        with patch.object(
+            quick_validate, "validate_frontmatter", wraps=quick_validate.validate_frontmatter
+        ) as validate:
+            second = quick_validate.validate_all(self.temp_dir / "repo", cache_path=cache_path)
+
+        self.assertEqual(validate.call_count, 1)
+        self.assertEqual(second["summary"]["cached"], 1)
+        self.assertEqual(second["summary"]["invalid"], 0)
+
+    def test_validator_version_change_invalidates_cache(self):
+        self.write_skill("good", "good")
+        cache_path = self.temp_dir / "cache.json"
+        quick_validate.validate_all(self.temp_dir / "repo", cache_path=cache_path)
+
+        with patch.object(quick_validate, "VALIDATOR_VERSION", "test-next"):
+            report = quick_validate.validate_all(self.temp_dir / "repo", cache_path=cache_path)
+
+        self.assertEqual(report["summary"]["cached"], 0)
+
+    def test_validate_all_cli_writes_json_report_and_exit_code(self):
+        self.write_skill("good", "good")
+        self.write_skill("bad", "good", description="<tag>")
+        output = self.temp_dir / "report.json"
+
+        code = quick_validate.main(
+            ["validate-all", str(self.temp_dir / "repo"), "--no-cache", "--output", str(output)]
+        )
+
+        self.assertEqual(code, 1)
+        report = json.loads(output.read_text(encoding="utf-8"))
+        self.assertEqual(report["validatorVersion"], quick_validate.VALIDATOR_VERSION)
+        self.assertEqual([r["valid"] for r in report["skills"]], [False, True])
+        self.assertFalse((self.temp_dir / "cache.json").exists())
+
+    def test_body_is_not_read_or_decoded(self):
+        skill_dir = self.write_skill("big", "big")
+        with open(skill_dir / "SKILL.md", "ab") as handle:
+            handle.write(b"\xff\xfe not utf-8 \n" * 200_000)
+
+        valid, message = quick_validate.validate_skill(skill_dir)
+        self.assertTrue(valid, message)
+        report = quick_validate.validate_all(self.temp_dir / "repo", use_cache=False)
+        self.assertEqual(report["summary"]["valid"], 1)
+
+    def test_rejects_runaway_frontmatter(self):
+        skill_dir = self.write_skill("runaway", "runaway")
+        content = "---\nname: runaway\n" + "description: x\n" * 10_000
+        (skill_dir / "SKILL.md").write_text(content, encoding="utf-8")
+
+        valid, message = quick_validate.validate_skill(skill_dir)
+
+        self.assertFalse(valid)
+        self.assertIn("exceeds", message)
+        with self.assertRaises(quick_validate.FrontmatterTooLargeError):
+            quick_validate.read_frontmatter(skill_dir / "SKILL.md", max_bytes=100)
+
+    def test_read_frontmatter_stops_at_the_closing_fence(self):
+        content = "---\r\nname: a\r\ndescription: b\r\n---\r\nbody\n---\n"
+        path = self.temp_dir / "SKILL.md"
+        path.write_bytes(content.encode("utf-8"))
+
+        self.assertEqual(quick_validate.read_frontmatter(path), "name: a\ndescription: b")
+
+
+class TestFrontmatterParserParity(TestCase):
+    def setUp(self):
+        if quick_validate.yaml is None:
+            self.skipTest("PyYAML not installed")
+        self.yaml = quick_validate.yaml
+        self.documents = []
+        for skill_dir in quick_validate.discover_skills(SKILLS_ROOT):
+            text = quick_validate.read_frontmatter(skill_dir / "SKILL.md")
+            if text is not None:
+                self.documents.append((skill_dir, text))
+        self.assertGreater(len(self.documents), 10)
+
+    def test_c_and_python_yaml_loaders_agree_on_repo_skills(self):
+        if not hasattr(self.yaml, "CSafeLoader"):
+            self.skipTest("PyYAML built without libyaml")
+        for skill_dir, text in self.documents:
+            with self.subTest(skill=skill_dir.name):
+                self.assertEqual(
+                    self.yaml.load(text, Loader=self.yaml.CSafeLoader),
+                    self.yaml.load(text, Loader=self.yaml.SafeLoader),
+                )
+
+    def test_fallback_parser_matches_yaml_on_repo_skills(self):
+        for skill_dir, text in self.documents:
+            with self.subTest(skill=skill_dir.name):
+                self.assertEqual(
+                    quick_validate._parse_simple_frontmatter(text),
+                    self.yaml.load(text, Loader=self.yaml.SafeLoader),
+                )
+
+    def test_fallback_and_yaml_give_same_verdicts_on_repo_skills(self):
+        for skill_dir, _text in self.documents:
+            with self.subTest(skill=skill_dir.name):
+                with_yaml = quick_validate.validate_skill(skill_dir)
+                with patch.object(quick_validate, "yaml", None):
+                    without_yaml = quick_validate.validate_skill(skill_dir)
+                self.assertEqual(with_yaml, without_yaml)
+
+    def test_fallback_parser_matches_yaml_on_supported_syntax(self):
+        cases = [
+            "name: a\ndescription: line one\n  line two\n",
+            "name: a\ndescription: \"say \\\"hi\\\" \\u00e9\"\nlicense: 'it''s'\n",
+            "name: a\nallowed-tools:\n  - gh\n  - 'jq'\n  - 3\n",
+            "name: a\nmetadata: |\n  {\n    \"owners\": [\"team\"]\n  }\n",
+            "name: a\ndescription: >-\n  folded\n  text\n\n  second\n",
+            "name: a # trailing comment\nflag: true\ncount: 12\nratio: 1.5\nempty:\nnone: ~\n",
+            'name: a\nmetadata: { "x": { "bins": ["a", "b",], }, y: [1, null, off], }\n',
+            "name: a\nmetadata:\n  {\n  \"openclaw\":\n  { \"emoji\": \"🦞\", \"url\": http://x.y/z },\n  }\n",
+        ]
+        for text in cases:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    quick_validate._parse_simple_frontmatter(text),
+                    self.yaml.load(text, Loader=self.yaml.SafeLoader),
+                )
+
 
 if __name__ == "__main__":
     main()
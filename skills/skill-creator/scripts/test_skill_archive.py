@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the lazy .skill archive reader.
+"""
+
+import contextlib
+import io
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import package_skill
+import skill_archive
+from skill_archive import SkillArchive
+
+
+class TestSkillArchive(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_skill_archive_"))
+        skill_dir = self.temp_dir / "lazy-skill"
+        (skill_dir / "references").mkdir(parents=True)
+        (skill_dir / "assets").mkdir()
+        self.files = {
+            "SKILL.md": "---\nname: lazy-skill\ndescription: Lazy reads\n---\n" + "# Body\n" * 20000,
+            "AGENTS.md": "Sorts before SKILL.md.\n",
+            "references/big.md": "lorem ipsum dolor\n" * 8000,
+            "assets/logo.png": "not really a png",
+            "tiny.txt": "x",
+        }
+        for rel_path, content in self.files.items():
+            (skill_dir / rel_path).write_text(content, encoding="utf-8")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.archive_path = package_skill.package_skill(
+                skill_dir, self.temp_dir / "out", lzma=True
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_skill_md_is_the_first_entry(self):
+        with zipfile.ZipFile(self.archive_path) as zipf:
+            self.assertEqual(zipf.namelist()[0], "lazy-skill/SKILL.md")
+        with SkillArchive(self.archive_path) as archive:
+            self.assertEqual(archive.skill_name, "lazy-skill")
+            self.assertEqual(archive.names()[0], "SKILL.md")
+            self.assertEqual(sorted(archive.names()), sorted(self.files))
+
+    def test_frontmatter_inflates_only_the_start_of_skill_md(self):
+        with SkillArchive(self.archive_path) as archive:
+            with patch.object(skill_archive, "_MemberReader", wraps=skill_archive._MemberReader) as reader:
+                frontmatter = archive.frontmatter()
+            self.assertEqual(frontmatter, {"name": "lazy-skill", "description": "Lazy reads"})
+            self.assertEqual(reader.call_count, 1)
+            self.assertEqual(reader.call_args.args[1].filename, "lazy-skill/SKILL.md")
+            self.assertEqual(archive.stats["inflatedBytes"], 0)
+
+    def test_members_are_inflated_once_and_match_the_sources(self):
+        with SkillArchive(self.archive_path) as archive:
+            methods = {name: archive.getinfo(name).compress_type for name in self.files}
+            for rel_path, content in self.files.items():
+                self.assertEqual(archive.read_text(rel_path), content)
+            archive.read("references/big.md")
+
+        self.assertEqual(methods["references/big.md"], zipfile.ZIP_LZMA)
+        self.assertEqual(methods["assets/logo.png"], zipfile.ZIP_STORED)
+        self.assertEqual(archive.stats["misses"], len(self.files))
+        self.assertEqual(archive.stats["hits"], 1)
+
+    def test_every_zip_method_streams_in_small_chunks(self):
+        archive_path = self.temp_dir / "methods.skill"
+        content = b"lorem ipsum dolor\n" * 4000
+        methods = {
+            "stored.md": zipfile.ZIP_STORED,
+            "deflated.md": zipfile.ZIP_DEFLATED,
+            "bzip2.md": zipfile.ZIP_BZIP2,
+            "lzma.md": zipfile.ZIP_LZMA,
+        }
+        with zipfile.ZipFile(archive_path, "w") as zipf:
+            zipf.writestr("methods/SKILL.md", "---\nname: methods\n---\n")
+            for name, method in methods.items():
+                zipf.writestr(f"methods/{name}", content, compress_type=method)
+
+        # Three-byte chunks split the LZMA header and properties across reads.
+        with patch.object(skill_archive, "READ_CHUNK_BYTES", 3):
+            with SkillArchive(archive_path) as archive:
+                for name, method in methods.items():
+                    with self.subTest(method=method):
+                        self.assertEqual(archive.getinfo(name).compress_type, method)
+                        self.assertEqual(archive.read(name), content)
+
+    def test_reading_archives_does_not_load_the_packager(self):
+        code = "import sys, skill_archive; print('package_skill' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(skill_archive.__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_lru_evicts_least_recently_used_members(self):
+        with SkillArchive(self.archive_path, cache_entries=2) as archive:
+            archive.read("tiny.txt")
+            archive.read("AGENTS.md")
+            archive.read("tiny.txt")
+            archive.read("assets/logo.png")
+            archive.read("tiny.txt")
+            archive.read("AGENTS.md")
+        self.assertEqual(archive.stats, {"hits": 2, "misses": 4, "inflatedBytes": archive.stats["inflatedBytes"]})
+
+    def test_corrupted_member_raises(self):
+        data = bytearray(self.archive_path.read_bytes())
+        with SkillArchive(self.archive_path) as archive:
+            info = archive.getinfo("assets/logo.png")
+        offset = info.header_offset + zipfile.sizeFileHeader + len(info.filename.encode())
+        data[offset + len(info.extra)] ^= 0xFF
+        self.archive_path.write_bytes(bytes(data))
+
+        with SkillArchive(self.archive_path) as archive:
+            with self.assertRaises(zipfile.BadZipFile):
+                archive.read("assets/logo.png")
+            with self.assertRaises(KeyError):
+                archive.read("missing.md")
+
+    def test_encrypted_member_is_reported_as_a_bad_archive(self):
+        archive_path = self.temp_dir / "locked.skill"
+        with zipfile.ZipFile(archive_path, "w") as zipf:
+            zipf.writestr("locked/SKILL.md", "---\nname: locked\n---\n")
+            zipf.writestr("locked/secret.md", "ciphertext")
+        # zipfile cannot write encrypted entries; set the flag in the central directory.
+        data = bytearray(archive_path.read_bytes())
+        central = data.rindex(b"PK\x01\x02")
+        data[central + 8] |= 0x1
+        archive_path.write_bytes(bytes(data))
+
+        with SkillArchive(archive_path) as archive:
+            with self.assertRaises(zipfile.BadZipFile):
+                archive.read("secret.md")
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(skill_archive.main([str(archive_path), "secret.md"]), 1)
+        self.assertIn("Encrypted member", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Regression tests for .skill archive deltas.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase, main
+
+import package_skill
+import skill_delta
+
+
+class TestSkillDelta(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_skill_delta_"))
+        self.skill_dir = self.temp_dir / "delta-skill"
+        (self.skill_dir / "scripts").mkdir(parents=True)
+        (self.skill_dir / "references").mkdir()
+        (self.skill_dir / "SKILL.md").write_text(
+            "---\nname: delta-skill\ndescription: Delta tests\n---\n# Delta\n", encoding="utf-8"
+        )
+        lines = "".join(f"print('step {i}')\n" for i in range(2000))
+        (self.skill_dir / "scripts" / "tool.py").write_text(lines, encoding="utf-8")
+        (self.skill_dir / "references" / "big.md").write_text(
+            "".join(f"{hashlib.sha256(str(i).encode()).hexdigest()}\n" for i in range(5000)),
+            encoding="utf-8",
+        )
+        (self.skill_dir / "references" / "old.md").write_text("going away\n" * 50, encoding="utf-8")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def package(self, version: str, **options) -> Path:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return package_skill.package_skill(
+                self.skill_dir, self.temp_dir / version, reproducible=True, **options
+            )
+
+    def edit_skill(self):
+        tool = self.skill_dir / "scripts" / "tool.py"
+        tool.write_text(tool.read_text().replace("print('step 1000')", "print('step 1000!')"))
+        (self.skill_dir / "references" / "old.md").unlink()
+        (self.skill_dir / "references" / "new.md").write_text("brand new\n" * 50, encoding="utf-8")
+
+    def test_apply_rebuilds_the_new_archive_exactly(self):
+        old = self.package("v1", lzma=True)
+        self.edit_skill()
+        new = self.package("v2", lzma=True)
+        delta = self.temp_dir / "v2.skilldelta"
+
+        header = skill_delta.make_delta(old, new, delta)
+        rebuilt = skill_delta.apply_delta(old, delta, self.temp_dir / "rebuilt.skill")
+
+        self.assertEqual(rebuilt.read_bytes(), new.read_bytes())
+        summary = header["summary"]
+        self.assertEqual(summary["added"], ["delta-skill/references/new.md"])
+        self.assertEqual(summary["removed"], ["delta-skill/references/old.md"])
+        self.assertEqual(
+            summary["modified"], ["delta-skill/scripts/tool.py", "delta-skill/.skill-manifest.json"]
+        )
+        self.assertEqual(summary["patched"], 2)
+        self.assertEqual(summary["unchanged"], 2)
+        self.assertLess(delta.stat().st_size, new.stat().st_size // 10)
+
+    def test_metadata_only_changes_and_non_reproducible_archives_round_trip(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            old = package_skill.package_skill(self.skill_dir, self.temp_dir / "v1")
+            self.edit_skill()
+            new = package_skill.package_skill(self.skill_dir, self.temp_dir / "v2", level=9)
+        delta = self.temp_dir / "v2.skilldelta"
+
+        skill_delta.make_delta(old, new, delta)
+        rebuilt = skill_delta.apply_delta(old, delta, self.temp_dir / "rebuilt.skill")
+
+        self.assertEqual(rebuilt.read_bytes(), new.read_bytes())
+
+    def test_apply_rejects_the_wrong_base_archive(self):
+        old = self.package("v1")
+        self.edit_skill()
+        new = self.package("v2")
+        delta = self.temp_dir / "v2.skilldelta"
+        skill_delta.make_delta(old, new, delta)
+
+        with self.assertRaises(skill_delta.DeltaError):
+            skill_delta.apply_delta(new, delta, self.temp_dir / "rebuilt.skill")
+        self.assertFalse((self.temp_dir / "rebuilt.skill").exists())
+
+    def test_tampered_delta_fails_digest_check(self):
+        old = self.package("v1")
+        self.edit_skill()
+        new = self.package("v2")
+        delta = self.temp_dir / "v2.skilldelta"
+        header = skill_delta.make_delta(old, new, delta)
+        tampered = self.temp_dir / "tampered.skilldelta"
+        with zipfile.ZipFile(delta) as source, zipfile.ZipFile(tampered, "w") as target:
+            for info in source.infolist():
+                data = source.read(info)
+                if info.filename == f"blobs/{header['tail']}":
+                    data = data[:-2] + b"!!"
+                target.writestr(info, data)
+
+        with self.assertRaises(skill_delta.DeltaError):
+            skill_delta.apply_delta(old, tampered, self.temp_dir / "rebuilt.skill")
+
+    def test_apply_rejects_entries_missing_from_the_base_archive(self):
+        old = self.package("v1")
+        self.edit_skill()
+        new = self.package("v2")
+        delta = self.temp_dir / "v2.skilldelta"
+        skill_delta.make_delta(old, new, delta)
+        with zipfile.ZipFile(delta) as source:
+            header = json.loads(source.read("delta.json"))
+            blobs = {info.filename: source.read(info) for info in source.infolist()}
+
+        for op in ("copy", "patch"):
+            with self.subTest(op=op):
+                entries = [dict(entry) for entry in header["entries"]]
+                next(entry for entry in entries if entry["op"] == op)["name"] = "skill/nope.md"
+                renamed = {**header, "entries": entries}
+                edited = self.temp_dir / f"{op}.skilldelta"
+                with zipfile.ZipFile(edited, "w") as target:
+                    for name, data in blobs.items():
+                        target.writestr(name, json.dumps(renamed) if name == "delta.json" else data)
+
+                with self.assertRaisesRegex(skill_delta.DeltaError, "unknown entry"):
+                    skill_delta.apply_delta(old, edited, self.temp_dir / "rebuilt.skill")
+                self.assertFalse((self.temp_dir / "rebuilt.skill").exists())
+
+    def test_diff_and_patch_round_trip(self):
+        old = b"alpha\nbeta\ngamma\n\x00\x01binary"
+        new = b"alpha\nBETA\ngamma\n\x00\x01binary tail"
+        ops, literal = skill_delta.diff_bytes(old, new)
+        self.assertEqual(skill_delta.patch_bytes(old, ops, literal), new)
+        self.assertLess(len(literal), len(new))
+
+
+if __name__ == "__main__":
+    main()
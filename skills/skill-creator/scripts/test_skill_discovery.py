@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for skill folder discovery.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest import TestCase, main
+
+from skill_discovery import discover_skills
+
+
+class TestDiscoverSkills(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_skill_discovery_"))
+
+    def tearDown(self):
+        import shutil
+
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_finds_skill_folders_without_descending_into_them(self):
+        root = self.temp_dir / "repo"
+        for rel in ("alpha", "group/beta", "alpha/nested", "node_modules/gamma"):
+            (root / rel).mkdir(parents=True)
+            (root / rel / "SKILL.md").write_text("---\nname: x\ndescription: y\n---\n")
+        (root / "group" / "notes").mkdir()
+
+        found = discover_skills(root)
+
+        self.assertEqual(found, [root.resolve() / "alpha", root.resolve() / "group" / "beta"])
+
+    def test_root_that_is_a_skill_is_returned_alone(self):
+        (self.temp_dir / "sub").mkdir()
+        (self.temp_dir / "sub" / "SKILL.md").write_text("")
+        (self.temp_dir / "SKILL.md").write_text("")
+
+        self.assertEqual(discover_skills(self.temp_dir), [self.temp_dir.resolve()])
+
+
+if __name__ == "__main__":
+    main()
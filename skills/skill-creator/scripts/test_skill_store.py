@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Regression tests for the content-addressed skill store.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase, main
+
+import package_skill
+import skill_store
+
+
+class TestSkillStore(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_skill_store_"))
+        self.root = self.temp_dir / "skills"
+        self.store = self.temp_dir / "store"
+        self.shared = "def helper():\n    return 42\n" * 100
+        for name in ("alpha", "beta"):
+            skill_dir = self.root / name
+            (skill_dir / "scripts").mkdir(parents=True)
+            (skill_dir / "SKILL.md").write_text(
+                f"---\nname: {name}\ndescription: Store tests\n---\n", encoding="utf-8"
+            )
+            (skill_dir / "scripts" / "shared.py").write_text(self.shared, encoding="utf-8")
+        (self.root / "beta" / "scripts" / "run.sh").write_text("#!/bin/sh\necho hi\n")
+        (self.root / "beta" / "scripts" / "run.sh").chmod(0o755)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_identical_files_are_stored_once_and_installed_as_links(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            archive = package_skill.package_skill(self.root / "alpha", self.temp_dir / "dist")
+        alpha = skill_store.add_skill(self.store, archive)
+        beta = skill_store.add_skill(self.store, self.root / "beta")
+
+        self.assertEqual(alpha["skill"], "alpha")
+        new_files = ["SKILL.md", "scripts/run.sh"]
+        self.assertEqual(
+            beta["storedBytes"],
+            sum((self.root / "beta" / path).stat().st_size for path in new_files),
+        )
+        counts = skill_store.install_skill(self.store, "alpha", self.temp_dir / "a")
+        skill_store.install_skill(self.store, "beta", self.temp_dir / "b")
+
+        self.assertEqual(counts, {"linked": 2, "copied": 0})
+        a_shared = self.temp_dir / "a" / "scripts" / "shared.py"
+        b_shared = self.temp_dir / "b" / "scripts" / "shared.py"
+        self.assertEqual(a_shared.read_text(encoding="utf-8"), self.shared)
+        self.assertTrue(os.path.samefile(a_shared, b_shared))
+        self.assertEqual(a_shared.stat().st_nlink, 3)
+        self.assertTrue(os.access(self.temp_dir / "b" / "scripts" / "run.sh", os.X_OK))
+        self.assertFalse(os.access(a_shared, os.X_OK))
+
+    def test_install_refuses_existing_destination_and_unknown_skills(self):
+        skill_store.add_skill(self.store, self.root / "alpha")
+        (self.temp_dir / "taken").mkdir()
+
+        with self.assertRaises(FileExistsError):
+            skill_store.install_skill(self.store, "alpha", self.temp_dir / "taken")
+        with self.assertRaises(KeyError):
+            skill_store.install_skill(self.store, "missing", self.temp_dir / "new")
+
+    def test_add_rejects_archives_with_unsafe_paths(self):
+        for members in (
+            ["evil/SKILL.md", "evil/../../escape.txt"],
+            ["evil/SKILL.md", "evil//etc/passwd"],
+            ["../SKILL.md"],
+        ):
+            with self.subTest(members=members):
+                archive = self.temp_dir / "evil.skill"
+                with zipfile.ZipFile(archive, "w") as zipf:
+                    for member in members:
+                        zipf.writestr(member, "x")
+
+                with self.assertRaises(ValueError):
+                    skill_store.add_skill(self.store, archive)
+                self.assertFalse((self.store / "skills").exists())
+
+    def test_install_refuses_index_paths_outside_the_destination(self):
+        index = skill_store.add_skill(self.store, self.root / "alpha")
+        index_path = self.store / "skills" / "alpha.json"
+        for bad_path in ("../escape.py", "/tmp/escape.py", "scripts/../../escape.py"):
+            with self.subTest(path=bad_path):
+                index["files"][0]["path"] = bad_path
+                index_path.write_text(json.dumps(index), encoding="utf-8")
+
+                with self.assertRaises(ValueError):
+                    skill_store.install_skill(self.store, "alpha", self.temp_dir / "out" / "a")
+                self.assertFalse((self.temp_dir / "out" / "escape.py").exists())
+                self.assertEqual(list((self.temp_dir / "out").iterdir()), [])
+        with self.assertRaises(ValueError):
+            skill_store.load_index(self.store, "../alpha")
+
+    def test_install_refuses_malformed_object_digests(self):
+        index = skill_store.add_skill(self.store, self.root / "alpha")
+        index_path = self.store / "skills" / "alpha.json"
+        for bad_digest in ("../../../../etc/passwd", "AB" * 32, "0" * 63, 42):
+            with self.subTest(digest=bad_digest):
+                index["files"][0]["sha256"] = bad_digest
+                index_path.write_text(json.dumps(index), encoding="utf-8")
+
+                with self.assertRaises(ValueError):
+                    skill_store.install_skill(self.store, "alpha", self.temp_dir / "out")
+                self.assertFalse((self.temp_dir / "out").exists())
+
+    def test_report_counts_bytes_saved_across_skills(self):
+        report = skill_store.dedup_report(self.root)
+
+        self.assertEqual(report["skills"], 2)
+        self.assertEqual(report["files"], 5)
+        self.assertEqual(report["savedBytes"], len(self.shared))
+        [duplicate] = report["duplicates"]
+        self.assertEqual(duplicate["copies"], 2)
+        self.assertEqual(
+            duplicate["paths"], ["alpha/scripts/shared.py", "beta/scripts/shared.py"]
+        )
+
+    def test_report_json_is_not_mixed_with_warnings(self):
+        (self.root / "alpha" / "link.py").symlink_to(self.root / "beta" / "scripts" / "run.sh")
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            self.assertEqual(skill_store.main(["report", str(self.root), "--json"]), 0)
+
+        self.assertEqual(json.loads(stdout.getvalue())["files"], 5)
+        self.assertIn("Skipping symlink", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Regression tests for skill folder watching.
+"""
+
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import TestCase, main, skipUnless
+
+import skill_watch
+
+
+def _inotify_available() -> bool:
+    try:
+        skill_watch.InotifyWatcher(tempfile.gettempdir()).close()
+    except OSError:
+        return False
+    return True
+
+
+# Upper bound on any wait, so a missed event fails the test instead of hanging it.
+WAIT_S = 5
+
+
+class WatcherTests:
+    """Shared checks, run against each watcher implementation."""
+
+    def make_watcher(self, **kwargs):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_skill_watch_"))
+        (self.temp_dir / "scripts").mkdir()
+        (self.temp_dir / "node_modules").mkdir()
+        (self.temp_dir / "SKILL.md").write_text("---\nname: w\n---\n")
+        self.watcher = self.make_watcher(ignore={"w.skill"})
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reports_changed_paths_and_skips_excluded_and_ignored(self):
+        (self.temp_dir / "node_modules" / "dep.js").write_text("x")
+        (self.temp_dir / "w.skill").write_bytes(b"archive")
+        (self.temp_dir / "scripts" / "tool.py").write_text("print(1)\n")
+
+        changed = skill_watch.wait_for_changes(self.watcher, debounce=0.1, timeout=WAIT_S)
+
+        self.assertEqual(changed, {"scripts/tool.py"})
+        self.assertEqual(self.watcher.poll(0.05), set())
+
+    def test_burst_of_changes_is_debounced_into_one_batch(self):
+        def burst():
+            for i in range(5):
+                (self.temp_dir / "scripts" / f"f{i}.py").write_text(str(i))
+                time.sleep(0.03)
+
+        thread = threading.Thread(target=burst)
+        thread.start()
+        changed = skill_watch.wait_for_changes(self.watcher, debounce=0.3, timeout=WAIT_S)
+        thread.join()
+
+        self.assertEqual(changed, {f"scripts/f{i}.py" for i in range(5)})
+
+    def test_new_directories_are_watched(self):
+        (self.temp_dir / "references").mkdir()
+        created = skill_watch.wait_for_changes(self.watcher, debounce=0.1, timeout=WAIT_S)
+        (self.temp_dir / "references" / "api.md").write_text("# API\n")
+        added = skill_watch.wait_for_changes(self.watcher, debounce=0.1, timeout=WAIT_S)
+
+        self.assertEqual(created, {"references"})
+        self.assertEqual(added, {"references/api.md"})
+
+
+class TestPollingWatcher(WatcherTests, TestCase):
+    def make_watcher(self, **kwargs):
+        return skill_watch.PollingWatcher(self.temp_dir, poll_interval=0.02, **kwargs)
+
+
+@skipUnless(_inotify_available(), "inotify not available")
+class TestInotifyWatcher(WatcherTests, TestCase):
+    def make_watcher(self, **kwargs):
+        return skill_watch.InotifyWatcher(self.temp_dir, **kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Regression tests for .skill archive verification.
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase, main
+from unittest.mock import patch
+
+import package_skill
+import verify_skill
+
+
+class TestVerifySkill(TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_verify_skill_"))
+        skill_dir = self.temp_dir / "verify-skill"
+        (skill_dir / "scripts").mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text(
+            "---\nname: verify-skill\ndescription: Verify tests\n---\n", encoding="utf-8"
+        )
+        (skill_dir / "scripts" / "tool.py").write_text("print('ok')\n" * 100, encoding="utf-8")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.archive = package_skill.package_skill(skill_dir, self.temp_dir / "dist")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def rewrite(self, name, edit):
+        """Copy the archive to name, passing each (filename, data) through edit."""
+        target = self.temp_dir / name
+        with zipfile.ZipFile(self.archive) as source, zipfile.ZipFile(target, "w") as out:
+            for info in source.infolist():
+                edited = edit(info.filename, source.read(info))
+                if edited is not None:
+                    out.writestr(info.filename, edited)
+        return target
+
+    def test_embedded_manifest_lists_every_entry(self):
+        with zipfile.ZipFile(self.archive) as zipf:
+            manifest = json.loads(zipf.read("verify-skill/.skill-manifest.json"))
+        self.assertEqual(
+            [entry["path"] for entry in manifest["entries"]], ["SKILL.md", "scripts/tool.py"]
+        )
+
+        result = verify_skill.verify_archive(self.archive)
+
+        self.assertTrue(result["ok"], result["error"])
+        self.assertEqual(result["entries"], 2)
+
+    def test_detects_modified_extra_and_missing_entries(self):
+        modified = self.rewrite(
+            "modified.skill",
+            lambda name, data: data.replace(b"ok", b"no") if name.endswith("tool.py") else data,
+        )
+        extra = self.rewrite("extra.skill", lambda name, data: data)
+        with zipfile.ZipFile(extra, "a") as zipf:
+            zipf.writestr("verify-skill/scripts/evil.py", "import os\n")
+        missing = self.rewrite(
+            "missing.skill", lambda name, data: None if name.endswith("tool.py") else data
+        )
+        unsigned = self.rewrite(
+            "unsigned.skill", lambda name, data: None if name.endswith("manifest.json") else data
+        )
+
+        errors = {
+            path.stem: verify_skill.verify_archive(path)["error"]
+            for path in (modified, extra, missing, unsigned)
+        }
+
+        self.assertIn("does not match", errors["modified"])
+        self.assertIn("not listed", errors["extra"])
+        self.assertIn("missing", errors["missing"])
+        self.assertIn("No embedded", errors["unsigned"])
+
+    def test_malformed_manifest_is_an_error_not_an_exception(self):
+        def with_manifest(edit):
+            def rewrite(name, data):
+                if not name.endswith(".skill-manifest.json"):
+                    return data
+                return json.dumps(edit(json.loads(data))).encode()
+
+            return rewrite
+
+        cases = {
+            "list": lambda manifest: [manifest],
+            "no-entries": lambda manifest: {**manifest, "entries": None},
+            "entry-not-object": lambda manifest: {**manifest, "entries": ["SKILL.md"]},
+            "bad-size": lambda manifest: {
+                **manifest,
+                "entries": [{**manifest["entries"][0], "size": "12"}, manifest["entries"][1]],
+            },
+            "no-path": lambda manifest: {
+                **manifest,
+                "entries": [{"size": 1, "sha256": "0" * 64}, manifest["entries"][1]],
+            },
+        }
+
+        for name, edit in cases.items():
+            with self.subTest(name):
+                path = self.rewrite(f"{name}.skill", with_manifest(edit))
+                result = verify_skill.verify_archive(path)
+                self.assertFalse(result["ok"])
+                self.assertIn("Malformed manifest", result["error"])
+
+    def test_trusted_digest_catches_a_consistently_rewritten_manifest(self):
+        tool = b"print('pwned')\n"
+
+        def tamper(name, data):
+            if name.endswith("tool.py"):
+                return tool
+            if name.endswith(".skill-manifest.json"):
+                manifest = json.loads(data)
+                manifest["entries"][1].update(
+                    size=len(tool), sha256=hashlib.sha256(tool).hexdigest()
+                )
+                return json.dumps(manifest).encode()
+            return data
+
+        tampered = self.rewrite("tampered.skill", tamper)
+        shutil.copy(
+            package_skill.manifest_path_for(self.archive),
+            package_skill.manifest_path_for(tampered),
+        )
+        trusted = package_skill.file_sha256(self.archive)
+
+        self.assertTrue(verify_skill.verify_archive(tampered)["ok"])
+        self.assertFalse(verify_skill.verify_archive(tampered, expected_sha256=trusted)["ok"])
+        self.assertIn("expected digest", verify_skill.verify_archive(tampered, sidecar=True)["error"])
+        result = verify_skill.verify_archive(self.archive, expected_sha256=trusted.upper())
+        self.assertTrue(result["ok"] and result["trusted"], result["error"])
+        self.assertTrue(verify_skill.verify_archive(self.archive, sidecar=True)["trusted"])
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(verify_skill.main([str(self.archive), "--expect-sha256", trusted]), 0)
+            self.assertEqual(verify_skill.main([str(tampered), "--expect-sha256", trusted]), 1)
+        self.assertIn("against trusted digests", output.getvalue())
+
+    def test_fails_fast_on_the_first_bad_archive(self):
+        bad = self.rewrite("a-bad.skill", lambda name, data: data + b"!")
+        others = [shutil.copy(self.archive, self.temp_dir / f"b-good-{i}.skill") for i in range(5)]
+
+        with patch.object(verify_skill, "verify_archive", wraps=verify_skill.verify_archive) as verify:
+            results = verify_skill.verify_all([bad, *others], workers=1)
+        self.assertEqual(verify.call_count, 1)
+        self.assertEqual([result["ok"] for result in results], [False])
+
+        results = verify_skill.verify_all([bad, *others], workers=2, keep_going=True)
+        self.assertEqual([result["ok"] for result in results], [False] + [True] * 5)
+
+    def test_cli_scans_folders_and_sets_exit_code(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(verify_skill.main([str(self.temp_dir / "dist")]), 0)
+            self.rewrite("dist/zz-bad.skill", lambda name, data: data + b"!")
+            self.assertEqual(verify_skill.main([str(self.temp_dir / "dist"), "--keep-going"]), 1)
+        self.assertIn("[ERROR]", output.getvalue())
+
+
+if __name__ == "__main__":
+    main()
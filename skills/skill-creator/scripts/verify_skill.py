@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Skill Verifier - Checks .skill archives against their embedded hash manifest
+
+package_skill stores `<skill>/.skill-manifest.json` in every archive, listing
+the size and SHA-256 of each entry. This script streams every entry through
+the hash (nothing is extracted or held in memory whole) and fails on the
+first missing, extra or mismatching entry. Archives are checked concurrently;
+by default the run stops at the first bad archive.
+
+The embedded manifest is not signed, so on its own it only protects against
+corruption (truncated downloads, bit rot), not tampering: whoever can edit an
+entry can rewrite the manifest too. To detect tampering, also check the whole
+archive against a digest obtained from a trusted source with --expect-sha256,
+or with --sidecar against the archiveSha256 recorded in the
+`<name>.skill.manifest.json` package_skill writes next to the archive (which
+is only as trustworthy as the channel it came through).
+
+Usage:
+    python verify_skill.py <archive.skill | folder>... [--workers N] [--keep-going] [--json]
+        [--expect-sha256 HEX | --sidecar]
+
+Example:
+    python verify_skill.py dist/my-skill.skill
+    python verify_skill.py dist --workers 8 --sidecar
+    python verify_skill.py my-skill.skill --expect-sha256 3f5a...
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+
+from package_skill import file_sha256, manifest_path_for
+from skill_discovery import EMBEDDED_MANIFEST_NAME, EMBEDDED_MANIFEST_VERSION
+
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+def _sidecar_sha256(archive_path: Path) -> str:
+    manifest_path = manifest_path_for(Path(archive_path))
+    try:
+        digest = json.loads(manifest_path.read_text(encoding="utf-8")).get("archiveSha256")
+    except FileNotFoundError:
+        raise ValueError(f"No sidecar manifest {manifest_path.name}") from None
+    if not isinstance(digest, str):
+        raise ValueError(f"No archiveSha256 in {manifest_path.name}")
+    return digest
+
+
+def verify_archive(archive_path, expected_sha256: str | None = None, sidecar: bool = False) -> dict:
+    """
+    Verify one archive; returns a result dict with ok, error and counts.
+    With expected_sha256 (or sidecar), the whole archive must also match that
+    digest, and `trusted` is set when it does.
+    """
+    started = time.perf_counter()
+    result = {
+        "archive": str(archive_path),
+        "ok": False,
+        "trusted": False,
+        "entries": 0,
+        "bytes": 0,
+        "error": None,
+    }
+    try:
+        if sidecar:
+            expected_sha256 = _sidecar_sha256(archive_path)
+        if expected_sha256 is not None:
+            if file_sha256(Path(archive_path)) != expected_sha256.lower():
+                raise ValueError("archive SHA-256 does not match the expected digest")
+            result["trusted"] = True
+        with zipfile.ZipFile(archive_path) as zipf:
+            result["error"] = _verify_entries(zipf, result)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        result["error"] = str(e)
+    result["ok"] = result["error"] is None
+    result["seconds"] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _is_manifest_entry(entry) -> bool:
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("path"), str)
+        and type(entry.get("size")) is int
+        and isinstance(entry.get("sha256"), str)
+    )
+
+
+def _verify_entries(zipf: zipfile.ZipFile, result: dict):
+    """Return None if every entry matches the embedded manifest, else the first problem."""
+    infos = [info for info in zipf.infolist() if not info.is_dir()]
+    manifest_names = [
+        info.filename
+        for info in infos
+        if info.filename.count("/") == 1 and info.filename.endswith(f"/{EMBEDDED_MANIFEST_NAME}")
+    ]
+    if len(manifest_names) != 1:
+        return f"No embedded {EMBEDDED_MANIFEST_NAME} (packaged by an older package_skill?)"
+    manifest = json.loads(zipf.read(manifest_names[0]))
+    if not isinstance(manifest, dict):
+        return f"Malformed manifest {manifest_names[0]}: not a JSON object"
+    if manifest.get("version") != EMBEDDED_MANIFEST_VERSION or manifest.get("algorithm") != "sha256":
+        return f"Unsupported manifest version/algorithm in {manifest_names[0]}"
+    entries = manifest.get("entries")
+    if not isinstance(entries, list) or not all(_is_manifest_entry(entry) for entry in entries):
+        return f"Malformed manifest {manifest_names[0]}: bad entries list"
+    prefix = manifest_names[0][: -len(EMBEDDED_MANIFEST_NAME)]
+    expected = {f"{prefix}{entry['path']}": entry for entry in entries}
+
+    for info in infos:
+        if info.filename == manifest_names[0]:
+            continue
+        entry = expected.pop(info.filename, None)
+        if entry is None:
+            return f"{info.filename}: not listed in the manifest"
+        digest = hashlib.sha256()
+        size = 0
+        # ZipExtFile inflates incrementally and also checks the CRC-32 at EOF.
+        with zipf.open(info) as stream:
+            while chunk := stream.read(READ_CHUNK_BYTES):
+                digest.update(chunk)
+                size += len(chunk)
+        if size != entry["size"] or digest.hexdigest() != entry["sha256"]:
+            return f"{info.filename}: content does not match the manifest"
+        result["entries"] += 1
+        result["bytes"] += size
+    if expected:
+        return f"{next(iter(expected))}: listed in the manifest but missing"
+    return None
+
+
+def find_archives(paths) -> list[Path]:
+    """Expand folders into the .skill files they contain (recursively)."""
+    archives = []
+    for path in map(Path, paths):
+        archives.extend(sorted(path.rglob("*.skill")) if path.is_dir() else [path])
+    return archives
+
+
+def verify_all(paths, workers=None, keep_going=False, sidecar=False) -> list[dict]:
+    """
+    Verify archives concurrently, with at most `workers` in flight. Unless
+    keep_going is set, no new archive is started once one has failed; results
+    cover the archives that were checked, in input order.
+    """
+    archives = find_archives(paths)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(archives) or 1))
+    results = {}
+    queue = iter(archives)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {
+            pool.submit(verify_archive, archive, sidecar=sidecar): archive
+            for archive in islice(queue, workers)
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                archive = pending.pop(future)
+                results[archive] = future.result()
+                if not results[archive]["ok"] and not keep_going:
+                    queue = iter(())
+            for archive in islice(queue, len(done)):
+                pending[pool.submit(verify_archive, archive, sidecar=sidecar)] = archive
+    return [results[archive] for archive in archives if archive in results]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verify .skill archives against their manifests.")
+    parser.add_argument("paths", nargs="+", help=".skill files or folders containing them")
+    parser.add_argument("--workers", type=int, help="Archives verified at once (default: CPU count)")
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Verify every archive instead of stopping at the first failure",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    trust = parser.add_mutually_exclusive_group()
+    trust.add_argument(
+        "--expect-sha256",
+        metavar="HEX",
+        help="Trusted SHA-256 of the whole archive (single archive only)",
+    )
+    trust.add_argument(
+        "--sidecar",
+        action="store_true",
+        help="Check each archive against archiveSha256 in its <name>.skill.manifest.json",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    archives = find_archives(args.paths)
+    if args.expect_sha256 is not None:
+        if len(archives) != 1:
+            parser.error("--expect-sha256 needs exactly one archive")
+        results = [verify_archive(archives[0], expected_sha256=args.expect_sha256)]
+    else:
+        results = verify_all(
+            archives, workers=args.workers, keep_going=args.keep_going, sidecar=args.sidecar
+        )
+    elapsed = time.perf_counter() - started
+    failed = [result for result in results if not result["ok"]]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in failed:
+            print(f"[ERROR] {result['archive']}: {result['error']}")
+        entries = sum(result["entries"] for result in results)
+        megabytes = sum(result["bytes"] for result in results) / (1024 * 1024)
+        status = "[OK]" if not failed and results else "[ERROR]"
+        scope = (
+            "against trusted digests"
+            if results and all(result["trusted"] for result in results)
+            else "for corruption only"
+        )
+        print(
+            f"{status} Verified {len(results) - len(failed)}/{len(archives)} archives {scope} "
+            f"({entries} entries, {megabytes:.1f} MB) in {elapsed:.2f}s"
+        )
+    return 1 if failed or not results else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())